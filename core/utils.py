@@ -5,6 +5,7 @@ Includes placeholders for future utilities.
 """
 
 import logging
+import os
 from typing import Dict, Any
 
 
@@ -86,4 +87,19 @@ def handle_error(e: Exception) -> None:
     logger.debug(f"Exception details: {e}", exc_info=True)
     
     # Placeholder for custom error handling strategies
-    # Future implementation may include retry logic, alerts, etc.
\ No newline at end of file
+    # Future implementation may include retry logic, alerts, etc.
+
+
+def default_file_mode() -> int:
+    """Return the permission bits a newly created file gets under the current umask.
+    
+    ``tempfile.mkstemp`` always creates files readable only by their owner;
+    writers that publish a temporary file with ``os.replace`` chmod it to
+    this mode first so the result looks like any other file they create.
+    
+    Returns:
+        ``0o666`` with the process umask bits cleared.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
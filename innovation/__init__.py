@@ -6,5 +6,6 @@ in the Jarvis project.
 
 from innovation.research import Research, ResearchModule
 from innovation.material_discovery import MaterialDiscovery
+from innovation.cross_pollinator import CrossPollinationEngine
 
-__all__ = ["Research", "ResearchModule", "MaterialDiscovery"]
+__all__ = ["Research", "ResearchModule", "MaterialDiscovery", "CrossPollinationEngine"]
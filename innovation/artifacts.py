@@ -0,0 +1,157 @@
+"""innovation.artifacts
+
+Fingerprints and a local artifact cache for incremental experiment runs.
+An experiment's fingerprint hashes its parameters, code version and the
+hashes of its upstream outputs; results are stored under that fingerprint as
+pickle files, so an unchanged experiment is loaded instead of re-executed.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import types
+from typing import Any, Callable, Dict, Optional
+
+from simulation.result_cache import stable_hash
+
+
+def value_hash(value: Any) -> str:
+    """Hash a value: canonical JSON when possible, otherwise its pickle."""
+    try:
+        return stable_hash(value)
+    except (TypeError, ValueError):
+        return hashlib.sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def _const_token(value: Any) -> bytes:
+    """Stable encoding of a code constant.
+
+    Nested code objects (comprehensions, lambdas, inner functions) are
+    encoded by content rather than ``repr``, which includes their memory
+    address and line number; frozenset members are sorted because their
+    iteration order depends on string hash randomization.
+    """
+    if isinstance(value, types.CodeType):
+        return b"code:" + _code_digest(value)
+    if isinstance(value, (tuple, frozenset)):
+        tokens = [_const_token(item) for item in value]
+        if isinstance(value, frozenset):
+            tokens.sort()
+        return type(value).__name__.encode("utf-8") + b"(" + b",".join(tokens) + b")"
+    return f"{type(value).__name__}:{value!r}".encode("utf-8")
+
+
+def _code_digest(code: types.CodeType) -> bytes:
+    digest = hashlib.sha256(code.co_name.encode("utf-8"))
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for value in code.co_consts:
+        digest.update(hashlib.sha256(_const_token(value)).digest())
+    return digest.digest()
+
+
+def code_version(function: Callable[..., Any]) -> str:
+    """Hash a function's bytecode, constants and referenced names.
+
+    Editing the function body changes the hash; moving it around a file does
+    not, and the hash is the same in every process. Callables without a code
+    object hash by qualified name only.
+    """
+    code = getattr(function, "__code__", None)
+    name = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+    if code is None:
+        return hashlib.sha256(name.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(name.encode("utf-8"))
+    digest.update(_code_digest(code))
+    return digest.hexdigest()
+
+
+def experiment_fingerprint(
+    name: str, params: Any, version: str, upstream: Dict[str, str]
+) -> str:
+    """Fingerprint of one experiment run.
+
+    Args:
+        name: Experiment name.
+        params: Experiment parameters.
+        version: Code version (see :func:`code_version`).
+        upstream: ``{dependency: output hash}``.
+    """
+    return stable_hash({"name": name, "params": value_hash(params), "version": version, "upstream": upstream})
+
+
+class ArtifactCache:
+    """Pickle-file store of experiment results keyed by fingerprint.
+
+    Without a directory, artifacts are kept in memory only.
+
+    Attributes:
+        cache_dir: Directory holding ``<fp[:2]>/<fp>.pkl`` files, or None.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, fingerprint[:2], f"{fingerprint}.pkl")
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the stored artifact (``result``, ``output_hash``, ``duration``) or None."""
+        with self._lock:
+            artifact = self._memory.get(fingerprint)
+            if artifact is None and self.cache_dir:
+                try:
+                    with open(self._path(fingerprint), "rb") as handle:
+                        artifact = pickle.load(handle)
+                except FileNotFoundError:
+                    artifact = None
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    artifact = None
+                    self._discard(fingerprint)
+                if artifact is not None:
+                    self._memory[fingerprint] = artifact
+            self._stats["hits" if artifact is not None else "misses"] += 1
+            return artifact
+
+    def put(self, fingerprint: str, artifact: Dict[str, Any]) -> None:
+        """Store an artifact, atomically on disk."""
+        with self._lock:
+            self._memory[fingerprint] = artifact
+            self._stats["writes"] += 1
+            if not self.cache_dir:
+                return
+            path = self._path(fingerprint)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump(artifact, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+    def _discard(self, fingerprint: str) -> None:
+        try:
+            os.remove(self._path(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every artifact."""
+        with self._lock:
+            self._memory.clear()
+            if self.cache_dir:
+                for shard in os.scandir(self.cache_dir):
+                    if shard.is_dir():
+                        for blob in os.scandir(shard.path):
+                            if blob.name.endswith(".pkl"):
+                                os.remove(blob.path)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and write counters."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,321 @@
+"""innovation.catalog
+
+Local catalog of known materials backed by SQLite.
+- One row per material with a column per property, each with a B-tree index,
+  so property range queries are index scans
+- An (element, fraction) table indexed by element for composition queries
+- Compositions are identified by a quantized fingerprint, so the same
+  material is stored once and grid candidates can be checked against the
+  catalog in bulk
+- Nearest-neighbour queries in normalized property space run vectorized over
+  a cached NumPy copy of the property columns
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .elements import ELEMENT_PROPERTIES, ELEMENTS, PROPERTY_NAMES, property_table
+from .property_model import composition_matrix
+from .screening import _bounds
+
+# Steps per unit fraction used for composition fingerprints.
+FINGERPRINT_QUANTUM = 10_000
+
+_TABLE = property_table(ELEMENTS)
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS materials ("
+    " id INTEGER PRIMARY KEY,"
+    " fingerprint TEXT NOT NULL UNIQUE,"
+    " name TEXT,"
+    " source TEXT,"
+    " composition TEXT NOT NULL,"
+    + ", ".join(f" {name} REAL" for name in PROPERTY_NAMES)
+    + ")",
+    "CREATE TABLE IF NOT EXISTS material_elements ("
+    " material_id INTEGER NOT NULL REFERENCES materials(id) ON DELETE CASCADE,"
+    " element TEXT NOT NULL,"
+    " fraction REAL NOT NULL,"
+    " PRIMARY KEY (material_id, element))",
+    "CREATE INDEX IF NOT EXISTS idx_material_elements_element ON material_elements(element, fraction)",
+] + [f"CREATE INDEX IF NOT EXISTS idx_materials_{name} ON materials({name})" for name in PROPERTY_NAMES]
+
+
+def normalize_composition(composition: Mapping[str, Any]) -> Dict[str, float]:
+    """Return ``{element: fraction}`` with unit sum and zero entries dropped.
+
+    Raises:
+        ValueError: For unknown elements, negative amounts or an empty total.
+    """
+    unknown = sorted(el for el in composition if el not in ELEMENT_PROPERTIES)
+    if unknown:
+        raise ValueError(f"Unknown elements: {unknown}")
+    amounts = {el: float(amount) for el, amount in composition.items()}
+    if any(amount < 0 for amount in amounts.values()):
+        raise ValueError("Element amounts must be non-negative.")
+    total = sum(amounts.values())
+    if total <= 0:
+        raise ValueError("Composition must contain a positive amount.")
+    return {el: amount / total for el, amount in sorted(amounts.items()) if amount > 0}
+
+
+def fingerprint(fractions: Mapping[str, float], quantum: int = FINGERPRINT_QUANTUM) -> str:
+    """Canonical fingerprint of normalized fractions, e.g. ``"C:2000,Fe:8000"``."""
+    steps = ((el, int(round(fraction * quantum))) for el, fraction in sorted(fractions.items()))
+    return ",".join(f"{el}:{step}" for el, step in steps if step)
+
+
+def _row_keys(steps: np.ndarray) -> np.ndarray:
+    """View each row of an integer matrix as one opaque value for set operations."""
+    steps = np.ascontiguousarray(steps, dtype=np.int32)
+    return steps.view(np.dtype((np.void, steps.itemsize * steps.shape[1]))).reshape(-1)
+
+
+class MaterialsCatalog:
+    """SQLite-backed store of known materials.
+
+    Attributes:
+        path: Database file, or ``":memory:"``.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.Lock()
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self._matrix: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "MaterialsCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM materials").fetchone()[0]
+
+    def bulk_import(self, records: Iterable[Mapping[str, Any]], batch_size: int = 10_000) -> int:
+        """Insert many materials in batched transactions.
+
+        Each record is ``{"composition": {element: amount}, "properties":
+        {...}, "name": ..., "source": ...}``; only ``composition`` is
+        required and missing properties are filled from the rule-of-mixtures
+        model. Compositions already in the catalog are skipped.
+
+        Returns:
+            Number of materials added.
+        """
+        added = 0
+        batch: List[Mapping[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def add(
+        self, composition: Mapping[str, Any], properties: Optional[Mapping[str, float]] = None, **fields: Any
+    ) -> bool:
+        """Add one material; returns False when its composition is already known."""
+        return self.bulk_import([{"composition": composition, "properties": properties, **fields}]) == 1
+
+    def _insert(self, records: Sequence[Mapping[str, Any]]) -> int:
+        fractions = [normalize_composition(record["composition"]) for record in records]
+        predicted, _ = composition_matrix(fractions, ELEMENTS)
+        predicted = predicted @ _TABLE
+        rows = []
+        for record, composition, estimate in zip(records, fractions, predicted.tolist()):
+            given = record.get("properties") or {}
+            values = tuple(float(given.get(name, value)) for name, value in zip(PROPERTY_NAMES, estimate))
+            rows.append(
+                (fingerprint(composition), record.get("name"), record.get("source"), json.dumps(composition)) + values
+            )
+        columns = ", ".join(("fingerprint", "name", "source", "composition") + PROPERTY_NAMES)
+        placeholders = ", ".join("?" * (4 + len(PROPERTY_NAMES)))
+        with self._lock, self._conn:
+            # Row ids are assigned in increasing order, so the new materials
+            # are exactly those above the previous maximum id.
+            last_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM materials").fetchone()[0]
+            self._conn.executemany(f"INSERT OR IGNORE INTO materials ({columns}) VALUES ({placeholders})", rows)
+            new_ids = dict(self._conn.execute("SELECT fingerprint, id FROM materials WHERE id > ?", (last_id,)))
+            added = len(new_ids)
+            if added:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO material_elements (material_id, element, fraction) VALUES (?, ?, ?)",
+                    [
+                        (new_ids[row[0]], el, fraction)
+                        for row, composition in zip(rows, fractions)
+                        if row[0] in new_ids
+                        for el, fraction in composition.items()
+                    ],
+                )
+                self._matrix = None
+        return added
+
+    def _where(
+        self,
+        elements: Optional[Sequence[str]],
+        within: Optional[Sequence[str]],
+        properties: Optional[Mapping[str, Any]],
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for el in elements or ():
+            clauses.append("id IN (SELECT material_id FROM material_elements WHERE element = ?)")
+            params.append(el)
+        if within is not None:
+            clauses.append(
+                "id NOT IN (SELECT material_id FROM material_elements"
+                f" WHERE element NOT IN ({', '.join('?' * len(within))}))"
+            )
+            params.extend(within)
+        for name, spec in (properties or {}).items():
+            if name not in PROPERTY_NAMES:
+                raise ValueError(f"Unknown property: {name}")
+            low, high = _bounds(spec)
+            if low > -np.inf:
+                clauses.append(f"{name} >= ?")
+                params.append(low)
+            if high < np.inf:
+                clauses.append(f"{name} <= ?")
+                params.append(high)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        elements: Optional[Sequence[str]] = None,
+        within: Optional[Sequence[str]] = None,
+        properties: Optional[Mapping[str, Any]] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return materials matching composition and property-range filters.
+
+        Args:
+            elements: Elements every result must contain.
+            within: Elements results may contain; anything else is excluded.
+            properties: ``{property: {"min": a, "max": b}}`` or ``(a, b)``
+                ranges, answered from the property indexes.
+            limit: Maximum number of results.
+            order_by: Property to sort by (prefix ``-`` for descending).
+        """
+        where, params = self._where(elements, within, properties)
+        sql = f"SELECT id, name, source, composition, {', '.join(PROPERTY_NAMES)} FROM materials{where}"
+        if order_by:
+            column = order_by.lstrip("-")
+            if column not in PROPERTY_NAMES:
+                raise ValueError(f"Unknown property: {column}")
+            sql += f" ORDER BY {column} {'DESC' if order_by.startswith('-') else 'ASC'}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._material(row) for row in rows]
+
+    @staticmethod
+    def _material(row: Sequence[Any]) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "name": row[1],
+            "source": row[2],
+            "composition": json.loads(row[3]),
+            "properties": dict(zip(PROPERTY_NAMES, row[4:])),
+        }
+
+    def _property_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._matrix is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {', '.join(PROPERTY_NAMES)} FROM materials ORDER BY id"
+                ).fetchall()
+            data = np.array(rows, dtype=np.float64).reshape(len(rows), len(PROPERTY_NAMES) + 1)
+            self._matrix = (data[:, 0].astype(np.int64), data[:, 1:])
+        return self._matrix
+
+    def nearest(self, properties: Mapping[str, float], k: int = 5, **filters: Any) -> List[Dict[str, Any]]:
+        """Return the ``k`` materials closest to the given property values.
+
+        Distances are Euclidean over the given properties, each divided by its
+        range across the catalog. ``filters`` are passed to :meth:`query`.
+
+        Returns:
+            Materials with an added ``distance``, closest first.
+        """
+        unknown = [name for name in properties if name not in PROPERTY_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown properties: {unknown}")
+        ids, matrix = self._property_matrix()
+        if len(ids) == 0 or k <= 0:
+            return []
+        columns = [PROPERTY_NAMES.index(name) for name in properties]
+        target = np.array([float(value) for value in properties.values()])
+        spread = matrix[:, columns].max(axis=0) - matrix[:, columns].min(axis=0)
+        scaled = (matrix[:, columns] - target) / np.where(spread > 0, spread, 1.0)
+        distances = np.sqrt(np.einsum("ij,ij->i", scaled, scaled))
+        if filters:
+            allowed = {material["id"] for material in self.query(**filters)}
+            candidates = np.flatnonzero(np.isin(ids, list(allowed)))
+        else:
+            candidates = np.arange(len(ids))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(distances[candidates], kind="stable")]
+        by_id = {material["id"]: material for material in self._fetch(ids[candidates].tolist())}
+        return [{**by_id[int(ids[i])], "distance": float(distances[i])} for i in candidates]
+
+    def _fetch(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, name, source, composition, {', '.join(PROPERTY_NAMES)} FROM materials"
+                f" WHERE id IN ({', '.join('?' * len(ids))})",
+                list(ids),
+            ).fetchall()
+        return [self._material(row) for row in rows]
+
+    def compositions(self, elements: Sequence[str]) -> np.ndarray:
+        """Return an (n, elements) fraction matrix of materials made only of ``elements``."""
+        index = {el: i for i, el in enumerate(elements)}
+        materials = self.query(within=list(elements))
+        matrix = np.zeros((len(materials), len(elements)))
+        for row, material in enumerate(materials):
+            for el, fraction in material["composition"].items():
+                matrix[row, index[el]] = fraction
+        return matrix
+
+    def known_mask(
+        self, fractions: np.ndarray, elements: Sequence[str], known: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Mask of ``fractions`` rows whose fingerprint is in the catalog.
+
+        Args:
+            fractions: (n, elements) fractions summing to one per row.
+            elements: Column order of ``fractions``.
+            known: Optional result of :meth:`compositions` to reuse across
+                chunks.
+        """
+        known = self.compositions(elements) if known is None else known
+        if len(known) == 0 or len(fractions) == 0:
+            return np.zeros(len(fractions), dtype=bool)
+        steps = np.rint(np.asarray(fractions) * FINGERPRINT_QUANTUM)
+        return np.isin(_row_keys(steps), _row_keys(np.rint(known * FINGERPRINT_QUANTUM)))
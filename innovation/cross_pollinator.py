@@ -0,0 +1,333 @@
+"""innovation.cross_pollinator
+
+Cross-company breakthrough generation.
+- Company tech stacks are sparse capability vectors; each capability carries
+  a sparse vector of domain tags
+- Pairwise novelty (how rarely two capabilities live in the same company) and
+  compatibility (domain overlap) are precomputed as dense atom-by-atom
+  matrices, so every extension of a combination is scored in one NumPy step
+- Combinations of two, three or more capabilities from distinct companies are
+  explored with a bounded beam search; beam members whose optimistic bound
+  (over every size they can still grow to) cannot reach the current top-k are
+  pruned, and the search stops at a fixed time budget
+"""
+
+import heapq
+import re
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.utils import setup_logger
+from simulation.keyword_automaton import KeywordAutomaton
+
+# Company -> {capability: strength in [0, 1]}.
+COMPANY_CAPABILITIES: Dict[str, Dict[str, float]] = {
+    "Tesla": {
+        "batteries": 0.9,
+        "electric_drivetrains": 0.9,
+        "autonomy": 0.8,
+        "solar": 0.6,
+        "gigafactory_manufacturing": 0.9,
+    },
+    "SpaceX": {
+        "reusable_rockets": 0.95,
+        "satellite_internet": 0.9,
+        "materials_science": 0.7,
+        "gigafactory_manufacturing": 0.6,
+        "life_support": 0.5,
+    },
+    "NASA": {
+        "deep_space_navigation": 0.9,
+        "life_support": 0.9,
+        "mission_assurance": 0.95,
+        "materials_science": 0.8,
+        "earth_observation": 0.85,
+    },
+    "Google": {
+        "search_ranking": 0.95,
+        "large_language_models": 0.9,
+        "cloud_infrastructure": 0.9,
+        "quantum_computing": 0.6,
+        "tpu_accelerators": 0.8,
+        "autonomy": 0.6,
+    },
+    "Meta": {
+        "social_graph": 0.95,
+        "vr_ar": 0.8,
+        "recommendation_systems": 0.9,
+        "open_source_ai": 0.8,
+        "large_language_models": 0.7,
+    },
+    "PayPal": {
+        "digital_payments": 0.95,
+        "fraud_detection": 0.9,
+        "identity_verification": 0.8,
+    },
+    "Microsoft": {
+        "operating_systems": 0.9,
+        "enterprise_software": 0.9,
+        "cloud_infrastructure": 0.85,
+        "quantum_computing": 0.5,
+        "large_language_models": 0.7,
+    },
+    "Gates Foundation": {
+        "global_health": 0.9,
+        "vaccine_delivery": 0.85,
+        "clean_energy_investment": 0.7,
+    },
+}
+
+# Capability -> domain tags.
+CAPABILITY_DOMAINS: Dict[str, Tuple[str, ...]] = {
+    "batteries": ("energy", "storage", "manufacturing"),
+    "electric_drivetrains": ("energy", "mobility", "hardware"),
+    "autonomy": ("ai", "mobility", "sensing"),
+    "solar": ("energy", "manufacturing", "climate"),
+    "gigafactory_manufacturing": ("manufacturing", "scale"),
+    "reusable_rockets": ("aerospace", "hardware", "scale"),
+    "satellite_internet": ("connectivity", "aerospace", "infrastructure"),
+    "life_support": ("aerospace", "health", "safety"),
+    "deep_space_navigation": ("aerospace", "sensing"),
+    "materials_science": ("materials", "hardware", "aerospace"),
+    "mission_assurance": ("safety", "verification"),
+    "earth_observation": ("sensing", "data", "climate"),
+    "search_ranking": ("ai", "data"),
+    "large_language_models": ("ai", "data", "software"),
+    "cloud_infrastructure": ("infrastructure", "software", "scale"),
+    "quantum_computing": ("computing", "hardware"),
+    "tpu_accelerators": ("computing", "hardware", "ai"),
+    "social_graph": ("data", "community"),
+    "vr_ar": ("hardware", "software", "community"),
+    "recommendation_systems": ("ai", "data", "community"),
+    "open_source_ai": ("ai", "software", "community"),
+    "digital_payments": ("finance", "software", "security"),
+    "fraud_detection": ("ai", "finance", "security"),
+    "identity_verification": ("security", "finance", "data"),
+    "operating_systems": ("software", "computing"),
+    "enterprise_software": ("software", "scale"),
+    "global_health": ("health", "community"),
+    "vaccine_delivery": ("health", "logistics"),
+    "clean_energy_investment": ("energy", "finance", "climate"),
+}
+
+# Upper bound on scores materialized per extension chunk.
+_CHUNK_ELEMENTS = 1 << 20
+
+DEFAULT_WEIGHTS = {"novelty": 0.3, "compatibility": 0.25, "relevance": 0.35, "strength": 0.1}
+
+
+class CrossPollinationEngine:
+    """Generates cross-company breakthroughs by combining capabilities.
+
+    An *atom* is one (company, capability) pair. A combination's score is
+    the mean of its atoms' unary terms (problem relevance and capability
+    strength) plus the mean of its pairwise terms (novelty and
+    compatibility), each weighted by ``weights``. Atoms of the same company
+    or the same capability are never combined.
+
+    Attributes:
+        companies: Company names.
+        capabilities: Capability vocabulary.
+        weights: Score weights for novelty, compatibility, relevance and
+            strength.
+    """
+
+    def __init__(
+        self,
+        capabilities: Optional[Mapping[str, Mapping[str, float]]] = None,
+        domains: Optional[Mapping[str, Sequence[str]]] = None,
+        weights: Optional[Mapping[str, float]] = None,
+    ):
+        self.logger = setup_logger(self.__class__.__name__)
+        capabilities = COMPANY_CAPABILITIES if capabilities is None else capabilities
+        domains = CAPABILITY_DOMAINS if domains is None else domains
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.companies = sorted(capabilities)
+        self.capabilities = sorted({cap for stack in capabilities.values() for cap in stack})
+        cap_index = {cap: i for i, cap in enumerate(self.capabilities)}
+
+        # Sparse company x capability matrix in coordinate form; each entry is an atom.
+        rows, cols, values = [], [], []
+        for company_id, company in enumerate(self.companies):
+            for cap, strength in sorted(capabilities[company].items()):
+                rows.append(company_id)
+                cols.append(cap_index[cap])
+                values.append(float(strength))
+        self.atom_company = np.array(rows, dtype=np.int64)
+        self.atom_capability = np.array(cols, dtype=np.int64)
+        self.atom_strength = np.array(values, dtype=np.float64)
+
+        incidence = np.zeros((len(self.companies), len(self.capabilities)))
+        incidence[self.atom_company, self.atom_capability] = 1.0
+        cooccurrence = incidence.T @ incidence
+        frequency = np.diag(cooccurrence)
+        novelty = 1.0 - cooccurrence / np.maximum(np.minimum.outer(frequency, frequency), 1.0)
+
+        self.tags = sorted({tag for cap in self.capabilities for tag in domains.get(cap, ())})
+        tag_index = {tag: i for i, tag in enumerate(self.tags)}
+        tag_rows = [(i, tag_index[tag]) for i, cap in enumerate(self.capabilities) for tag in domains.get(cap, ())]
+        self.domain_vectors = np.zeros((len(self.capabilities), len(self.tags)))
+        if tag_rows:
+            self.domain_vectors[tuple(np.array(tag_rows).T)] = 1.0
+        norms = np.linalg.norm(self.domain_vectors, axis=1, keepdims=True)
+        unit = self.domain_vectors / np.where(norms > 0, norms, 1.0)
+        compatibility = unit @ unit.T
+
+        caps = self.atom_capability
+        self._novelty = novelty[np.ix_(caps, caps)]
+        self._compatibility = compatibility[np.ix_(caps, caps)]
+        pair = self.weights["novelty"] * self._novelty + self.weights["compatibility"] * self._compatibility
+        invalid = (self.atom_company[:, None] == self.atom_company[None, :]) | (caps[:, None] == caps[None, :])
+        self._pair = np.where(invalid, -np.inf, pair)
+        self._pair_max = float(pair[~invalid].max()) if (~invalid).any() else 0.0
+
+        # Patterns are padded with spaces so they only match whole words.
+        names = [cap.replace("_", " ") for cap in self.capabilities]
+        patterns = [f" {pattern} " for pattern in names + self.tags]
+        self._automaton = KeywordAutomaton(patterns) if patterns else None
+
+    def relevance(self, problem: str) -> np.ndarray:
+        """Per-capability relevance in [0, 1] to a problem statement.
+
+        A capability mentioned by name scores 1; otherwise it scores the
+        fraction of its domain tags mentioned.
+        """
+        scores = np.zeros(len(self.capabilities))
+        if self._automaton is None or not problem:
+            return scores
+        matched = self._automaton.find(f" {re.sub(r'[^a-z0-9]+', ' ', problem.lower())} ")
+        n_caps = len(self.capabilities)
+        named = [i for i in matched if i < n_caps]
+        tag_hits = np.zeros(len(self.tags))
+        tag_hits[[i - n_caps for i in matched if i >= n_caps]] = 1.0
+        counts = self.domain_vectors.sum(axis=1)
+        scores = np.divide(self.domain_vectors @ tag_hits, counts, out=np.zeros(n_caps), where=counts > 0)
+        scores[named] = 1.0
+        return scores
+
+    def generate_breakthroughs(
+        self,
+        problem: str,
+        top_k: int = 5,
+        max_size: int = 3,
+        beam_width: int = 64,
+        time_budget: float = 1.0,
+    ) -> Dict[str, Any]:
+        """Search capability combinations for the best breakthroughs.
+
+        Args:
+            problem: Problem statement used for relevance scoring.
+            top_k: Number of breakthroughs to return.
+            max_size: Largest combination size (at least 2).
+            beam_width: Combinations of each size kept for extension.
+            time_budget: Wall-clock seconds; the best combinations found so
+                far are returned when it runs out.
+
+        Returns:
+            Dict with the ranked ``breakthroughs`` and search counters
+            (``explored``, ``pruned``, ``timed_out``, ``elapsed``).
+        """
+        if max_size < 2:
+            raise ValueError("max_size must be at least 2.")
+        started = time.perf_counter()
+        deadline = started + time_budget
+        relevance = self.relevance(problem)[self.atom_capability]
+        unary = self.weights["relevance"] * relevance + self.weights["strength"] * self.atom_strength
+        best: List[Tuple[float, Tuple[int, ...]]] = []
+        explored = pruned = 0
+        timed_out = False
+        keep_per_level = max(beam_width, top_k)
+        chunk_rows = max(1, _CHUNK_ELEMENTS // max(1, len(unary)))
+
+        def offer(scores: np.ndarray, combos: np.ndarray) -> None:
+            for score, combo in zip(scores.tolist(), combos.tolist()):
+                entry = (score, tuple(combo))
+                if len(best) < top_k:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+        # Level 1 is every single atom; each level extends the beam by one atom.
+        beam = np.arange(len(unary))[:, None]
+        unary_sum, pair_sum = unary.copy(), np.zeros(len(unary))
+        for size in range(2, max_size + 1):
+            n_pairs = size * (size - 1) / 2
+            if len(best) == top_k:
+                # A member of ``size - 1`` atoms can grow into any final size up
+                # to ``max_size``; bound the best of those completions, with
+                # every added atom and pair at its maximum.
+                final = np.arange(size, max_size + 1)[:, None]
+                final_pairs = final * (final - 1) / 2
+                added_pairs = final_pairs - (size - 1) * (size - 2) / 2
+                bound = (unary_sum + (final - size + 1) * unary.max()) / final
+                bound = (bound + (pair_sum + added_pairs * self._pair_max) / final_pairs).max(axis=0)
+                alive = bound > best[0][0]
+                pruned += int((~alive).sum())
+                beam, unary_sum, pair_sum = beam[alive], unary_sum[alive], pair_sum[alive]
+
+            candidates: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+            for start in range(0, len(beam), chunk_rows):
+                # At least one chunk is scored so there is always something to return.
+                if (best or candidates) and time.perf_counter() >= deadline:
+                    timed_out = True
+                    break
+                stop = start + chunk_rows
+                # Atoms sharing a company or capability with a member get -inf here.
+                contributions = self._pair[beam[start:stop]].sum(axis=1)
+                scores = (unary_sum[start:stop, None] + unary[None, :]) / size
+                scores += (pair_sum[start:stop, None] + contributions) / n_pairs
+                members, atoms = np.nonzero(np.isfinite(scores))
+                flat = scores[members, atoms]
+                explored += len(flat)
+                # Every set appears once per member it extends, so keep enough rows
+                # to retain ``keep_per_level`` distinct sets after deduplication.
+                if len(flat) > keep_per_level * size:
+                    top = np.argpartition(-flat, keep_per_level * size - 1)[: keep_per_level * size]
+                    members, atoms, flat = members[top], atoms[top], flat[top]
+                candidates.append((members + start, atoms, flat, contributions[members, atoms]))
+            if not candidates:
+                break
+
+            members, atoms, flat, added = (np.concatenate(parts) for parts in zip(*candidates))
+            combos = np.sort(np.column_stack([beam[members], atoms]), axis=1)
+            _, first_seen = np.unique(combos, axis=0, return_index=True)
+            order = first_seen[np.argsort(-flat[first_seen], kind="stable")][:keep_per_level]
+            offer(flat[order], combos[order])
+            beam = combos[order]
+            unary_sum = unary_sum[members[order]] + unary[atoms[order]]
+            pair_sum = pair_sum[members[order]] + added[order]
+            if timed_out or len(beam) == 0:
+                break
+
+        ranked = [self._describe(combo, score, relevance) for score, combo in sorted(best, reverse=True)]
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            f"Generated {len(ranked)} breakthroughs for '{problem}' "
+            f"({explored} combinations scored, {pruned} pruned, {elapsed:.3f}s)"
+        )
+        return {
+            "problem": problem,
+            "breakthroughs": ranked,
+            "explored": explored,
+            "pruned": pruned,
+            "timed_out": timed_out,
+            "elapsed": elapsed,
+        }
+
+    def _describe(self, combo: Tuple[int, ...], score: float, relevance: np.ndarray) -> Dict[str, Any]:
+        atoms = np.array(combo)
+        upper = np.triu_indices(len(atoms), k=1)
+        companies = [self.companies[i] for i in self.atom_company[atoms]]
+        capabilities = [self.capabilities[i] for i in self.atom_capability[atoms]]
+        return {
+            "title": " × ".join(f"{company} {cap.replace('_', ' ')}" for company, cap in zip(companies, capabilities)),
+            "companies": companies,
+            "capabilities": capabilities,
+            "score": score,
+            "novelty": float(self._novelty[np.ix_(atoms, atoms)][upper].mean()),
+            "compatibility": float(self._compatibility[np.ix_(atoms, atoms)][upper].mean()),
+            "relevance": float(relevance[atoms].mean()),
+            "strength": float(self.atom_strength[atoms].mean()),
+        }
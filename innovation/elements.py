@@ -0,0 +1,70 @@
+"""innovation.elements
+
+Element property table for material discovery.
+Approximate room-temperature properties of pure elements used by the
+rule-of-mixtures property model. Values are indicative only:
+- density: g/cm^3
+- melting_point: K
+- cost: USD/kg
+- strength: tensile strength, MPa
+- conductivity: electrical conductivity, MS/m
+- hardness: Mohs scale
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+PROPERTY_NAMES = ("density", "melting_point", "cost", "strength", "conductivity", "hardness")
+
+ELEMENT_PROPERTIES: Dict[str, Sequence[float]] = {
+    "Al": (2.70, 933.0, 2.5, 90.0, 37.7, 2.75),
+    "C": (2.26, 3823.0, 1.0, 15.0, 0.07, 1.5),
+    "Co": (8.90, 1768.0, 33.0, 225.0, 17.2, 5.0),
+    "Cr": (7.19, 2180.0, 9.0, 282.0, 7.9, 8.5),
+    "Cu": (8.96, 1358.0, 9.0, 210.0, 59.6, 3.0),
+    "Fe": (7.87, 1811.0, 0.5, 540.0, 10.0, 4.0),
+    "Li": (0.53, 454.0, 80.0, 15.0, 10.8, 0.6),
+    "Mg": (1.74, 923.0, 2.5, 160.0, 22.6, 2.5),
+    "Mn": (7.21, 1519.0, 2.0, 496.0, 0.7, 6.0),
+    "Mo": (10.28, 2896.0, 40.0, 324.0, 18.7, 5.5),
+    "Nb": (8.57, 2750.0, 60.0, 275.0, 6.6, 6.0),
+    "Ni": (8.91, 1728.0, 18.0, 345.0, 14.3, 4.0),
+    "Si": (2.33, 1687.0, 2.0, 113.0, 0.001, 6.5),
+    "Sn": (7.29, 505.0, 25.0, 20.0, 9.1, 1.5),
+    "Ti": (4.51, 1941.0, 11.0, 434.0, 2.4, 6.0),
+    "V": (6.00, 2183.0, 350.0, 800.0, 5.0, 7.0),
+    "W": (19.25, 3695.0, 35.0, 980.0, 18.9, 7.5),
+    "Zn": (7.14, 693.0, 2.8, 110.0, 16.6, 2.5),
+}
+
+ELEMENTS = tuple(sorted(ELEMENT_PROPERTIES))
+
+
+def property_table(elements: Sequence[str]) -> np.ndarray:
+    """Return the (elements x properties) table for the given elements.
+
+    Raises:
+        ValueError: If an element is not in ``ELEMENT_PROPERTIES``.
+    """
+    unknown = [el for el in elements if el not in ELEMENT_PROPERTIES]
+    if unknown:
+        raise ValueError(f"Unknown elements: {unknown}")
+    return np.array([ELEMENT_PROPERTIES[el] for el in elements], dtype=np.float64).reshape(
+        len(elements), len(PROPERTY_NAMES)
+    )
+
+
+def parse_elements(spec: object) -> List[str]:
+    """Parse an element list from a list or a string such as ``"Fe-C"``.
+
+    Separators ``-``, ``,``, ``/`` and whitespace are accepted and duplicates
+    are dropped while preserving order.
+    """
+    if isinstance(spec, str):
+        for separator in ",/":
+            spec = spec.replace(separator, "-")
+        parts = [part.strip() for part in spec.replace(" ", "-").split("-")]
+    else:
+        parts = [str(part).strip() for part in spec]
+    return list(dict.fromkeys(part for part in parts if part))
@@ -0,0 +1,200 @@
+"""innovation.feedback
+
+Streaming feedback from simulations into material discovery.
+- SimulationFeedback: consumes simulation outputs from a bounded asyncio
+  queue (producers wait when it is full), folds them into the property model
+  in micro-batches and refreshes watched discovery rankings after each batch
+- RankingWatch: the retained candidate pool of a discovery run, re-scored
+  against the current model instead of re-screening the composition space
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.utils import setup_logger
+
+from .elements import PROPERTY_NAMES
+from .property_model import composition_matrix
+from .screening import CompiledConstraints, CompiledObjectives, TopCandidates
+
+if TYPE_CHECKING:
+    from .material_discovery import MaterialDiscovery
+
+_STOP = object()
+
+
+class RankingWatch:
+    """Candidate pool of a discovery run that can be re-ranked cheaply.
+
+    The pool holds the best feasible candidates found by the original screen
+    (more than were returned). When the property model changes, only the
+    pool is re-scored and re-checked against the constraints; candidates
+    outside the pool are not revisited until the next full screen.
+
+    Attributes:
+        elements: Column order of ``rows``.
+        rows: (pool, elements) candidate fractions.
+        top_k: Number of candidates reported per refresh.
+        model_version: Model version the ranking was last computed for.
+        ranking: Described candidates of the latest ranking.
+    """
+
+    def __init__(
+        self,
+        elements: Sequence[str],
+        constraints: CompiledConstraints,
+        objectives: CompiledObjectives,
+        rows: np.ndarray,
+        top_k: int,
+        model_version: int,
+    ):
+        self.elements = list(elements)
+        self.constraints = constraints
+        self.objectives = objectives
+        self.rows = rows
+        self.top_k = top_k
+        self.model_version = model_version
+        self.ranking: List[Dict[str, Any]] = []
+
+    def rank(self, table: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (scores, rows) of the best ``top_k`` pool members under ``table``."""
+        best = TopCandidates(self.top_k)
+        if len(self.rows):
+            properties = self.rows @ table
+            keep = self.constraints.mask(self.rows, properties)
+            best.push(self.objectives.score(properties[keep]), self.rows[keep])
+        return best.best()
+
+
+class SimulationFeedback:
+    """Bounded, micro-batched stream of simulation outputs into discovery.
+
+    Each output is ``{"composition": {element: amount}, "properties":
+    {property: value}}``; outputs without a usable composition or any known
+    property are skipped. Use as an async context manager or call
+    :meth:`start` and :meth:`close` explicitly.
+
+    Attributes:
+        discovery: The MaterialDiscovery whose model and watches are updated.
+        batch_size: Maximum outputs folded into one model update.
+        queue: The bounded input queue.
+        stats: Received, applied and skipped outputs, batches and refreshes.
+    """
+
+    def __init__(self, discovery: "MaterialDiscovery", batch_size: int = 64, max_queue: int = 1024):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.logger = setup_logger(self.__class__.__name__)
+        self.discovery = discovery
+        self.batch_size = batch_size
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue)
+        self.stats = {"received": 0, "applied": 0, "skipped": 0, "batches": 0, "refreshes": 0}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def __aenter__(self) -> "SimulationFeedback":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the consumer task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume())
+
+    async def put(self, output: Mapping[str, Any]) -> None:
+        """Enqueue one output, waiting while the queue is full.
+
+        Raises:
+            RuntimeError: If the stream is not started or its consumer has
+                stopped (the consumer's own exception is raised instead
+                when it failed).
+        """
+        if self._task is None:
+            raise RuntimeError("SimulationFeedback is not started.")
+        await self._enqueue(output)
+        self.stats["received"] += 1
+
+    async def close(self) -> Dict[str, Any]:
+        """Flush the queue, stop the consumer and return the stats."""
+        if self._task is not None:
+            try:
+                if not self._task.done():
+                    await self._enqueue(_STOP)
+                await self._task
+            finally:
+                self._task = None
+        return dict(self.stats)
+
+    async def _enqueue(self, item: Any) -> None:
+        """Put ``item`` on the queue, failing fast if the consumer stops first."""
+        consumer = self._task
+        if not consumer.done() and not self.queue.full():
+            self.queue.put_nowait(item)
+            return
+        waiter = asyncio.ensure_future(self.queue.put(item))
+        try:
+            await asyncio.wait({waiter, consumer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+        if waiter.done() and not waiter.cancelled():
+            return
+        consumer.result()
+        raise RuntimeError("SimulationFeedback consumer has stopped.")
+
+    async def _consume(self) -> None:
+        while True:
+            item = await self.queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._apply(batch)
+            if stop:
+                return
+            # Let producers blocked on a full queue resume between batches.
+            await asyncio.sleep(0)
+
+    def _apply(self, batch: List[Any]) -> None:
+        model = self.discovery.predictor.model
+        rows: List[np.ndarray] = []
+        ignored: List[str] = []
+        observed: List[List[float]] = []
+        for output in batch:
+            composition = output.get("composition") if isinstance(output, Mapping) else None
+            properties = output.get("properties") if isinstance(output, Mapping) else None
+            try:
+                row = [float(properties[name]) if name in properties else np.nan for name in PROPERTY_NAMES]
+                if not isinstance(composition, Mapping):
+                    raise TypeError("composition must be a mapping")
+                amounts, unknown = composition_matrix([composition], model.elements)
+            except (TypeError, ValueError):
+                self.stats["skipped"] += 1
+                continue
+            rows.append(amounts[0])
+            ignored.extend(unknown)
+            observed.append(row)
+
+        amounts = np.array(rows, dtype=np.float64).reshape(len(rows), len(model.elements))
+        values = np.array(observed, dtype=np.float64).reshape(len(observed), len(PROPERTY_NAMES))
+        totals = amounts.sum(axis=1)
+        usable = (totals > 0) & (amounts >= 0).all(axis=1) & (~np.isnan(values)).any(axis=1)
+        self.stats["skipped"] += int((~usable).sum())
+        if ignored:
+            self.logger.warning(f"Ignoring unknown composition keys: {sorted(set(ignored))}")
+        if not usable.any():
+            return
+        model.update(amounts[usable] / totals[usable, None], values[usable])
+        self.stats["applied"] += int(usable.sum())
+        self.stats["batches"] += 1
+        self.stats["refreshes"] += len(self.discovery.refresh_rankings())
@@ -1,49 +1,408 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
 from core.utils import setup_logger
+from innovation.catalog import MaterialsCatalog
+from innovation.elements import ELEMENTS, PROPERTY_NAMES, parse_elements
+from innovation.feedback import RankingWatch, SimulationFeedback
+from innovation.property_model import BatchPropertyPredictor, Compositions, composition_matrix
+from innovation.optimizer import EvolutionaryOptimizer
+from innovation.pareto import ParetoFront
+from innovation.screening import CompiledConstraints, CompiledObjectives, CompositionGrid, TopCandidates
+
+# Number of non-zero elements screened when no element set is given.
+DEFAULT_MAX_COMPONENTS = 3
+
 
 class MaterialDiscovery:
     """Material discovery using AI/ML simulations and analyses."""
 
-    def __init__(self):
+    def __init__(
+        self, predictor: Optional[BatchPropertyPredictor] = None, catalog: Optional[MaterialsCatalog] = None
+    ):
         self.logger = setup_logger(self.__class__.__name__)
+        self.predictor = predictor or BatchPropertyPredictor()
+        self.catalog = catalog
+        self.watches: Dict[str, RankingWatch] = {}
 
     def discover_new_material(
         self,
         target_properties: Dict[str, Any],
         constraints: Dict[str, Any],
+        top_k: int = 10,
+        resolution: int = 20,
+        chunk_size: int = 65_536,
+        candidates: Optional[np.ndarray] = None,
+        pareto: bool = False,
+        watch: Optional[str] = None,
+        pool_size: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """Screen a composition space and return the best candidates.
+
+        The element set comes from ``constraints["elements"]`` or
+        ``constraints["composition"]`` (e.g. ``"Fe-C"``); without either, all
+        known elements are screened with at most ``DEFAULT_MAX_COMPONENTS``
+        non-zero elements. Compositions are enumerated on a grid of
+        ``1 / resolution`` steps unless explicit ``candidates`` (rows of
+        element fractions) are given. Properties come from the predictor's
+        rule-of-mixtures model, including corrections learned from
+        simulation feedback. With a ``catalog``, materials that are
+        already known are not reported as new candidates; the known materials
+        within the element set that satisfy the constraints are returned
+        separately as ``known_materials``.
+
+        Args:
+            target_properties: Objectives, see ``CompiledObjectives``.
+            constraints: Element set and feasibility bounds, see
+                ``CompiledConstraints``.
+            top_k: Number of candidates to return.
+            resolution: Grid steps per unit fraction.
+            chunk_size: Maximum candidates evaluated per vectorized chunk.
+            candidates: Optional (n, elements) array of fractions to screen.
+            pareto: Also maintain the Pareto front of the feasible candidates
+                over the individual objectives.
+            watch: Name under which the best ``pool_size`` candidates are
+                retained so :meth:`refresh_rankings` can re-rank them after
+                model updates.
+            pool_size: Candidates retained for a watch (default
+                ``max(10 * top_k, 1000)``).
+
+        Returns:
+            Dict with the ranked ``candidates``, ``known_materials``, the
+            ``pareto_front`` (None unless requested) and screening counters.
+        """
         self.logger.info(
             f"Discovering material with {len(target_properties)} target properties"
         )
+        spec = constraints.get("elements", constraints.get("composition"))
+        elements = parse_elements(spec) if spec else list(ELEMENTS)
+        limits = dict(constraints)
+        if not spec:
+            limits.setdefault("max_components", DEFAULT_MAX_COMPONENTS)
+        table = self.predictor.model.table_for(elements)
+        compiled = CompiledConstraints(elements, limits)
+        objectives = CompiledObjectives(target_properties, table)
+        if objectives.ignored:
+            self.logger.warning(f"Ignoring unknown target properties: {objectives.ignored}")
+
+        grid = None
+        if candidates is None:
+            grid = CompositionGrid(compiled, table, resolution, chunk_size)
+            chunks = grid.chunks()
+        else:
+            rows = np.asarray(candidates, dtype=np.float64)
+            if rows.ndim != 2 or rows.shape[1] != len(elements):
+                raise ValueError(f"candidates must have shape (n, {len(elements)})")
+            chunks = (rows[start : start + chunk_size] for start in range(0, len(rows), chunk_size))
+
+        known = self.catalog.compositions(elements) if self.catalog is not None else np.zeros((0, len(elements)))
+        known_best = TopCandidates(top_k)
+        if len(known):
+            known_properties = known @ table
+            matching = compiled.mask(known, known_properties)
+            known_best.push(objectives.score(known_properties[matching]), known[matching])
+
+        if watch is not None and pool_size is None:
+            pool_size = max(10 * top_k, 1000)
+        best = TopCandidates(max(top_k, pool_size) if watch is not None else top_k)
+        front = ParetoFront(len(objectives.columns)) if pareto and objectives else None
+        screened = feasible = skipped = 0
+        for fractions in chunks:
+            properties = fractions @ table
+            keep = compiled.mask(fractions, properties)
+            screened += len(fractions)
+            feasible += int(keep.sum())
+            if len(known):
+                seen = self.catalog.known_mask(fractions, elements, known) & keep
+                skipped += int(seen.sum())
+                keep &= ~seen
+            if keep.any():
+                best.push(objectives.score(properties[keep]), fractions[keep])
+                if front is not None:
+                    front.add(objectives.costs(properties[keep]), fractions[keep])
+
+        scores, rows = best.best()
+        if watch is not None:
+            self.watches[watch] = RankingWatch(
+                elements, compiled, objectives, rows.reshape(-1, len(elements)), top_k, self.predictor.model.version
+            )
+            scores, rows = scores[:top_k], rows[:top_k]
+        ranked = self._describe(elements, rows, rows @ table if len(rows) else rows, scores)
+        if watch is not None:
+            self.watches[watch].ranking = ranked
+        known_scores, known_rows = known_best.best()
+        known_ranked = self._describe(
+            elements, known_rows, known_rows @ table if len(known_rows) else known_rows, known_scores
+        )
+        self.logger.info(f"Screened {screened} candidates, {feasible} feasible, {skipped} already known")
         return {
             "status": "discovered",
             "target_properties": target_properties,
             "constraints": constraints,
+            "elements": elements,
+            "candidates": ranked,
+            "known_materials": known_ranked,
+            "screened": screened,
+            "feasible": feasible,
+            "known_skipped": skipped,
+            "pruned_regions": grid.pruned_regions if grid is not None else 0,
+            "pareto_front": self._describe_front(elements, table, objectives, front) if front is not None else None,
         }
 
+    @staticmethod
+    def _describe(
+        elements: Sequence[str], rows: np.ndarray, properties: np.ndarray, scores: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Convert candidate rows into plain dicts."""
+        described = []
+        for fractions, props, score in zip(rows, properties, scores):
+            described.append({
+                "composition": {el: round(float(f), 6) for el, f in zip(elements, fractions) if f > 0},
+                "properties": dict(zip(PROPERTY_NAMES, props.tolist())),
+                "score": float(score),
+            })
+        return described
+
+    @classmethod
+    def _describe_front(
+        cls, elements: Sequence[str], table: np.ndarray, objectives: CompiledObjectives, front: ParetoFront
+    ) -> List[Dict[str, Any]]:
+        """Describe Pareto-front members, best weighted score first."""
+        _, rows = front.front()
+        if len(rows) == 0:
+            return []
+        properties = rows @ table
+        scores = objectives.score(properties)
+        order = np.argsort(-scores, kind="stable")
+        return cls._describe(elements, rows[order], properties[order], scores[order])
+
     def predict_material_properties(
         self, composition: Dict[str, Any]
     ) -> Dict[str, Any]:
+        """Predict properties for one ``{element: amount}`` composition.
+
+        Keys that are not known elements are ignored and reported.
+        """
         self.logger.info(
             f"Predicting properties for composition: {list(composition.keys())}"
         )
-        return {"status": "predicted", "composition": composition}
+        amounts, ignored = composition_matrix([composition], self.predictor.model.elements)
+        if ignored:
+            self.logger.warning(f"Ignoring unknown composition keys: {ignored}")
+        properties = None
+        if amounts.sum() > 0:
+            properties = dict(zip(PROPERTY_NAMES, self.predictor.predict(amounts)[0].tolist()))
+        return {"status": "predicted", "composition": composition, "properties": properties, "ignored": ignored}
+
+    def predict_properties_batch(self, compositions: Compositions) -> np.ndarray:
+        """Predict properties for many compositions at once.
+
+        Duplicate and previously seen compositions are served from the
+        predictor's fingerprint cache; only new fingerprints reach the model.
+
+        Args:
+            compositions: (n, elements) amounts in ``ELEMENTS`` order or a
+                sequence of ``{element: amount}`` dicts.
+
+        Returns:
+            (n, properties) array in ``PROPERTY_NAMES`` order.
+        """
+        predictions = self.predictor.predict(compositions)
+        self.logger.debug(f"Batch prediction stats: {self.predictor.stats()}")
+        return predictions
+
+    def optimize_material(
+        self,
+        properties: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]] = None,
+        population_size: int = 64,
+        generations: int = 100,
+        patience: int = 15,
+        workers: int = 0,
+        seed: int = 0,
+        warm_start: Optional[Any] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = False,
+        pareto: bool = False,
+    ) -> Dict[str, Any]:
+        """Optimize a composition towards target properties with a genetic algorithm.
+
+        Args:
+            properties: Target properties, as for ``discover_new_material``.
+            constraints: Element set and bounds, as for ``discover_new_material``;
+                bounds are enforced through a fitness penalty.
+            population_size: Candidates per generation.
+            generations: Generation budget.
+            patience: Generations without improvement before stopping early.
+            workers: Processes evaluating fitness batches; 0 or 1 runs in-process.
+            seed: Seed for the optimizer's random stream.
+            warm_start: A previous ``optimize_material`` result (its final
+                population seeds this run) or an (n, elements) fraction array.
+                Defaults to the best-scoring catalog materials within the
+                element set when a catalog is configured.
+            checkpoint_path: File used to checkpoint the optimizer state.
+            resume: Continue from ``checkpoint_path`` when it exists.
+            pareto: Also return the Pareto front of every feasible candidate
+                evaluated during the run.
 
-    def optimize_material(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        Returns:
+            Dict with the ``optimized`` candidate, per-property
+            ``improvements`` from the best initial candidate, the convergence
+            ``history``, ``evaluations_per_second`` and the ``pareto_front``
+            (None unless requested).
+        """
         self.logger.info(
             f"Optimizing material with {len(properties)} properties"
         )
+        constraints = constraints or {}
+        spec = constraints.get("elements", constraints.get("composition"))
+        elements = parse_elements(spec) if spec else list(ELEMENTS)
+        table = self.predictor.model.table_for(elements)
+        objectives = CompiledObjectives(properties, table)
+        if objectives.ignored:
+            self.logger.warning(f"Ignoring unknown target properties: {objectives.ignored}")
+
+        seed_rows = None
+        if isinstance(warm_start, dict):
+            previous = warm_start.get("population") or []
+            seed_rows, _ = composition_matrix(previous, elements) if previous else (None, [])
+        elif warm_start is not None:
+            seed_rows = np.asarray(warm_start, dtype=np.float64)
+        elif self.catalog is not None:
+            known = self.catalog.compositions(elements)
+            if len(known):
+                order = np.argsort(-objectives.score(known @ table), kind="stable")
+                seed_rows = known[order[:population_size]]
+
+        front = ParetoFront(len(objectives.columns)) if pareto and objectives else None
+        optimizer = EvolutionaryOptimizer(
+            table,
+            objectives,
+            CompiledConstraints(elements, constraints),
+            population_size=population_size,
+            workers=workers,
+            seed=seed,
+            archive=front,
+        )
+        result = optimizer.run(
+            generations=generations,
+            patience=patience,
+            warm_start=seed_rows,
+            checkpoint_path=checkpoint_path,
+            resume=resume,
+        )
+
+        best, first = result["best"], result["initial_best"]
+        described = self._describe(elements, best[None, :], (best @ table)[None, :], [result["fitness"]])[0]
+        initial_properties = dict(zip(PROPERTY_NAMES, (first @ table).tolist()))
+        improvements = [
+            {
+                "property": PROPERTY_NAMES[column],
+                "initial": initial_properties[PROPERTY_NAMES[column]],
+                "optimized": described["properties"][PROPERTY_NAMES[column]],
+            }
+            for column in objectives.columns
+        ]
+        self.logger.info(
+            f"Optimization finished after {result['generations']} generations "
+            f"({result['evaluations_per_second']:.0f} evaluations/s)"
+        )
         return {
             "status": "optimized",
             "original": properties,
-            "optimized": {},
-            "improvements": [],
+            "optimized": described,
+            "improvements": improvements,
+            "fitness_gain": result["fitness"] - result["initial_fitness"],
+            "history": result["history"],
+            "generations": result["generations"],
+            "converged": result["converged"],
+            "evaluations": result["evaluations"],
+            "evaluations_per_second": result["evaluations_per_second"],
+            "population": [
+                {el: float(f) for el, f in zip(elements, row) if f > 0} for row in result["population"]
+            ],
+            "pareto_front": self._describe_front(elements, table, objectives, front) if front is not None else None,
         }
 
+    def refresh_rankings(self, names: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Re-rank watched discovery runs against the current property model.
+
+        Only watches whose ranking predates the current model version are
+        re-scored; each refresh touches the retained pool only.
+
+        Args:
+            names: Watches to refresh; all of them by default.
+
+        Returns:
+            ``{watch: ranked candidates}`` for the watches that were refreshed.
+        """
+        model = self.predictor.model
+        refreshed = {}
+        for name in names if names is not None else list(self.watches):
+            watch = self.watches[name]
+            if watch.model_version == model.version:
+                continue
+            table = model.table_for(watch.elements)
+            scores, rows = watch.rank(table)
+            watch.ranking = self._describe(watch.elements, rows, rows @ table if len(rows) else rows, scores)
+            watch.model_version = model.version
+            refreshed[name] = watch.ranking
+        return refreshed
+
+    def feedback(self, batch_size: int = 64, max_queue: int = 1024) -> SimulationFeedback:
+        """Create a feedback stream that updates this instance's model and watches."""
+        return SimulationFeedback(self, batch_size=batch_size, max_queue=max_queue)
+
     def integrate_with_simulations(
-        self, simulation_output: Dict[str, Any]
-    ) -> None:
-        keys = list(simulation_output.keys()) if simulation_output else []
+        self, simulation_output: Any, batch_size: int = 64, max_queue: int = 1024
+    ) -> Dict[str, Any]:
+        """Stream simulation outputs into the property model from synchronous code.
+
+        Runs :meth:`integrate_with_simulations_async` in a new event loop; use
+        that method directly from coroutines, where a loop is already running.
+        """
+        return asyncio.run(
+            self.integrate_with_simulations_async(simulation_output, batch_size=batch_size, max_queue=max_queue)
+        )
+
+    async def integrate_with_simulations_async(
+        self, simulation_output: Any, batch_size: int = 64, max_queue: int = 1024
+    ) -> Dict[str, Any]:
+        """Stream simulation outputs into the property model.
+
+        Outputs go through a bounded queue (the producer waits when it is
+        full) and are applied in micro-batches; watched rankings are
+        refreshed after every batch instead of after the whole stream.
+
+        Args:
+            simulation_output: One output dict (``{"composition": ...,
+                "properties": ...}``), an iterable of them or an async
+                iterable of them.
+            batch_size: Maximum outputs per model update.
+            max_queue: Queue capacity.
+
+        Returns:
+            Dict with stream counters, the model version and the current
+            ranking of every watch.
+        """
+        if isinstance(simulation_output, dict):
+            simulation_output = [simulation_output]
+        async with self.feedback(batch_size=batch_size, max_queue=max_queue) as stream:
+            if hasattr(simulation_output, "__aiter__"):
+                async for output in simulation_output:
+                    await stream.put(output)
+            else:
+                for output in simulation_output or ():
+                    await stream.put(output)
         self.logger.info(
-            f"Integrating simulation output with {len(keys)} fields"
+            f"Integrated {stream.stats['applied']} of {stream.stats['received']} simulation outputs "
+            f"in {stream.stats['batches']} batches"
         )
+        return {
+            "status": "integrated",
+            **stream.stats,
+            "model_version": self.predictor.model.version,
+            "rankings": {name: watch.ranking for name, watch in self.watches.items()},
+        }
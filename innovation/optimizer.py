@@ -0,0 +1,264 @@
+"""innovation.optimizer
+
+Population-based composition optimizer for material discovery.
+- Genetic algorithm over element-fraction vectors (points on the simplex)
+- Fitness of each generation evaluated as vectorized batches, optionally
+  spread across a process pool
+- Warm start from earlier populations, early stopping, and checkpoint/resume
+- Optional Pareto archive of every feasible candidate evaluated
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.seeding import SeedManager
+
+from .pareto import ParetoFront
+from .screening import CompiledConstraints, CompiledObjectives
+
+# Fitness penalty per unit of constraint violation.
+PENALTY = 10.0
+
+
+def evaluate_fitness(
+    fractions: np.ndarray,
+    table: np.ndarray,
+    objectives: CompiledObjectives,
+    constraints: CompiledConstraints,
+) -> np.ndarray:
+    """Vectorized fitness: objective score minus a constraint-violation penalty."""
+    properties = fractions @ table
+    violation = constraints.violation(fractions, properties, objectives.scale)
+    return objectives.score(properties) - PENALTY * violation
+
+
+def _normalize(population: np.ndarray) -> np.ndarray:
+    population = np.clip(population, 0.0, None)
+    totals = population.sum(axis=1, keepdims=True)
+    uniform = np.full_like(population, 1.0 / population.shape[1])
+    return np.where(totals > 0, population / np.where(totals > 0, totals, 1.0), uniform)
+
+
+class EvolutionaryOptimizer:
+    """Genetic algorithm over compositions with parallel batch fitness.
+
+    Each generation keeps the elite, fills the rest of the population with
+    children of tournament-selected parents (blend crossover on the simplex)
+    and applies multiplicative log-normal mutation. All randomness comes from
+    a single keyed SeedManager stream, and fitness is deterministic, so runs
+    are reproducible regardless of the worker count.
+
+    Attributes:
+        history: Per-generation best and mean fitness.
+        evaluations: Fitness evaluations performed (including resumed runs).
+        archive: Optional Pareto front fed with every feasible candidate
+            evaluated, using the objectives' per-property costs.
+    """
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        objectives: CompiledObjectives,
+        constraints: CompiledConstraints,
+        population_size: int = 64,
+        elite_fraction: float = 0.1,
+        mutation_scale: float = 0.3,
+        workers: int = 0,
+        seed: int = 0,
+        archive: Optional[ParetoFront] = None,
+    ):
+        if population_size < 4:
+            raise ValueError("population_size must be at least 4.")
+        self.table = table
+        self.objectives = objectives
+        self.constraints = constraints
+        self.population_size = population_size
+        self.n_elite = max(1, int(round(elite_fraction * population_size)))
+        self.mutation_scale = mutation_scale
+        self.workers = workers
+        self.rng = SeedManager(seed).generator("optimizer")
+        self.history: List[Dict[str, float]] = []
+        self.evaluations = 0
+        self.generation = 0
+        self.population: Optional[np.ndarray] = None
+        self.fitness: Optional[np.ndarray] = None
+        self.initial_best: Optional[np.ndarray] = None
+        self.archive = archive
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _evaluate(self, population: np.ndarray) -> np.ndarray:
+        self.evaluations += len(population)
+        if self.archive is not None:
+            properties = population @ self.table
+            feasible = self.constraints.mask(population, properties)
+            self.archive.add(self.objectives.costs(properties[feasible]), population[feasible])
+        if self._pool is None:
+            return evaluate_fitness(population, self.table, self.objectives, self.constraints)
+        batches = np.array_split(population, self.workers)
+        futures = [
+            self._pool.submit(evaluate_fitness, batch, self.table, self.objectives, self.constraints)
+            for batch in batches
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+    def _initialize(self, warm_start: Optional[np.ndarray]) -> None:
+        n_elements = self.table.shape[0]
+        seeded = np.zeros((0, n_elements))
+        if warm_start is not None and len(warm_start):
+            seeded = _normalize(np.asarray(warm_start, dtype=np.float64))[: self.population_size]
+        fresh = self.rng.dirichlet(np.ones(n_elements), size=self.population_size - len(seeded))
+        self.population = np.vstack([seeded, fresh])
+        self.fitness = self._evaluate(self.population)
+        self.initial_best = self.population[int(np.argmax(self.fitness))].copy()
+
+    def _next_generation(self) -> None:
+        order = np.argsort(-self.fitness, kind="stable")
+        elite = self.population[order[: self.n_elite]]
+        n_children = self.population_size - self.n_elite
+        # Binary tournaments pick both parents of every child at once.
+        contenders = self.rng.integers(0, self.population_size, size=(2, n_children, 2))
+        winners = np.where(
+            self.fitness[contenders[..., 0]] >= self.fitness[contenders[..., 1]],
+            contenders[..., 0],
+            contenders[..., 1],
+        )
+        mix = self.rng.random((n_children, 1))
+        children = mix * self.population[winners[0]] + (1 - mix) * self.population[winners[1]]
+        children *= self.rng.lognormal(0.0, self.mutation_scale, size=children.shape)
+        children = _normalize(children)
+        self.population = np.vstack([elite, children])
+        self.fitness = np.concatenate([self.fitness[order[: self.n_elite]], self._evaluate(children)])
+
+    def save_checkpoint(self, path: str) -> None:
+        """Write the optimizer state to ``path`` (an .npz file)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        archive = {}
+        if self.archive is not None and self.archive.rows is not None:
+            archive = {"archive_costs": self.archive.costs, "archive_rows": self.archive.rows}
+        np.savez(
+            tmp_path,
+            **archive,
+            population=self.population,
+            fitness=self.fitness,
+            initial_best=self.initial_best,
+            state=np.array(json.dumps({
+                "generation": self.generation,
+                "evaluations": self.evaluations,
+                "history": self.history,
+                "rng": self.rng.bit_generator.state,
+            })),
+        )
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path: str) -> None:
+        """Restore the optimizer state saved by :meth:`save_checkpoint`."""
+        with np.load(path) as data:
+            self.population = data["population"]
+            self.fitness = data["fitness"]
+            self.initial_best = data["initial_best"]
+            state = json.loads(str(data["state"]))
+            if self.archive is not None and "archive_rows" in data:
+                self.archive.add(data["archive_costs"], data["archive_rows"])
+        if self.population.shape[1] != self.table.shape[0]:
+            raise ValueError("Checkpoint does not match the optimizer's element set.")
+        self.population_size = len(self.population)
+        self.generation = state["generation"]
+        self.evaluations = state["evaluations"]
+        self.history = state["history"]
+        self.rng.bit_generator.state = state["rng"]
+
+    def run(
+        self,
+        generations: int = 100,
+        patience: int = 15,
+        tol: float = 1e-6,
+        warm_start: Optional[np.ndarray] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10,
+        resume: bool = False,
+    ) -> Dict[str, Any]:
+        """Evolve until ``generations`` is reached or progress stalls.
+
+        Args:
+            generations: Total generation budget (including resumed ones).
+            patience: Stop after this many generations without the best
+                fitness improving by more than ``tol``.
+            tol: Minimum improvement that resets the patience counter.
+            warm_start: Fractions seeding the initial population.
+            checkpoint_path: Where to save state every ``checkpoint_every``
+                generations and at the end.
+            checkpoint_every: Checkpoint period in generations.
+            resume: Continue from ``checkpoint_path`` if it exists.
+
+        Returns:
+            Dict with the best and initial-best fractions, fitness, history
+            and throughput.
+        """
+        started = time.perf_counter()
+        evaluations_before = self.evaluations
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            if resume and checkpoint_path and os.path.exists(checkpoint_path):
+                self.load_checkpoint(checkpoint_path)
+                evaluations_before = self.evaluations
+            else:
+                self._initialize(warm_start)
+                self._record()
+
+            # Replayed from the history so a resumed run stops where an
+            # uninterrupted one would.
+            best, stale = self.history[0]["best"], 0
+            for entry in self.history[1:]:
+                if entry["best"] > best + tol:
+                    best, stale = entry["best"], 0
+                else:
+                    stale += 1
+            while self.generation < generations and stale < patience:
+                self._next_generation()
+                self.generation += 1
+                self._record()
+                current = self.history[-1]["best"]
+                if current > best + tol:
+                    best, stale = current, 0
+                else:
+                    stale += 1
+                if checkpoint_path and self.generation % checkpoint_every == 0:
+                    self.save_checkpoint(checkpoint_path)
+            if checkpoint_path:
+                self.save_checkpoint(checkpoint_path)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+        elapsed = time.perf_counter() - started
+        evaluated = self.evaluations - evaluations_before
+        top = int(np.argmax(self.fitness))
+        return {
+            "best": self.population[top],
+            "fitness": float(self.fitness[top]),
+            "initial_best": self.initial_best,
+            "initial_fitness": self.history[0]["best"],
+            "generations": self.generation,
+            "converged": self.generation < generations,
+            "history": list(self.history),
+            "evaluations": self.evaluations,
+            "evaluations_per_second": evaluated / elapsed if elapsed > 0 else float("inf"),
+            "population": self.population,
+        }
+
+    def _record(self) -> None:
+        self.history.append({
+            "generation": self.generation,
+            "best": float(self.fitness.max()),
+            "mean": float(self.fitness.mean()),
+        })
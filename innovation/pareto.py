@@ -0,0 +1,212 @@
+"""innovation.pareto
+
+Multi-objective (Pareto) screening for material discovery.
+All objectives are costs: lower is better in every column.
+- pareto_mask: non-dominated filter; an O(n log n) sweep for two and three
+  objectives, blocked NumPy comparisons for higher dimensions
+- non_dominated_sort: front ranks (0 = Pareto front)
+- ParetoFront: front maintained incrementally as candidate batches stream in
+"""
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+# Upper bound on the number of pairwise comparisons materialized at once.
+_BLOCK_ELEMENTS = 1 << 20
+# Rows filtered against the current front per step in higher dimensions.
+_SCAN_ROWS = 8192
+
+
+def _lexsort(costs: np.ndarray) -> np.ndarray:
+    """Stable lexicographic order by column 0, then column 1, ..."""
+    return np.lexsort(costs.T[::-1])
+
+
+def _covered(points: np.ndarray, by: np.ndarray) -> np.ndarray:
+    """Mask of ``points`` weakly dominated by (<= in every column) a row of ``by``."""
+    covered = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or len(by) == 0:
+        return covered
+    # Column by column keeps the temporary at (block, len(by)) booleans.
+    columns = by.T.copy()
+    block = max(1, _BLOCK_ELEMENTS // len(by))
+    for start in range(0, len(points), block):
+        chunk = points[start : start + block]
+        below = columns[0][None, :] <= chunk[:, 0, None]
+        for k in range(1, len(columns)):
+            below &= columns[k][None, :] <= chunk[:, k, None]
+        covered[start : start + block] = below.any(axis=1)
+    return covered
+
+
+def _sweep_2d(costs: np.ndarray) -> np.ndarray:
+    order = _lexsort(costs)
+    second = costs[order, 1]
+    keep = np.empty(len(order), dtype=bool)
+    keep[0] = True
+    keep[1:] = second[1:] < np.minimum.accumulate(second)[:-1]
+    mask = np.zeros(len(order), dtype=bool)
+    mask[order[keep]] = True
+    return mask
+
+
+def _sweep_3d(costs: np.ndarray) -> np.ndarray:
+    # Points arrive in lexicographic order, so every dominator of a point has
+    # already been seen. A Fenwick tree over the ranks of y holds the prefix
+    # minimum of z among kept points, answering "is there a seen point with
+    # y' <= y and z' <= z" in O(log n).
+    mask = np.zeros(len(costs), dtype=bool)
+    order = _lexsort(costs)
+    ranks = (np.unique(costs[:, 1], return_inverse=True)[1].reshape(-1) + 1)[order].tolist()
+    size = max(ranks)
+    tree = [np.inf] * (size + 1)
+    for index, rank, z in zip(order.tolist(), ranks, costs[order, 2].tolist()):
+        position, lowest = rank, np.inf
+        while position:
+            if tree[position] < lowest:
+                lowest = tree[position]
+            position &= position - 1
+        if lowest <= z:
+            continue
+        mask[index] = True
+        position = rank
+        while position <= size:
+            if z < tree[position]:
+                tree[position] = z
+            position += position & -position
+    return mask
+
+
+def _blocked(costs: np.ndarray) -> np.ndarray:
+    # Sorting by the row sum (ties broken lexicographically) puts every
+    # dominator before the points it dominates, so each block is compared
+    # only with the front found so far and with earlier rows of the block.
+    # Rows already covered by the front cannot cover anything the front does
+    # not, so only the remaining rows are compared pairwise.
+    order = np.lexsort(np.vstack([costs.T[::-1], costs.sum(axis=1)]))
+    ordered = costs[order]
+    keep = np.zeros(len(order), dtype=bool)
+    front = ordered[:0]
+    pairwise = max(1, int(np.sqrt(_BLOCK_ELEMENTS // costs.shape[1])))
+    for start in range(0, len(order), _SCAN_ROWS):
+        remaining = start + np.flatnonzero(~_covered(ordered[start : start + _SCAN_ROWS], front))
+        for offset in range(0, len(remaining), pairwise):
+            candidates = remaining[offset : offset + pairwise]
+            if offset:
+                candidates = candidates[~_covered(ordered[candidates], front)]
+            chunk = ordered[candidates]
+            within = np.tril((chunk[None, :, :] <= chunk[:, None, :]).all(axis=2), k=-1)
+            survivors = candidates[~within.any(axis=1)]
+            keep[survivors] = True
+            front = np.concatenate([front, ordered[survivors]])
+    mask = np.zeros(len(order), dtype=bool)
+    mask[order[keep]] = True
+    return mask
+
+
+def pareto_mask(costs: np.ndarray) -> np.ndarray:
+    """Return the mask of non-dominated rows of an (n, objectives) cost array.
+
+    A row is dominated when another row is no worse in every objective and
+    better in at least one. Of several identical rows only the first is kept.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    if costs.ndim != 2:
+        raise ValueError(f"Expected an (n, objectives) array, got shape {costs.shape}")
+    n, dims = costs.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    if dims == 1:
+        mask = np.zeros(n, dtype=bool)
+        mask[int(np.argmin(costs[:, 0]))] = True
+        return mask
+    if dims == 2:
+        return _sweep_2d(costs)
+    if dims == 3:
+        return _sweep_3d(costs)
+    return _blocked(costs)
+
+
+def non_dominated_sort(costs: np.ndarray) -> np.ndarray:
+    """Return the front rank of every row (0 for the Pareto front).
+
+    Identical rows share a rank.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    unique, inverse = np.unique(costs, axis=0, return_inverse=True)
+    ranks = np.full(len(unique), -1, dtype=np.int64)
+    remaining = np.arange(len(unique))
+    rank = 0
+    while len(remaining):
+        front = pareto_mask(unique[remaining])
+        ranks[remaining[front]] = rank
+        remaining = remaining[~front]
+        rank += 1
+    return ranks[inverse.reshape(-1)]
+
+
+class ParetoFront:
+    """Pareto front of a candidate stream, updated batch by batch.
+
+    Each batch is reduced to its own front first, then filtered against the
+    current front, and finally current members dominated by the newcomers
+    are dropped. Rows (e.g. compositions) travel with their costs.
+
+    Attributes:
+        n_objectives: Number of cost columns.
+        costs: (front, objectives) costs of the current members.
+        rows: Payload rows of the current members.
+        seen: Number of candidates offered so far.
+    """
+
+    def __init__(self, n_objectives: int):
+        if n_objectives < 1:
+            raise ValueError("n_objectives must be at least 1.")
+        self.n_objectives = n_objectives
+        self.costs = np.zeros((0, n_objectives))
+        self.rows: Optional[np.ndarray] = None
+        self.seen = 0
+
+    def __len__(self) -> int:
+        return len(self.costs)
+
+    def add(self, costs: np.ndarray, rows: Optional[np.ndarray] = None) -> int:
+        """Offer a batch of candidates.
+
+        Args:
+            costs: (n, n_objectives) costs, lower is better.
+            rows: Optional (n, ...) payload; defaults to the candidates'
+                positions in the stream.
+
+        Returns:
+            Number of offered candidates that joined the front.
+        """
+        costs = np.asarray(costs, dtype=np.float64).reshape(-1, self.n_objectives)
+        if rows is None:
+            rows = np.arange(self.seen, self.seen + len(costs))
+        self.seen += len(costs)
+        if len(costs) == 0:
+            return 0
+        keep = pareto_mask(costs)
+        costs, rows = costs[keep], np.asarray(rows)[keep]
+        if self.rows is not None and len(self.costs):
+            fresh = ~_covered(costs, self.costs)
+            costs, rows = costs[fresh], rows[fresh]
+            if len(costs) == 0:
+                return 0
+            # Newcomers are never equal to a member here, so weak dominance
+            # of a member by a newcomer is strict dominance.
+            survivors = ~_covered(self.costs, costs)
+            self.costs = np.concatenate([self.costs[survivors], costs])
+            self.rows = np.concatenate([self.rows[survivors], rows])
+        else:
+            self.costs, self.rows = costs, rows
+        return len(costs)
+
+    def front(self) -> Tuple[np.ndarray, Any]:
+        """Return (costs, rows) of the members, ordered lexicographically by cost."""
+        if self.rows is None:
+            return self.costs, np.empty((0, 0))
+        order = _lexsort(self.costs)
+        return self.costs[order], self.rows[order]
@@ -0,0 +1,209 @@
+"""innovation.property_model
+
+Property prediction for material compositions.
+- PropertyModel: vectorized rule-of-mixtures model over the element table,
+  refined with per-element corrections fitted to observed properties
+- BatchPropertyPredictor: canonicalizes compositions into fixed-length
+  fingerprints, deduplicates them, memoizes predictions in a bounded LRU cache
+  and evaluates all cache misses in a single vectorized model call
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .elements import ELEMENTS, PROPERTY_NAMES, property_table
+
+Compositions = Union[np.ndarray, Sequence[Mapping[str, float]]]
+
+
+def composition_matrix(
+    compositions: Iterable[Mapping[str, float]], elements: Sequence[str] = ELEMENTS
+) -> Tuple[np.ndarray, List[str]]:
+    """Convert composition dicts into an (n, elements) amount matrix.
+
+    Returns:
+        The matrix and the sorted list of keys that are not known elements
+        (ignored).
+    """
+    index = {el: i for i, el in enumerate(elements)}
+    rows: List[np.ndarray] = []
+    ignored = set()
+    for composition in compositions:
+        row = np.zeros(len(elements))
+        for key, amount in composition.items():
+            column = index.get(key)
+            if column is None or isinstance(amount, (str, bytes)):
+                ignored.add(key)
+                continue
+            row[column] += float(amount)
+        rows.append(row)
+    matrix = np.vstack(rows) if rows else np.zeros((0, len(elements)))
+    return matrix, sorted(ignored)
+
+
+class PropertyModel:
+    """Rule-of-mixtures property model: properties = fractions @ table.
+
+    The table is the pure-element table plus per-element corrections fitted
+    by ridge regression to observed properties. Corrections keep the model
+    linear in the fractions, so interval-based pruning of composition grids
+    stays valid after updates. Observations are folded into per-property
+    sufficient statistics, so each update costs the same regardless of how
+    many observations came before.
+
+    Attributes:
+        elements: Element order of the fraction columns.
+        table: (elements x properties) effective table.
+        regularization: Ridge penalty pulling corrections towards zero.
+        version: Incremented on every update that changes the table.
+        observations: Number of observed rows folded in so far.
+    """
+
+    def __init__(self, elements: Sequence[str] = ELEMENTS, regularization: float = 1e-3):
+        self.elements = list(elements)
+        self.base_table = property_table(self.elements)
+        self.table = self.base_table.copy()
+        self.regularization = regularization
+        self.version = 0
+        self.observations = 0
+        n_elements, n_properties = self.base_table.shape
+        self._gram = np.zeros((n_properties, n_elements, n_elements))
+        self._moments = np.zeros((n_properties, n_elements))
+        self._index = {el: i for i, el in enumerate(self.elements)}
+
+    def predict(self, fractions: np.ndarray) -> np.ndarray:
+        """Predict an (n, properties) array from (n, elements) fractions."""
+        return np.asarray(fractions, dtype=np.float64) @ self.table
+
+    def table_for(self, elements: Sequence[str]) -> np.ndarray:
+        """Return the effective table rows of ``elements``.
+
+        Raises:
+            ValueError: If an element is not modelled.
+        """
+        unknown = [el for el in elements if el not in self._index]
+        if unknown:
+            raise ValueError(f"Unknown elements: {unknown}")
+        return self.table[[self._index[el] for el in elements]]
+
+    @property
+    def corrections(self) -> np.ndarray:
+        """(elements x properties) learned offsets from the pure-element table."""
+        return self.table - self.base_table
+
+    def update(self, fractions: np.ndarray, observed: np.ndarray) -> None:
+        """Fold a batch of observations into the corrections.
+
+        Args:
+            fractions: (n, elements) fractions in ``elements`` order.
+            observed: (n, properties) observed values; NaN marks properties
+                that were not observed for a row.
+        """
+        fractions = np.asarray(fractions, dtype=np.float64)
+        observed = np.asarray(observed, dtype=np.float64)
+        if len(fractions) == 0:
+            return
+        seen = ~np.isnan(observed)
+        residual = np.where(seen, observed - fractions @ self.base_table, 0.0)
+        self._gram += np.einsum("np,ni,nj->pij", seen.astype(np.float64), fractions, fractions)
+        self._moments += residual.T @ fractions
+        ridge = self.regularization * np.eye(len(self.elements))
+        solved = np.linalg.solve(self._gram + ridge, self._moments[..., None])[..., 0]
+        self.table = self.base_table + solved.T
+        self.observations += len(fractions)
+        self.version += 1
+
+
+class BatchPropertyPredictor:
+    """Memoizing, deduplicating batch front-end for a PropertyModel.
+
+    Compositions are normalized to unit sum and quantized to multiples of
+    ``1 / quantum``; the resulting integer vector is the fingerprint. The
+    model is evaluated on the quantized fractions, so a cached prediction is
+    exactly what a fresh evaluation would return. The cache is dropped
+    whenever the model's ``version`` changes.
+
+    Attributes:
+        model: The wrapped property model.
+        quantum: Fingerprint resolution (steps per unit fraction).
+        cache_size: Maximum number of memoized fingerprints.
+    """
+
+    def __init__(self, model: Optional[PropertyModel] = None, quantum: int = 10_000, cache_size: int = 100_000):
+        self.model = model or PropertyModel()
+        self.quantum = quantum
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._version = self.model.version
+        self._stats = {"requests": 0, "unique": 0, "hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def fingerprints(self, amounts: np.ndarray) -> np.ndarray:
+        """Return the (n, elements) int32 fingerprints of element amounts."""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if amounts.ndim != 2 or amounts.shape[1] != len(self.model.elements):
+            raise ValueError(f"Expected shape (n, {len(self.model.elements)}), got {amounts.shape}")
+        if (amounts < 0).any():
+            raise ValueError("Element amounts must be non-negative.")
+        totals = amounts.sum(axis=1, keepdims=True)
+        fractions = np.divide(amounts, totals, out=np.zeros_like(amounts), where=totals > 0)
+        return np.rint(fractions * self.quantum).astype(np.int32)
+
+    def predict(self, compositions: Compositions) -> np.ndarray:
+        """Predict properties for a batch of compositions.
+
+        Args:
+            compositions: An (n, elements) amount array in ``model.elements``
+                order, or a sequence of ``{element: amount}`` dicts.
+
+        Returns:
+            (n, properties) array in ``PROPERTY_NAMES`` order.
+        """
+        if isinstance(compositions, np.ndarray):
+            amounts = compositions
+        else:
+            amounts, _ = composition_matrix(compositions, self.model.elements)
+        if self.model.version != self._version:
+            self.clear()
+            self._version = self.model.version
+            self._stats["invalidations"] += 1
+        prints = self.fingerprints(amounts)
+        self._stats["requests"] += len(prints)
+        if len(prints) == 0:
+            return np.zeros((0, len(PROPERTY_NAMES)))
+
+        unique, inverse = np.unique(prints, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        self._stats["unique"] += len(unique)
+        results = np.empty((len(unique), len(PROPERTY_NAMES)))
+        keys = [row.tobytes() for row in unique]
+        missing: List[int] = []
+        for row, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached is None:
+                missing.append(row)
+            else:
+                self._cache.move_to_end(key)
+                results[row] = cached
+        self._stats["hits"] += len(unique) - len(missing)
+        self._stats["misses"] += len(missing)
+
+        if missing:
+            predicted = self.model.predict(unique[missing] / self.quantum)
+            results[missing] = predicted
+            for row, values in zip(missing, predicted):
+                self._cache[keys[row]] = values
+            overflow = len(self._cache) - self.cache_size
+            for _ in range(max(0, overflow)):
+                self._cache.popitem(last=False)
+            self._stats["evictions"] += max(0, overflow)
+        return results[inverse]
+
+    def clear(self) -> None:
+        """Drop every memoized prediction (e.g. after the model changes)."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, deduplication and cache counters."""
+        return {**self._stats, "cached": len(self._cache)}
@@ -1,27 +1,425 @@
-import unittest
-from innovation.research import Research
-from innovation.material_discovery import MaterialDiscovery
-
-class TestInnovation(unittest.TestCase):
-
-    def test_research_add_and_run(self):
-        research = Research(name="Test Research")
-        research.add_experiment({"name": "Exp1"})
-        self.assertEqual(len(research.experiments), 1)
-        research.run_experiment("Exp1")
-        research.run_all_experiments()
-
-    def test_material_discovery_methods(self):
-        discovery = MaterialDiscovery()
-        props = {"composition": "Fe-C"}
-        target = {"strength": "high"}
-        result = discovery.discover_new_material(target_properties=target, constraints=props)
-        self.assertEqual(result["status"], "discovered")
-        pred = discovery.predict_material_properties(props)
-        self.assertEqual(pred["status"], "predicted")
-        opt = discovery.optimize_material(target)
-        self.assertEqual(opt["status"], "optimized")
-
-if __name__ == "__main__":
-    unittest.main()
+"""innovation.research
 
+Experiment engine for research workflows.
+- Research: a campaign of experiments with declared dependencies, executed
+  concurrently in topological order on a thread or process pool, with
+  per-experiment timeouts and critical-path reporting; experiments whose
+  fingerprint is unchanged are served from the artifact cache
+- ResearchModule: orchestrator-facing collection of research campaigns
+"""
+
+import heapq
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from core.utils import setup_logger
+
+from .artifacts import ArtifactCache, code_version, experiment_fingerprint, value_hash
+
+ExperimentFunction = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def _noop(params: Dict[str, Any], inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Default experiment body: echo its parameters and upstream inputs."""
+    return {"params": params, "inputs": sorted(inputs)}
+
+
+def _execute(function: ExperimentFunction, params: Dict[str, Any], inputs: Dict[str, Any]) -> Tuple[Any, float]:
+    """Run an experiment body and time it where it actually executes."""
+    started = time.perf_counter()
+    value = function(params, inputs)
+    return value, time.perf_counter() - started
+
+
+class Research:
+    """A research campaign: experiments connected by dependencies.
+
+    Experiments are dicts with a required ``name`` and optional
+    ``depends_on`` (names of upstream experiments), ``function`` (called as
+    ``function(params, inputs)`` where ``inputs`` maps each dependency to its
+    result; must be picklable for the process pool), ``params``,
+    ``timeout`` in seconds, ``estimate`` (expected duration, used to start
+    long chains first until real durations are known) and ``version`` (code
+    version; defaults to a hash of the function's bytecode).
+
+    Execution is incremental: an experiment's fingerprint covers its name,
+    parameters, code version and the output hashes of its dependencies.
+    Successful results are stored in the artifact cache under that
+    fingerprint and reused while it is unchanged. Because dependents key on
+    upstream *outputs*, a re-executed experiment that reproduces its previous
+    output does not invalidate anything downstream.
+
+    Attributes:
+        name: Campaign name.
+        experiments: Experiment specs in insertion order.
+        results: Latest result of every experiment that ran.
+        cache: Artifact cache of successful results.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 4,
+        executor: str = "thread",
+        timeout: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """Initialize an empty campaign.
+
+        Args:
+            name (str): Campaign name.
+            workers (int): Maximum experiments running at once.
+            executor (str): ``"thread"`` or ``"process"``.
+            timeout (Optional[float]): Default per-experiment timeout.
+            cache_dir (Optional[str]): Artifact cache directory; artifacts
+                are kept in memory only when omitted.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {sorted(EXECUTORS)}")
+        self.logger = setup_logger(self.__class__.__name__)
+        self.name = name
+        self.workers = max(1, workers)
+        self.executor = executor
+        self.timeout = timeout
+        self.experiments: List[Dict[str, Any]] = []
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self.cache = ArtifactCache(cache_dir)
+
+    def add_experiment(self, experiment: Mapping[str, Any]) -> None:
+        """Register an experiment.
+
+        Raises:
+            ValueError: If the name is missing or already registered.
+        """
+        name = experiment.get("name")
+        if not name:
+            raise ValueError("Experiment needs a name.")
+        if name in self._index:
+            raise ValueError(f"Experiment '{name}' already exists.")
+        spec = dict(experiment)
+        spec["depends_on"] = list(experiment.get("depends_on") or ())
+        spec.setdefault("params", {})
+        self.experiments.append(spec)
+        self._index[name] = spec
+        self.logger.info(f"Added experiment '{name}' to research '{self.name}'")
+
+    def topological_order(self) -> List[str]:
+        """Return experiment names with every dependency before its dependents.
+
+        Raises:
+            ValueError: On unknown dependencies or dependency cycles.
+        """
+        indegree, dependents = self._graph()
+        ready = [spec["name"] for spec in self.experiments if indegree[spec["name"]] == 0]
+        order: List[str] = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.experiments):
+            cycle = sorted(name for name, count in indegree.items() if count > 0)
+            raise ValueError(f"Dependency cycle among experiments: {cycle}")
+        return order
+
+    def _graph(self) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+        indegree = {spec["name"]: 0 for spec in self.experiments}
+        dependents: Dict[str, List[str]] = {spec["name"]: [] for spec in self.experiments}
+        for spec in self.experiments:
+            for parent in spec["depends_on"]:
+                if parent not in self._index:
+                    raise ValueError(f"Experiment '{spec['name']}' depends on unknown experiment '{parent}'")
+                indegree[spec["name"]] += 1
+                dependents[parent].append(spec["name"])
+        return indegree, dependents
+
+    def _duration(self, name: str) -> float:
+        previous = self.results.get(name)
+        if previous is not None and previous.get("duration") is not None:
+            return previous["duration"]
+        return float(self._index[name].get("estimate", 1.0))
+
+    def _remaining_path(self, order: Sequence[str], dependents: Dict[str, List[str]]) -> Dict[str, float]:
+        """Longest expected duration from each experiment to the end of the graph."""
+        remaining: Dict[str, float] = {}
+        for name in reversed(order):
+            tail = max((remaining[child] for child in dependents[name]), default=0.0)
+            remaining[name] = self._duration(name) + tail
+        return remaining
+
+    def _inputs(self, name: str) -> Optional[Dict[str, Any]]:
+        inputs = {}
+        for parent in self._index[name]["depends_on"]:
+            upstream = self.results.get(parent)
+            if upstream is None or upstream["status"] != "success":
+                return None
+            inputs[parent] = upstream["result"]
+        return inputs
+
+    def _record(
+        self, name: str, status: str, result: Any = None, error: Optional[str] = None, duration: Optional[float] = None
+    ) -> Dict[str, Any]:
+        record = {
+            "name": name,
+            "status": status,
+            "result": result,
+            "error": error,
+            "duration": duration,
+            "cached": False,
+            "fingerprint": None,
+            "output_hash": None,
+        }
+        self.results[name] = record
+        return record
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """Fingerprint of ``name`` given its dependencies' latest outputs.
+
+        Returns None while a dependency has no successful output.
+        """
+        spec = self._index[name]
+        upstream = {}
+        for parent in spec["depends_on"]:
+            record = self.results.get(parent)
+            if record is None or record["status"] != "success":
+                return None
+            upstream[parent] = record["output_hash"]
+        version = spec.get("version") or code_version(spec.get("function") or _noop)
+        return experiment_fingerprint(name, spec["params"], str(version), upstream)
+
+    def _reuse(self, name: str, fingerprint: Optional[str]) -> Optional[Dict[str, Any]]:
+        artifact = self.cache.get(fingerprint) if fingerprint is not None else None
+        if artifact is None:
+            return None
+        record = self._record(name, "success", result=artifact["result"], duration=artifact["duration"])
+        record.update(cached=True, fingerprint=fingerprint, output_hash=artifact["output_hash"])
+        return record
+
+    def _store(self, name: str, fingerprint: Optional[str], value: Any, duration: float) -> Dict[str, Any]:
+        record = self._record(name, "success", result=value, duration=duration)
+        record.update(fingerprint=fingerprint, output_hash=value_hash(value))
+        if fingerprint is not None:
+            self.cache.put(fingerprint, {"result": value, "output_hash": record["output_hash"], "duration": duration})
+        return record
+
+    def run_experiment(self, name: str, force: bool = False) -> Dict[str, Any]:
+        """Run one experiment in the calling thread.
+
+        Upstream results come from earlier runs; if a dependency has no
+        successful result the experiment is skipped. A cached artifact with
+        the same fingerprint is reused unless ``force`` is set.
+
+        Returns:
+            Result dict with ``status`` (``"success"``, ``"failed"`` or
+            ``"skipped"``), ``result``, ``error`` and ``duration``.
+
+        Raises:
+            KeyError: If the experiment is not registered.
+        """
+        if name not in self._index:
+            raise KeyError(f"Unknown experiment '{name}'")
+        self.logger.info(f"Running experiment '{name}'")
+        inputs = self._inputs(name)
+        if inputs is None:
+            return self._record(name, "skipped", error="upstream experiment missing or unsuccessful")
+        fingerprint = self.fingerprint(name)
+        reused = None if force else self._reuse(name, fingerprint)
+        if reused is not None:
+            return reused
+        spec = self._index[name]
+        try:
+            value, duration = _execute(spec.get("function") or _noop, dict(spec["params"]), inputs)
+        except Exception as exc:
+            self.logger.error(f"Experiment '{name}' failed: {exc}")
+            return self._record(name, "failed", error=repr(exc))
+        return self._store(name, fingerprint, value, duration)
+
+    def run_all_experiments(
+        self, workers: Optional[int] = None, executor: Optional[str] = None, force: bool = False
+    ) -> Dict[str, Any]:
+        """Run every experiment concurrently, respecting dependencies.
+
+        Ready experiments are started longest-remaining-chain first. An
+        experiment that fails or exceeds its timeout marks all of its
+        dependents as skipped; independent branches keep running. A timed-out
+        experiment cannot be interrupted, so its worker stays busy (and its
+        slot unavailable) until the body returns and the late result is
+        discarded. Experiments whose
+        fingerprint matches a cached artifact complete without running.
+
+        Args:
+            workers: Overrides the campaign's worker count.
+            executor: Overrides the campaign's executor kind.
+            force: Re-execute every experiment, ignoring cached artifacts.
+
+        Returns:
+            Dict with the overall ``status``, per-experiment ``results``, the
+            completion ``order``, the ``executed`` and ``cached`` experiment
+            names, the ``critical_path`` and the wall-clock ``makespan``.
+        """
+        order = self.topological_order()
+        indegree, dependents = self._graph()
+        kind = executor or self.executor
+        if kind not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{kind}', expected one of {sorted(EXECUTORS)}")
+        slots = max(1, workers or self.workers)
+        priority = self._remaining_path(order, dependents)
+        self.logger.info(f"Running {len(order)} experiments of '{self.name}' on {slots} {kind} workers")
+
+        position = {name: i for i, name in enumerate(order)}
+        ready: List[Tuple[float, int, str]] = []
+        for name in order:
+            if indegree[name] == 0:
+                heapq.heappush(ready, (-priority[name], position[name], name))
+        running: Dict[Future, Tuple[str, Optional[str], float, Optional[float]]] = {}
+        # Timed-out experiments whose workers are still busy; they hold a
+        # slot until they return, so later deadlines start with their work.
+        abandoned: Set[Future] = set()
+        blocked: Dict[str, str] = {}
+        finished: Dict[str, float] = {}
+        completed: List[str] = []
+        started = time.perf_counter()
+
+        def settle(name: str, status: str) -> None:
+            finished[name] = time.perf_counter() - started
+            completed.append(name)
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if status != "success":
+                    blocked.setdefault(child, f"upstream '{name}' {status}")
+                if indegree[child] == 0:
+                    if child in blocked:
+                        self._record(child, "skipped", error=blocked[child])
+                        settle(child, "skipped")
+                    else:
+                        heapq.heappush(ready, (-priority[child], position[child], child))
+
+        pool: Executor = EXECUTORS[kind](max_workers=slots)
+        try:
+            while ready or running:
+                while ready and len(running) + len(abandoned) < slots:
+                    _, _, name = heapq.heappop(ready)
+                    fingerprint = self.fingerprint(name)
+                    if not force and self._reuse(name, fingerprint) is not None:
+                        settle(name, "success")
+                        continue
+                    spec = self._index[name]
+                    function = spec.get("function") or _noop
+                    future = pool.submit(_execute, function, dict(spec["params"]), self._inputs(name))
+                    timeout = spec.get("timeout", self.timeout)
+                    submitted = time.perf_counter()
+                    deadline = None if timeout is None else submitted + timeout
+                    running[future] = (name, fingerprint, submitted, deadline)
+
+                deadlines = [deadline for _, _, _, deadline in running.values() if deadline is not None]
+                wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+                done, _ = wait(list(running) + list(abandoned), timeout=wait_for, return_when=FIRST_COMPLETED)
+                abandoned.difference_update(done)
+
+                for future in done:
+                    if future not in running:
+                        continue
+                    name, fingerprint, _, _ = running.pop(future)
+                    try:
+                        value, duration = future.result()
+                        record = self._store(name, fingerprint, value, duration)
+                    except Exception as exc:
+                        self.logger.error(f"Experiment '{name}' failed: {exc}")
+                        record = self._record(name, "failed", error=repr(exc))
+                    settle(name, record["status"])
+
+                now = time.perf_counter()
+                for future, (name, _, submitted, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline and not future.done():
+                        del running[future]
+                        abandoned.add(future)
+                        self.logger.warning(f"Experiment '{name}' timed out")
+                        self._record(name, "timeout", error="timed out", duration=now - submitted)
+                        settle(name, "timeout")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        makespan = time.perf_counter() - started
+        results = {}
+        for name in order:
+            results[name] = dict(self.results[name], finished=finished.get(name))
+        status = "success" if all(r["status"] == "success" for r in results.values()) else "failed"
+        critical = self.critical_path()
+        cached = [name for name in completed if results[name]["cached"]]
+        executed = [name for name in completed if results[name]["status"] != "skipped" and not results[name]["cached"]]
+        self.logger.info(
+            f"Research '{self.name}' finished with status {status} in {makespan:.3f}s "
+            f"({len(executed)} executed, {len(cached)} cached); critical path {' -> '.join(critical['path'])}"
+        )
+        return {
+            "status": status,
+            "results": results,
+            "order": completed,
+            "executed": executed,
+            "cached": cached,
+            "critical_path": critical,
+            "makespan": makespan,
+        }
+
+    def critical_path(self) -> Dict[str, Any]:
+        """Return the dependency chain with the largest total duration.
+
+        Uses the latest measured durations (estimates for experiments that
+        have not run).
+
+        Returns:
+            Dict with the ``path`` of experiment names and its ``duration``.
+        """
+        order = self.topological_order()
+        best: Dict[str, Tuple[float, Optional[str]]] = {}
+        for name in order:
+            parents = self._index[name]["depends_on"]
+            via = max(parents, key=lambda parent: best[parent][0], default=None)
+            upstream = best[via][0] if via is not None else 0.0
+            best[name] = (upstream + self._duration(name), via)
+        if not best:
+            return {"path": [], "duration": 0.0}
+        name: Optional[str] = max(order, key=lambda candidate: best[candidate][0])
+        total = best[name][0]
+        path: List[str] = []
+        while name is not None:
+            path.append(name)
+            name = best[name][1]
+        return {"path": path[::-1], "duration": total}
+
+
+class ResearchModule:
+    """Collection of research campaigns run as one innovation module.
+
+    Attributes:
+        name: Module name.
+        campaigns: Research campaigns by name.
+    """
+
+    def __init__(self, name: str = "research", workers: int = 4, executor: str = "thread"):
+        self.logger = setup_logger(self.__class__.__name__)
+        self.name = name
+        self.workers = workers
+        self.executor = executor
+        self.campaigns: Dict[str, Research] = {}
+
+    def add_research(self, research: Research) -> None:
+        """Register a campaign."""
+        self.campaigns[research.name] = research
+
+    def research(self, name: str) -> Research:
+        """Return the campaign ``name``, creating it with the module's pool settings."""
+        if name not in self.campaigns:
+            self.campaigns[name] = Research(name, workers=self.workers, executor=self.executor)
+        return self.campaigns[name]
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run every campaign and return their summaries by name."""
+        self.logger.info(f"Running {len(self.campaigns)} research campaigns")
+        return {name: research.run_all_experiments() for name, research in self.campaigns.items()}
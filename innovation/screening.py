@@ -0,0 +1,326 @@
+"""innovation.screening
+
+High-throughput candidate screening for material discovery.
+- Constraints and objectives are compiled once into NumPy arrays and applied as
+  vectorized masks and scores
+- Composition grids are enumerated depth-first with branch-and-bound pruning,
+  so infeasible regions are skipped without generating their candidates
+- Candidates are produced and evaluated in bounded chunks, keeping memory flat
+  regardless of the search-space size
+"""
+
+import itertools
+import math
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .elements import PROPERTY_NAMES
+
+_TOL = 1e-9
+_HIGH = {"high", "max", "maximize", "maximise"}
+_LOW = {"low", "min", "minimize", "minimise"}
+_MEDIUM = {"medium", "mid", "moderate"}
+
+
+def _bounds(spec: Any) -> Tuple[float, float]:
+    """Parse ``{"min": a, "max": b}`` or ``(a, b)`` into a (low, high) pair."""
+    if isinstance(spec, Mapping):
+        low, high = spec.get("min"), spec.get("max")
+    else:
+        low, high = spec
+    return (-math.inf if low is None else float(low), math.inf if high is None else float(high))
+
+
+def simplex_grid(units: int, parts: int) -> np.ndarray:
+    """Return every non-negative integer vector of ``parts`` entries summing to ``units``."""
+    if parts == 1:
+        return np.array([[units]], dtype=np.int64)
+    slots = units + parts - 1
+    bars = np.fromiter(
+        itertools.chain.from_iterable(itertools.combinations(range(slots), parts - 1)), dtype=np.int64
+    ).reshape(-1, parts - 1)
+    edges = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), slots)])
+    return np.diff(edges, axis=1) - 1
+
+
+class CompiledConstraints:
+    """Constraints compiled into arrays for vectorized feasibility masks.
+
+    Recognized keys: ``min_fraction`` / ``max_fraction`` (element -> fraction),
+    ``max_components`` (maximum number of non-zero elements) and property
+    bounds, given either under ``properties`` or as top-level property keys,
+    as ``{"min": a, "max": b}`` or ``(a, b)``.
+    """
+
+    def __init__(self, elements: Sequence[str], constraints: Mapping[str, Any]):
+        self.elements = list(elements)
+        index = {el: i for i, el in enumerate(self.elements)}
+        n_elements = len(self.elements)
+        self.min_fraction = np.zeros(n_elements)
+        self.max_fraction = np.ones(n_elements)
+        for el, value in constraints.get("min_fraction", {}).items():
+            self.min_fraction[index[el]] = float(value)
+        for el, value in constraints.get("max_fraction", {}).items():
+            self.max_fraction[index[el]] = float(value)
+
+        self.property_min = np.full(len(PROPERTY_NAMES), -np.inf)
+        self.property_max = np.full(len(PROPERTY_NAMES), np.inf)
+        bounds = dict(constraints.get("properties", {}))
+        bounds.update({k: v for k, v in constraints.items() if k in PROPERTY_NAMES})
+        for name, spec in bounds.items():
+            if name not in PROPERTY_NAMES:
+                raise ValueError(f"Unknown property constraint: {name}")
+            low, high = _bounds(spec)
+            column = PROPERTY_NAMES.index(name)
+            self.property_min[column], self.property_max[column] = low, high
+
+        self.max_components = int(constraints.get("max_components") or n_elements)
+
+    def violation(self, fractions: np.ndarray, properties: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        """Return how far each row is from feasibility (0 when feasible).
+
+        Fraction excesses count as-is; property excesses are divided by
+        ``scale``. The component limit is not included.
+        """
+        total = np.clip(self.min_fraction - fractions, 0, None).sum(axis=1)
+        total += np.clip(fractions - self.max_fraction, 0, None).sum(axis=1)
+        below = np.clip(self.property_min - properties, 0, None)
+        above = np.clip(properties - self.property_max, 0, None)
+        total += ((below + above) / scale).sum(axis=1)
+        return total
+
+    def mask(self, fractions: np.ndarray, properties: np.ndarray) -> np.ndarray:
+        """Return a boolean mask of rows satisfying every constraint."""
+        keep = np.all(fractions >= self.min_fraction - _TOL, axis=1)
+        keep &= np.all(fractions <= self.max_fraction + _TOL, axis=1)
+        keep &= np.all(properties >= self.property_min - _TOL, axis=1)
+        keep &= np.all(properties <= self.property_max + _TOL, axis=1)
+        if self.max_components < len(self.elements):
+            keep &= np.count_nonzero(fractions > _TOL, axis=1) <= self.max_components
+        return keep
+
+
+class CompiledObjectives:
+    """Target properties compiled into a vectorized score (higher is better).
+
+    Each target is a number (match it), ``"high"`` / ``"low"`` (maximize or
+    minimize), ``"medium"`` (match the middle of the achievable range) or a
+    dict ``{"target" | "goal": ..., "weight": w}``. Property differences are
+    normalized by the achievable range over the candidate elements.
+
+    Attributes:
+        ignored: Target names that are not known properties.
+    """
+
+    def __init__(self, target_properties: Mapping[str, Any], table: np.ndarray):
+        low, high = table.min(axis=0), table.max(axis=0)
+        self.scale = np.where(high - low > 0, high - low, 1.0)
+        self.columns: List[int] = []
+        self.modes: List[str] = []
+        self.targets: List[float] = []
+        self.weights: List[float] = []
+        self.ignored: List[str] = []
+        for name, spec in target_properties.items():
+            if name not in PROPERTY_NAMES:
+                self.ignored.append(name)
+                continue
+            column = PROPERTY_NAMES.index(name)
+            weight = 1.0
+            if isinstance(spec, Mapping):
+                weight = float(spec.get("weight", 1.0))
+                spec = spec.get("target", spec.get("goal"))
+            goal = spec.lower() if isinstance(spec, str) else spec
+            if goal in _HIGH:
+                mode, target = "high", 0.0
+            elif goal in _LOW:
+                mode, target = "low", 0.0
+            elif goal in _MEDIUM:
+                mode, target = "target", float((low[column] + high[column]) / 2)
+            else:
+                mode, target = "target", float(goal)
+            self.columns.append(column)
+            self.modes.append(mode)
+            self.targets.append(target)
+            self.weights.append(weight)
+
+    def __bool__(self) -> bool:
+        return bool(self.columns)
+
+    def score(self, properties: np.ndarray) -> np.ndarray:
+        """Score property rows; all zeros when there are no objectives."""
+        total = np.zeros(len(properties))
+        for column, mode, target, weight in zip(self.columns, self.modes, self.targets, self.weights):
+            values = properties[:, column] / self.scale[column]
+            if mode == "high":
+                total += weight * values
+            elif mode == "low":
+                total -= weight * values
+            else:
+                total -= weight * np.abs(values - target / self.scale[column])
+        return total
+
+    def costs(self, properties: np.ndarray) -> np.ndarray:
+        """Per-objective costs (lower is better), one column per objective.
+
+        Used for multi-objective (Pareto) ranking; weights do not apply.
+        """
+        costs = np.empty((len(properties), len(self.columns)))
+        for i, (column, mode, target) in enumerate(zip(self.columns, self.modes, self.targets)):
+            values = properties[:, column] / self.scale[column]
+            if mode == "high":
+                costs[:, i] = -values
+            elif mode == "low":
+                costs[:, i] = values
+            else:
+                costs[:, i] = np.abs(values - target / self.scale[column])
+        return costs
+
+
+class CompositionGrid:
+    """Enumerates composition grids in bounded chunks with region pruning.
+
+    Fractions are multiples of ``1 / resolution``. Element subsets are
+    visited when ``max_components`` limits the number of non-zero elements;
+    within a subset, elements are fixed one at a time and a branch is pruned
+    when no completion can satisfy the fraction bounds, the component limit
+    or the property bounds. Property bounds use the rule-of-mixtures interval
+    spanned by the remaining elements, which is valid for the linear model.
+
+    Attributes:
+        pruned_regions: Number of branches skipped without enumeration.
+        generated: Number of candidates emitted so far.
+    """
+
+    def __init__(
+        self,
+        constraints: CompiledConstraints,
+        table: np.ndarray,
+        resolution: int = 20,
+        chunk_size: int = 65_536,
+    ):
+        if resolution < 1 or chunk_size < 1:
+            raise ValueError("resolution and chunk_size must be positive.")
+        self.constraints = constraints
+        self.table = table
+        self.resolution = resolution
+        self.chunk_size = chunk_size
+        self.pruned_regions = 0
+        self.generated = 0
+
+    def _subsets(self) -> Iterator[Tuple[Tuple[int, ...], bool]]:
+        n_elements = len(self.constraints.elements)
+        if self.constraints.max_components >= n_elements:
+            yield tuple(range(n_elements)), True
+            return
+        required = set(np.flatnonzero(self.constraints.min_fraction > 0).tolist())
+        for size in range(1, self.constraints.max_components + 1):
+            for subset in itertools.combinations(range(n_elements), size):
+                if required.issubset(subset):
+                    yield subset, False
+                else:
+                    self.pruned_regions += 1
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Yield fraction arrays of at most about ``chunk_size`` rows."""
+        buffer: List[np.ndarray] = []
+        buffered = 0
+        for subset, allow_zero in self._subsets():
+            for block in self._search_subset(subset, allow_zero):
+                buffer.append(block)
+                buffered += len(block)
+                if buffered >= self.chunk_size:
+                    yield self._flush(buffer)
+                    buffer, buffered = [], 0
+        if buffer:
+            yield self._flush(buffer)
+
+    def _flush(self, blocks: List[np.ndarray]) -> np.ndarray:
+        counts = np.concatenate(blocks)
+        self.generated += len(counts)
+        return counts / self.resolution
+
+    def _search_subset(self, subset: Tuple[int, ...], allow_zero: bool) -> Iterator[np.ndarray]:
+        n = self.resolution
+        c = self.constraints
+        idx = np.asarray(subset)
+        min_units = np.ceil(c.min_fraction[idx] * n - _TOL).astype(np.int64)
+        if not allow_zero:
+            min_units = np.maximum(min_units, 1)
+        max_units = np.minimum(np.floor(c.max_fraction[idx] * n + _TOL).astype(np.int64), n)
+        table = self.table[idx]
+        # Suffix aggregates used to bound every completion of a prefix.
+        suffix_min_units = np.append(np.cumsum(min_units[::-1])[::-1], 0)
+        suffix_max_units = np.append(np.cumsum(max_units[::-1])[::-1], 0)
+        suffix_low = np.vstack([np.minimum.accumulate(table[::-1])[::-1], np.full(table.shape[1], np.inf)])
+        suffix_high = np.vstack([np.maximum.accumulate(table[::-1])[::-1], np.full(table.shape[1], -np.inf)])
+        if not suffix_min_units[0] <= n <= suffix_max_units[0]:
+            self.pruned_regions += 1
+            return
+        prefix = np.zeros(len(subset), dtype=np.int64)
+
+        def emit(position: int, remaining: int) -> np.ndarray:
+            parts = len(subset) - position
+            grid = simplex_grid(remaining - int(suffix_min_units[position]), parts) + min_units[position:]
+            block = np.zeros((len(grid), len(c.elements)), dtype=np.int64)
+            block[:, idx[:position]] = prefix[:position]
+            block[:, idx[position:]] = grid
+            return block
+
+        def search(position: int, remaining: int, partial: np.ndarray) -> Iterator[np.ndarray]:
+            # Rule-of-mixtures interval reachable by any completion of this prefix.
+            if remaining:
+                low = partial + remaining / n * suffix_low[position]
+                high = partial + remaining / n * suffix_high[position]
+            else:
+                low = high = partial
+            if np.any(high < c.property_min - _TOL) or np.any(low > c.property_max + _TOL):
+                self.pruned_regions += 1
+                return
+            parts = len(subset) - position
+            free = remaining - int(suffix_min_units[position])
+            if math.comb(free + parts - 1, parts - 1) <= self.chunk_size:
+                yield emit(position, remaining)
+                return
+            for units in range(int(min_units[position]), int(min(max_units[position], remaining)) + 1):
+                rest = remaining - units
+                if not suffix_min_units[position + 1] <= rest <= suffix_max_units[position + 1]:
+                    self.pruned_regions += 1
+                    continue
+                prefix[position] = units
+                yield from search(position + 1, rest, partial + units / n * table[position])
+            prefix[position] = 0
+
+        yield from search(0, n, np.zeros(table.shape[1]))
+
+
+class TopCandidates:
+    """Keeps the ``k`` best-scoring rows seen across chunks."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.scores = np.empty(0)
+        self.rows: Optional[np.ndarray] = None
+
+    def push(self, scores: np.ndarray, rows: np.ndarray) -> None:
+        """Offer a chunk of scored rows."""
+        if len(scores) == 0 or self.k <= 0:
+            return
+        if len(scores) > self.k:
+            keep = np.argpartition(-scores, self.k - 1)[: self.k]
+            scores, rows = scores[keep], rows[keep]
+        if self.rows is None:
+            self.scores, self.rows = scores, rows
+        else:
+            self.scores = np.concatenate([self.scores, scores])
+            self.rows = np.concatenate([self.rows, rows])
+        if len(self.scores) > self.k:
+            keep = np.argpartition(-self.scores, self.k - 1)[: self.k]
+            self.scores, self.rows = self.scores[keep], self.rows[keep]
+
+    def best(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, rows) sorted from best to worst."""
+        if self.rows is None:
+            return self.scores, np.empty((0, 0))
+        order = np.argsort(-self.scores, kind="stable")
+        return self.scores[order], self.rows[order]
@@ -4,59 +4,348 @@ Automation utilities for repetitive tasks and workflows.
 
 This module provides automation capabilities for running batch simulations,
 scheduling innovation tasks, and generating reports for the Jarvis system.
+Batch simulations run serially or across a process pool, report progress,
+checkpoint each finished run so interrupted batches resume, retry failed runs
+without restarting the batch, and summarize results with constant-memory
+streaming aggregators.
 """
 
+import json
 import logging
-from typing import Dict, Any
-from core.utils import setup_logger, handle_error
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Sized, Tuple
+
+from core.utils import default_file_mode, setup_logger, handle_error
+from simulation.result_cache import json_default, stable_hash
+from simulation.scenario_engine import ScenarioEngine
+from simulation.statistics import DEFAULT_QUANTILES, MetricAggregator
+
+from .reporting import render_report, report_format
+from .scheduler import DEFAULT_REQUIRED_PARAMETERS, Scheduler, default_handlers
 
 
 logger = setup_logger(__name__)
 
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+Runner = Callable[[Dict[str, Any]], Any]
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def run_scenario(simulation: Dict[str, Any]) -> Dict[str, Any]:
+    """Default batch runner: one ScenarioEngine run of ``problem`` with ``parameters``."""
+    return ScenarioEngine().run(str(simulation.get("problem", "")), simulation.get("parameters"))
 
-def run_simulation_batch(batch_config: dict) -> None:
+
+def _timed_run(runner: Runner, simulation: Dict[str, Any]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = runner(simulation)
+    return result, time.perf_counter() - started
+
+
+def _write_json(path: str, payload: Any) -> None:
+    """Write JSON atomically so an interrupted batch never leaves a torn checkpoint."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, default=json_default)
+    os.chmod(tmp_path, default_file_mode())
+    os.replace(tmp_path, path)
+
+
+def _load_checkpoint(path: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Return a completed run's checkpoint if it matches the current configuration."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            checkpoint = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return checkpoint if checkpoint.get("fingerprint") == fingerprint else None
+
+
+class _Progress:
+    """Throttled progress log (and optional callback) for a batch."""
+
+    def __init__(self, total: Optional[int], interval: float, callback: Optional[Callable[[Dict[str, Any]], None]]):
+        self.total = total
+        self.interval = interval
+        self.callback = callback
+        self.counts = {"completed": 0, "resumed": 0, "failed": 0, "retries": 0}
+        self.started = time.perf_counter()
+        self._last_log = self.started
+
+    def snapshot(self) -> Dict[str, Any]:
+        done = self.counts["completed"] + self.counts["resumed"] + self.counts["failed"]
+        elapsed = time.perf_counter() - self.started
+        rate = self.counts["completed"] / elapsed if elapsed > 0 else 0.0
+        remaining = None if self.total is None else self.total - done
+        return {
+            **self.counts,
+            "done": done,
+            "total": self.total,
+            "elapsed": elapsed,
+            "runs_per_second": rate,
+            "eta": remaining / rate if rate > 0 and remaining is not None else None,
+        }
+
+    def update(self, event: str, force: bool = False) -> None:
+        self.counts[event] += 1
+        if event == "retries" and not force:
+            return
+        snapshot = self.snapshot()
+        if self.callback is not None:
+            self.callback(snapshot)
+        now = time.perf_counter()
+        if force or now - self._last_log >= self.interval or snapshot["done"] == self.total:
+            self._last_log = now
+            eta = "?" if snapshot["eta"] is None else f"{snapshot['eta']:.1f}s"
+            logger.info(
+                f"Progress: {snapshot['done']}/{'?' if self.total is None else self.total} runs "
+                f"({snapshot['resumed']} resumed, {snapshot['failed']} failed, {snapshot['retries']} retries, "
+                f"{snapshot['runs_per_second']:.1f} runs/s, ETA {eta})"
+            )
+
+
+def run_simulation_batch(batch_config: dict) -> Dict[str, Any]:
     """Run batch simulations automatically based on configuration.
     
-    This is a placeholder function for automating multiple simulation runs
-    with different parameters or configurations. Useful for:
+    Runs every configured simulation, serially or across a process pool,
+    with a throttled progress log. Useful for:
     - Parameter sweeps and optimization
     - Monte Carlo simulations
     - Sensitivity analysis
     - Batch processing of simulation scenarios
     
+    With ``output_dir``, each completed run is checkpointed to
+    ``<output_dir>/runs/<run id>.json`` as soon as it finishes; running the
+    same batch again loads those checkpoints instead of re-running, so an
+    interrupted batch resumes where it stopped. A checkpoint is only reused
+    while its simulation configuration is unchanged. Failed runs are retried
+    up to ``max_retries`` times while the rest of the batch keeps going; runs
+    that still fail are reported, not checkpointed, and retried on resume.
+    
     Args:
         batch_config: Dictionary containing batch simulation configuration.
-                     Expected keys (placeholder):
-                     - 'simulations': list of simulation configurations
-                     - 'parallel': whether to run in parallel
-                     - 'output_dir': directory for results
+                     Supported keys:
+                     - 'simulations': list (or any iterable, consumed
+                       lazily) of simulation configurations; a dict is
+                       passed to the runner as-is (an optional 'id' names
+                       its checkpoint), any other value becomes
+                       ``{'problem': value}``
+                     - 'parallel': True for one worker process per CPU, an
+                       int for that many workers, falsy to run in-process
+                     - 'output_dir': directory for checkpoints and the batch
+                       manifest (``batch.json``)
+                     - 'runner': module-level callable ``runner(simulation)``
+                       returning a JSON-serializable result; defaults to
+                       :func:`run_scenario`
+                     - 'max_retries': retries per failed run (default 2)
+                     - 'progress_interval': seconds between progress logs
+                     - 'on_progress': callable receiving a progress dict
+                       after every finished run
+                     - 'aggregate': MetricAggregator options ('metrics',
+                       'top_k', 'sketch_k'); every numeric leaf of each
+                       result is aggregated by default
+                     - 'quantiles': quantile levels for the summary
+                     - 'keep_results': False to drop per-run results and
+                       keep memory constant (default True)
     
     Returns:
-        None. Results are logged and saved to configured output location.
+        Batch summary: ``status``, ``total``, ``completed``, ``resumed``,
+        ``retries``, ``failed`` (id, index, error and attempts of each run
+        that failed for good), ``elapsed``, the streaming ``aggregates`` of
+        every successful or resumed run, and the per-run ``results`` in
+        simulation order (None for failed runs, or None altogether when
+        ``keep_results`` is False).
         
     Note:
-        Future implementation will:
-        - Support parallel execution using multiprocessing
-        - Implement progress tracking and reporting
-        - Add checkpointing for long-running batches
-        - Support distributed execution
-        - Include result aggregation and summary statistics
+        With ``output_dir`` the aggregate summary is also written to
+        ``summary.json`` and the mergeable MetricAggregator is pickled to
+        ``aggregates.pkl``, so shards of one sweep run separately can be
+        combined with :meth:`MetricAggregator.merge`.
+        
+        If a worker process dies, the pool is replaced and every run that
+        was in flight is charged one attempt and resubmitted.
     """
     logger.info("Starting batch simulation run")
     logger.debug(f"Batch configuration: {batch_config}")
     
     try:
-        # Placeholder for validation
         if not isinstance(batch_config, dict):
             raise TypeError("batch_config must be a dictionary")
         
         logger.info(f"Processing batch with config keys: {list(batch_config.keys())}")
         
-        # Placeholder for batch execution logic
-        # Future: Loop through simulations, execute each, collect results
-        logger.info("Batch simulation execution in progress (placeholder)")
+        simulations: Iterable[Any] = batch_config.get("simulations", [])
+        if isinstance(simulations, (str, bytes, Mapping)) or not isinstance(simulations, Iterable):
+            raise TypeError("'simulations' must be a list")
+        total = len(simulations) if isinstance(simulations, Sized) else None
+        parallel = batch_config.get("parallel", False)
+        workers = (os.cpu_count() or 1) if parallel is True else int(parallel or 0)
+        runner: Runner = batch_config.get("runner", run_scenario)
+        max_retries = int(batch_config.get("max_retries", DEFAULT_MAX_RETRIES))
+        output_dir = batch_config.get("output_dir")
+        runs_dir = os.path.join(output_dir, "runs") if output_dir else None
+        if runs_dir:
+            os.makedirs(runs_dir, exist_ok=True)
+        progress = _Progress(
+            total,
+            float(batch_config.get("progress_interval", DEFAULT_PROGRESS_INTERVAL)),
+            batch_config.get("on_progress"),
+        )
+        keep_results = bool(batch_config.get("keep_results", True))
+        results: Dict[int, Any] = {}
+        aggregator = MetricAggregator(**batch_config.get("aggregate", {}))
+        quantiles = batch_config.get("quantiles", DEFAULT_QUANTILES)
+        seen = 0
+        failures: List[Dict[str, Any]] = []
+
+        def pending_jobs():
+            # Lazily yields (index, run id, fingerprint, simulation), skipping checkpointed runs.
+            nonlocal seen
+            for index, simulation in enumerate(simulations):
+                seen = index + 1
+                spec = dict(simulation) if isinstance(simulation, Mapping) else {"problem": simulation}
+                fingerprint = stable_hash(spec)
+                run_id = str(spec.get("id", f"{index:06d}-{fingerprint[:12]}"))
+                if runs_dir:
+                    checkpoint = _load_checkpoint(os.path.join(runs_dir, f"{run_id}.json"), fingerprint)
+                    if checkpoint is not None:
+                        collect(index, run_id, checkpoint["result"])
+                        progress.update("resumed")
+                        continue
+                yield index, run_id, fingerprint, spec
+
+        def collect(index: int, run_id: str, result: Any) -> None:
+            aggregator.add(result, key=run_id)
+            if keep_results:
+                results[index] = result
+
+        def succeeded(job: Tuple[int, str, str, Dict[str, Any]], outcome: Tuple[Any, float], attempt: int) -> None:
+            index, run_id, fingerprint, spec = job
+            result, duration = outcome
+            collect(index, run_id, result)
+            if runs_dir:
+                _write_json(
+                    os.path.join(runs_dir, f"{run_id}.json"),
+                    {
+                        "id": run_id,
+                        "index": index,
+                        "fingerprint": fingerprint,
+                        "simulation": spec,
+                        "result": result,
+                        "attempts": attempt,
+                        "duration": duration,
+                    },
+                )
+            progress.update("completed")
+
+        def failed(job: Tuple[int, str, str, Dict[str, Any]], error: BaseException, attempt: int) -> bool:
+            """Record a failed attempt; return True if the run should be retried."""
+            index, run_id = job[0], job[1]
+            if attempt <= max_retries:
+                logger.warning(f"Run {run_id} failed on attempt {attempt}, retrying: {type(error).__name__}: {error}")
+                progress.update("retries")
+                return True
+            logger.error(f"Run {run_id} failed after {attempt} attempts: {type(error).__name__}: {error}")
+            failures.append(
+                {"id": run_id, "index": index, "error": f"{type(error).__name__}: {error}", "attempts": attempt}
+            )
+            progress.update("failed", force=True)
+            return False
+
+        if workers <= 1:
+            for job in pending_jobs():
+                attempt = 1
+                while True:
+                    try:
+                        outcome = _timed_run(runner, job[3])
+                    except Exception as e:
+                        if failed(job, e, attempt):
+                            attempt += 1
+                            continue
+                    else:
+                        succeeded(job, outcome, attempt)
+                    break
+        else:
+            jobs = pending_jobs()
+            retry_queue: List[Tuple[Tuple[int, str, str, Dict[str, Any]], int]] = []
+            pending: Dict[Future, Tuple[Tuple[int, str, str, Dict[str, Any]], int]] = {}
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                exhausted = False
+                while True:
+                    # Keep a bounded window of in-flight runs; retries go first.
+                    while len(pending) < 2 * workers:
+                        if retry_queue:
+                            job, attempt = retry_queue.pop()
+                        else:
+                            job = None if exhausted else next(jobs, None)
+                            if job is None:
+                                exhausted = True
+                                break
+                            attempt = 1
+                        pending[pool.submit(_timed_run, runner, job[3])] = (job, attempt)
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    broken = False
+                    for future in done:
+                        job, attempt = pending.pop(future)
+                        try:
+                            outcome = future.result()
+                        except BrokenProcessPool as e:
+                            broken = True
+                            if failed(job, e, attempt):
+                                retry_queue.append((job, attempt + 1))
+                        except Exception as e:
+                            if failed(job, e, attempt):
+                                retry_queue.append((job, attempt + 1))
+                        else:
+                            succeeded(job, outcome, attempt)
+                    if broken:
+                        # A worker died; every in-flight run is lost with the pool.
+                        logger.warning("Worker process died; restarting the process pool")
+                        for future, (job, attempt) in list(pending.items()):
+                            if failed(job, BrokenProcessPool("worker process died"), attempt):
+                                retry_queue.append((job, attempt + 1))
+                        pending.clear()
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = ProcessPoolExecutor(max_workers=workers)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        snapshot = progress.snapshot()
+        summary = {
+            "status": "completed_with_failures" if failures else "completed",
+            "total": seen,
+            "completed": snapshot["completed"],
+            "resumed": snapshot["resumed"],
+            "retries": snapshot["retries"],
+            "failed": failures,
+            "elapsed": snapshot["elapsed"],
+            "aggregates": aggregator.summary(quantiles),
+        }
+        if output_dir:
+            _write_json(os.path.join(output_dir, "summary.json"), summary["aggregates"])
+            _write_json(os.path.join(output_dir, "batch.json"), {k: v for k, v in summary.items() if k != "aggregates"})
+            with open(os.path.join(output_dir, "aggregates.pkl"), "wb") as handle:
+                pickle.dump(aggregator, handle, protocol=pickle.HIGHEST_PROTOCOL)
         
-        logger.info("Batch simulation completed successfully")
+        if failures:
+            logger.warning(f"Batch simulation completed with {len(failures)} failed runs")
+        else:
+            logger.info("Batch simulation completed successfully")
+        ordered = [results.get(index) for index in range(seen)] if keep_results else None
+        return {**summary, "results": ordered}
         
     except TypeError as e:
         logger.error("Invalid batch configuration type")
@@ -68,50 +357,80 @@ def run_simulation_batch(batch_config: dict) -> None:
         raise
 
 
-def schedule_innovation_task(task_config: dict) -> None:
+def get_scheduler(**options: Any) -> Scheduler:
+    """Return the process-wide scheduler used by :func:`schedule_innovation_task`.
+
+    It is created on first use with ``options`` (see :class:`Scheduler`) and
+    the built-in innovation task handlers; later options are ignored.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            options.setdefault("handlers", default_handlers())
+            options.setdefault("required", DEFAULT_REQUIRED_PARAMETERS)
+            _scheduler = Scheduler(**options)
+        return _scheduler
+
+
+def schedule_innovation_task(task_config: dict) -> str:
     """Schedule automated innovation experiments and tasks.
     
-    This is a placeholder function for scheduling and automating
-    innovation-related experiments such as:
-    - Material discovery runs
-    - Cross-pollination experiments
-    - Research workflow automation
-    - Periodic innovation pipeline execution
+    Adds a job to the process-wide :class:`~scripts.scheduler.Scheduler` and
+    starts its dispatcher. Built-in task types are:
+    - 'material_discovery' and 'material_optimization' (MaterialDiscovery)
+    - 'cross_pollination' (CrossPollinationEngine.generate_breakthroughs)
+    - 'simulation_batch' (run_simulation_batch)
+    Other types need a handler registered first with
+    ``get_scheduler().register(task_type, handler)``.
     
     Args:
         task_config: Dictionary containing task scheduling configuration.
-                    Expected keys (placeholder):
+                    Supported keys:
                     - 'task_type': type of innovation task
-                    - 'schedule': cron-like schedule or interval
-                    - 'parameters': task-specific parameters
+                    - 'schedule': cron expression, interval ('every 5m',
+                      seconds) or omitted to run once now
+                    - 'parameters': task-specific parameters passed to the
+                      handler (JSON-serializable)
+                    - 'priority', 'depends_on', 'max_retries', 'backoff',
+                      'id': see :meth:`Scheduler.add_job`
+                    - 'store': SQLite job store path, honoured when the
+                      process-wide scheduler is first created
     
     Returns:
-        None. Task is scheduled and logged.
-        
-    Note:
-        Future implementation will:
-        - Support cron-like scheduling syntax
-        - Implement task queuing and priority handling
-        - Add task monitoring and status tracking
-        - Support task dependencies and workflows
-        - Include retry logic with exponential backoff
+        The job id.
+
+    Raises:
+        ValueError: If the task type has no handler or its required
+            parameters are missing (e.g. 'target_properties' and
+            'constraints' for 'material_discovery').
     """
     logger.info("Scheduling innovation task")
     logger.debug(f"Task configuration: {task_config}")
     
     try:
-        # Placeholder for validation
         if not isinstance(task_config, dict):
             raise TypeError("task_config must be a dictionary")
         
         task_type = task_config.get('task_type', 'unknown')
         logger.info(f"Scheduling task of type: {task_type}")
         
-        # Placeholder for scheduling logic
-        # Future: Use APScheduler or similar library for task scheduling
-        logger.info("Task scheduling configuration processed (placeholder)")
+        scheduler = get_scheduler(store_path=task_config.get('store'))
+        job_id = scheduler.add_job(
+            task_type,
+            schedule=task_config.get('schedule'),
+            parameters=task_config.get('parameters'),
+            priority=task_config.get('priority', 0),
+            depends_on=task_config.get('depends_on', ()),
+            max_retries=task_config.get('max_retries', 3),
+            backoff=task_config.get('backoff', 1.0),
+            job_id=task_config.get('id'),
+        )
+        scheduler.start()
+        next_run = scheduler.get_job(job_id)["next_run"]
+        logger.debug(f"Job {job_id} next runs at {next_run}")
         
         logger.info(f"Innovation task '{task_type}' scheduled successfully")
+        return job_id
         
     except TypeError as e:
         logger.error("Invalid task configuration type")
@@ -127,47 +446,78 @@ def schedule_innovation_task(task_config: dict) -> None:
         raise
 
 
-def generate_report(output_path: str) -> None:
+def default_report_sections(scheduler: Optional[Scheduler]) -> List[Dict[str, Any]]:
+    """Sections of the default status report: the jobs of ``scheduler``, if any.
+    
+    Args:
+        scheduler: Scheduler whose jobs are listed; ``None`` reports that
+                  no innovation tasks have been scheduled.
+    
+    Returns:
+        A single "Scheduled tasks" section.
+    """
+    if scheduler is None:
+        return [{"title": "Scheduled tasks", "text": "No innovation tasks have been scheduled."}]
+    columns = ["id", "task_type", "status", "next_run", "runs", "failures", "last_status", "last_error"]
+    return [{"title": "Scheduled tasks", "columns": columns, "rows": scheduler.jobs}]
+
+
+def generate_report(
+    output_path: str,
+    sections: Optional[Sequence[Mapping[str, Any]]] = None,
+    title: str = "Jarvis Report",
+    cache_dir: Optional[str] = None,
+    scheduler: Optional[Scheduler] = None,
+) -> Dict[str, Any]:
     """Generate summaries or dashboard-ready reports.
     
-    This is a placeholder function for generating various types of reports
-    including:
+    Renders a JSON, HTML or Markdown report (chosen by the extension of
+    ``output_path``; ``.txt`` is written as Markdown), for example:
     - Simulation result summaries
     - Innovation experiment reports
     - Performance metrics and dashboards
     - Automated status reports
     
+    Table rows are streamed to the file as they are produced, so a section
+    may hold millions of rows. With ``cache_dir``, every section is cached
+    under a fingerprint of its inputs and only sections whose inputs changed
+    are re-rendered; see :func:`scripts.reporting.render_report`.
+    
     Args:
         output_path: File path where the report should be saved.
-                    Supported formats (future): .txt, .html, .pdf, .json
+        sections: Report sections; defaults to
+                 ``default_report_sections(scheduler)``.
+        title: Report title.
+        cache_dir: Directory for cached section renderings.
+        scheduler: Scheduler listed by the default sections; defaults to
+                  the process-wide scheduler of :func:`get_scheduler`, or
+                  none when no innovation task has been scheduled yet.
     
     Returns:
-        None. Report is saved to the specified output path.
-        
-    Note:
-        Future implementation will:
-        - Support multiple output formats (HTML, PDF, JSON, Markdown)
-        - Include data visualization and charts
-        - Add customizable report templates
-        - Support report sections and table of contents
-        - Include automated insights and recommendations
-        - Implement report caching and incremental updates
+        Dict with the ``format`` and the ``rendered`` and ``cached``
+        section titles and the number of ``rows`` rendered.
     """
     logger.info(f"Generating report to: {output_path}")
     logger.debug(f"Report output path: {output_path}")
     
     try:
-        # Placeholder for validation
         if not output_path or not isinstance(output_path, str):
             raise ValueError("output_path must be a non-empty string")
+        report_format(output_path)
         
-        # Placeholder for report generation logic
-        # Future: Collect data, format report, save to file
-        logger.info("Collecting data for report (placeholder)")
-        logger.info("Formatting report content (placeholder)")
-        logger.info("Saving report to file (placeholder)")
+        logger.info("Collecting data for report")
+        if sections is None:
+            sections = default_report_sections(scheduler if scheduler is not None else _scheduler)
+        
+        logger.info(f"Formatting report content ({len(sections)} sections)")
+        summary = render_report(output_path, sections, title=title, cache_dir=cache_dir)
+        logger.info(
+            f"Rendered {len(summary['rendered'])} sections ({summary['rows']} rows), "
+            f"reused {len(summary['cached'])} cached"
+        )
         
         logger.info(f"Report generated successfully at: {output_path}")
+        return summary
         
     except ValueError as e:
         logger.error("Invalid output path")
@@ -180,4 +530,4 @@ def generate_report(output_path: str) -> None:
     except Exception as e:
         logger.error(f"Failed to generate report at {output_path}")
         handle_error(e)
-        raise
\ No newline at end of file
+        raise
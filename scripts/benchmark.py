@@ -0,0 +1,271 @@
+"""scripts.benchmark
+
+Benchmark suite for the simulation modules.
+
+This module times PhysicsEngine, Environment state updates, ScenarioEngine and
+PhysicsSimulator at several problem sizes, records wall time, throughput and
+peak traced memory into a JSON history file, and compares the latest run
+against a stored baseline to flag regressions.
+
+Usage:
+    python -m scripts.benchmark run --sizes 1000 10000 100000
+    python -m scripts.benchmark save-baseline
+    python -m scripts.benchmark compare --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.utils import setup_logger
+from simulation.environment import Environment
+from simulation.physics import PhysicsEngine
+from simulation.physics_simulator import PhysicsSimulator
+from simulation.scenario_engine import ScenarioEngine
+
+
+logger = setup_logger(__name__)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_HISTORY = "bench_history.json"
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def _physics_engine(size: int) -> Callable[[], int]:
+    engine = PhysicsEngine()
+    objects = [{"mass": float(i % 97 + 1), "acceleration": float(i % 13)} for i in range(size)]
+
+    def work() -> int:
+        engine.apply_forces(objects)
+        for obj in objects:
+            engine.compute_force(obj["mass"], obj["acceleration"])
+        return size
+
+    return work
+
+
+def _environment_updates(size: int) -> Callable[[], int]:
+    env = Environment("benchmark")
+
+    def work() -> int:
+        for step in range(size):
+            env.update_state({"time": step * 0.1, "parameters": {"step": step}})
+        return size
+
+    return work
+
+
+def _scenario_engine(size: int) -> Callable[[], int]:
+    engine = ScenarioEngine()
+    parameters = {
+        "distributions": {
+            "demand": {"dist": "normal", "loc": 5.0, "scale": 1.0},
+            "cost": {"dist": "uniform", "low": 0.0, "high": 2.0},
+        },
+        "samples": size,
+    }
+
+    def work() -> int:
+        engine.run("benchmark", parameters)
+        return size
+
+    return work
+
+
+def _physics_simulator(size: int) -> Callable[[], int]:
+    simulator = PhysicsSimulator(rules={"energy": 0.2, "fusion": 0.2, "battery": 0.1, "perpetual motion": -0.5})
+    phrases = ["carbon-neutral energy", "solid state battery", "orbital logistics", "fusion plant"]
+    problems = [f"{phrases[i % len(phrases)]} at scale #{i}" for i in range(size)]
+
+    def work() -> int:
+        simulator.feasibility_scores(problems)
+        return size
+
+    return work
+
+
+# Each case maps a problem size to a zero-argument callable returning items processed.
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], int]]] = {
+    "physics_engine.compute_force": _physics_engine,
+    "environment.update_state": _environment_updates,
+    "scenario_engine.monte_carlo": _scenario_engine,
+    "physics_simulator.feasibility_scores": _physics_simulator,
+}
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 3,
+    cases: Optional[Sequence[str]] = None,
+    label: str = "",
+) -> Dict[str, Any]:
+    """Run the benchmark cases and return a run record.
+
+    Each case is timed ``repeat`` times (best time kept) and then run once
+    more under tracemalloc to record peak memory.
+
+    Args:
+        sizes: Problem sizes to run every case at.
+        repeat: Timed repetitions per case and size.
+        cases: Subset of ``BENCHMARKS`` names; all cases by default.
+        label: Free-form label stored with the run (e.g. a git revision).
+
+    Returns:
+        Run record with one result per ``"<case>@<size>"`` key.
+    """
+    names = list(cases) if cases else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {unknown}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    # Silence placeholder modules that print on every call.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in names:
+            for size in sizes:
+                work = BENCHMARKS[name](size)
+                timings = []
+                for _ in range(max(1, repeat)):
+                    started = time.perf_counter()
+                    items = work()
+                    timings.append(time.perf_counter() - started)
+                tracemalloc.start()
+                try:
+                    work()
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                best = min(timings)
+                results[f"{name}@{size}"] = {
+                    "case": name,
+                    "size": size,
+                    "seconds": best,
+                    "throughput": items / best if best > 0 else float("inf"),
+                    "peak_memory_bytes": peak,
+                }
+                logger.info(f"{name}@{size}: {best:.4f}s, {results[f'{name}@{size}']['throughput']:.0f} items/s")
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "label": label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    """Load the list of run records from a history file (empty if missing)."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle).get("runs", [])
+
+
+def append_history(path: str, record: Dict[str, Any]) -> None:
+    """Append a run record to a history file."""
+    runs = load_history(path)
+    runs.append(record)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({"runs": runs}, handle, indent=2)
+
+
+def compare_runs(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    """Compare two run records case by case.
+
+    A case regresses when its time grows by more than ``threshold`` (a
+    fraction, 0.1 = 10%) or its peak memory grows by more than the same
+    fraction. Cases missing from either run are skipped.
+
+    Returns:
+        One comparison dict per shared case, with ``regression`` set to True
+        for flagged cases.
+    """
+    comparisons = []
+    for key, now in sorted(current["results"].items()):
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        time_ratio = now["seconds"] / before["seconds"] if before["seconds"] > 0 else 1.0
+        memory_ratio = (
+            now["peak_memory_bytes"] / before["peak_memory_bytes"] if before["peak_memory_bytes"] > 0 else 1.0
+        )
+        comparisons.append({
+            "benchmark": key,
+            "baseline_seconds": before["seconds"],
+            "current_seconds": now["seconds"],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regression": time_ratio > 1 + threshold or memory_ratio > 1 + threshold,
+        })
+    return comparisons
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(description="Simulation benchmark suite")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Stored baseline run")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and append to the history")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--cases", nargs="+", choices=sorted(BENCHMARKS))
+    run_parser.add_argument("--label", default="")
+
+    commands.add_parser("save-baseline", help="Store the latest history run as the baseline")
+
+    compare_parser = commands.add_parser("compare", help="Compare the latest run with the baseline")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        record = run_benchmarks(args.sizes, args.repeat, args.cases, args.label)
+        append_history(args.history, record)
+        logger.info(f"Recorded {len(record['results'])} benchmarks in {args.history}")
+        return 0
+
+    runs = load_history(args.history)
+    if not runs:
+        logger.error(f"No benchmark runs recorded in {args.history}")
+        return 2
+
+    if args.command == "save-baseline":
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(runs[-1], handle, indent=2)
+        logger.info(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.error(f"Baseline file not found: {args.baseline}")
+        return 2
+    with open(args.baseline, "r", encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    comparisons = compare_runs(baseline, runs[-1], args.threshold)
+    for item in comparisons:
+        log = logger.warning if item["regression"] else logger.info
+        log(
+            f"{item['benchmark']:<50} {item['baseline_seconds']:>10.4f}s -> {item['current_seconds']:>10.4f}s "
+            f"(x{item['time_ratio']:.2f} time, x{item['memory_ratio']:.2f} memory) "
+            f"{'REGRESSION' if item['regression'] else 'ok'}"
+        )
+    return 1 if any(item["regression"] for item in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+"""scripts.cleaning
+
+Vectorized cleaning of columnar datasets (``{column: np.ndarray}`` dicts).
+- Columns are coerced to a schema of kinds (int, float, bool, str); text is
+  stripped and parsed with the same rules as scripts.datasets
+- Rows holding nulls (NaN, infinities, empty or null-token strings) are
+  dropped or filled
+- Duplicate rows are found by hashing every row to 64 bits column by
+  column, never by comparing rows pairwise; across the chunks of a stream
+  the hashes already seen are kept in a bounded first-in first-out set
+- Numeric outliers are clipped to IQR or z-score bounds
+- Chunked streams are cleaned lazily, one chunk at a time; fill values and
+  outlier bounds are estimated in a first pass over the whole stream with
+  mergeable quantile sketches and running moments, so every chunk is cleaned
+  the same way (a one-shot iterator can only be fitted on its first chunk)
+"""
+
+import copy
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.utils import setup_logger
+from simulation.statistics import QuantileSketch, RunningStats
+
+from .datasets import KINDS, NULL_TOKENS, _convert_text
+
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_HASHES = 1 << 22
+NULL_ACTIONS = ("drop", "fill", "keep")
+OUTLIER_METHODS = {"iqr": 1.5, "zscore": 3.0}
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+# Output of DataCleaner.prepare: columns, row hashes, clipped values per row, rows in, rows dropped for nulls.
+Prepared = Tuple[Dict[str, np.ndarray], Optional[np.ndarray], Optional[np.ndarray], int, int]
+ChunkSource = Union[Mapping[str, np.ndarray], Iterable[Mapping[str, np.ndarray]], Callable[[], Iterable]]
+
+
+def is_columnar(data: Any) -> bool:
+    """Whether ``data`` is a non-empty dict of equal-length 1-D arrays."""
+    if not isinstance(data, Mapping) or not data:
+        return False
+    arrays = list(data.values())
+    if not all(isinstance(values, np.ndarray) and values.ndim == 1 for values in arrays):
+        return False
+    return len({len(values) for values in arrays}) == 1
+
+
+def _mix(hashes: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: spread every input bit over the whole hash."""
+    hashes = hashes ^ (hashes >> np.uint64(30))
+    hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = hashes ^ (hashes >> np.uint64(27))
+    hashes = hashes * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def _column_hashes(values: np.ndarray) -> np.ndarray:
+    """64-bit hash of every value of a column; equal values hash equally."""
+    if values.dtype.kind == "f":
+        values = values.astype(np.float64)
+        # -0.0 == 0.0 and every NaN is the same missing value.
+        values = np.where(values == 0, 0.0, values)
+        values[np.isnan(values)] = np.nan
+        return values.view(np.uint64)
+    if values.dtype.kind in "iub":
+        return values.astype(np.int64).view(np.uint64)
+    if values.dtype.kind == "U":
+        width = values.dtype.itemsize // 4
+        codes = np.ascontiguousarray(values).view(np.uint32).reshape(len(values), width)
+        # Only each value's own characters count, not the NUL padding of the
+        # array's fixed width, so a string hashes the same in any chunk.
+        lengths = np.char.str_len(values)
+        hashes = np.full(len(values), _FNV_OFFSET, dtype=np.uint64)
+        for position in range(int(lengths.max()) if len(values) else 0):
+            active = lengths > position
+            hashes[active] = (hashes[active] ^ codes[active, position]) * _FNV_PRIME
+        return hashes
+    return np.fromiter((hash(value) for value in values), dtype=np.int64, count=len(values)).view(np.uint64)
+
+
+def row_hashes(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Return a 64-bit hash per row of a columnar dataset.
+
+    Rows with equal values in every column get equal hashes; distinct rows
+    collide with probability about 2**-64 per pair.
+    """
+    hashes: Optional[np.ndarray] = None
+    for values in columns.values():
+        column = _column_hashes(values)
+        hashes = _mix(column ^ _GOLDEN) if hashes is None else _mix(hashes * _GOLDEN ^ column)
+    return np.zeros(0, dtype=np.uint64) if hashes is None else hashes
+
+
+class BoundedHashSet:
+    """First-in first-out set of at most ``capacity`` row hashes.
+
+    Once full, the oldest hashes are forgotten, so a duplicate of a row seen
+    more than ``capacity`` distinct rows earlier is no longer recognised.
+    Hashes are kept in insertion order in a ring and, for lookups, in a
+    sorted index that is updated by merging rather than re-sorted.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_MAX_HASHES):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self._ring = np.empty(capacity, dtype=np.uint64)
+        self._sorted = np.empty(0, dtype=np.uint64)
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Add hashes and return the mask of those that were new.
+
+        Only the first occurrence of a hash repeated within ``hashes`` is new.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        values, first_index = np.unique(hashes, return_index=True)
+        if self._size:
+            positions = np.minimum(np.searchsorted(self._sorted, values), self._size - 1)
+            unseen = self._sorted[positions] != values
+            values, first_index = values[unseen], first_index[unseen]
+        first = np.zeros(len(hashes), dtype=bool)
+        first[first_index] = True
+
+        fresh = hashes[first][-self.capacity:]
+        values = np.sort(fresh)
+        overflow = self._size + len(fresh) - self.capacity
+        if overflow > 0:
+            oldest = (self._next - self._size + np.arange(overflow)) % self.capacity
+            evicted = np.sort(self._ring[oldest])
+            self._sorted = np.delete(self._sorted, np.searchsorted(self._sorted, evicted))
+            self._size -= overflow
+        self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, values), values)
+        self._ring[(self._next + np.arange(len(fresh))) % self.capacity] = fresh
+        self._next = (self._next + len(fresh)) % self.capacity
+        self._size += len(fresh)
+        return first
+
+
+class DataCleaner:
+    """Cleans columnar datasets or streams of column chunks.
+
+    A cleaner keeps state between calls: the hashes of rows already seen
+    (for cross-chunk deduplication), the fill values and outlier bounds
+    (estimated by :meth:`fit`, or else on the first chunk cleaned), and
+    running counts in ``stats``.
+
+    Attributes:
+        schema: ``{column: kind}`` to coerce columns to.
+        nulls: ``"drop"`` rows with nulls, ``"fill"`` them or ``"keep"`` them.
+        fill_values: ``{column: value}`` used by ``"fill"``; numeric columns
+            without one are filled with their median.
+        deduplicate: Whether duplicate rows are removed.
+        outliers: ``"iqr"``, ``"zscore"`` or None to leave values unclipped.
+        threshold: IQR multiplier or number of standard deviations.
+        bounds: ``{column: (low, high)}`` clipping bounds; estimated for
+            numeric columns not listed.
+        stats: Counts of rows seen and kept, and of nulls, duplicates and
+            clipped values.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Mapping[str, str]] = None,
+        nulls: str = "drop",
+        fill_values: Optional[Mapping[str, Any]] = None,
+        deduplicate: bool = True,
+        outliers: Optional[str] = None,
+        threshold: Optional[float] = None,
+        bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+        outlier_columns: Optional[Sequence[str]] = None,
+        max_hashes: int = DEFAULT_MAX_HASHES,
+    ):
+        unknown = sorted(set((schema or {}).values()) - set(KINDS))
+        if unknown:
+            raise ValueError(f"Unknown column kinds {unknown}; use {KINDS}")
+        if nulls not in NULL_ACTIONS:
+            raise ValueError(f"nulls must be one of {NULL_ACTIONS}, got {nulls!r}")
+        if outliers is not None and outliers not in OUTLIER_METHODS:
+            raise ValueError(f"outliers must be one of {sorted(OUTLIER_METHODS)} or None, got {outliers!r}")
+        self.schema = dict(schema or {})
+        self.nulls = nulls
+        self.fill_values = dict(fill_values or {})
+        self.deduplicate = deduplicate
+        self.outliers = outliers
+        self.threshold = threshold if threshold is not None else OUTLIER_METHODS.get(outliers or "", 0.0)
+        self.bounds: Dict[str, Tuple[float, float]] = {name: tuple(pair) for name, pair in (bounds or {}).items()}
+        self.outlier_columns = list(outlier_columns) if outlier_columns is not None else None
+        self.stats = {"rows": 0, "kept": 0, "nulls": 0, "duplicates": 0, "clipped": 0}
+        self._seen = BoundedHashSet(max_hashes) if deduplicate else None
+        self._fitted = False
+        self._sketches: Dict[str, QuantileSketch] = {}
+        self._moments: Dict[str, RunningStats] = {}
+
+    @property
+    def needs_fit(self) -> bool:
+        """Whether fill values or outlier bounds still have to be estimated."""
+        return not self._fitted and (self.nulls == "fill" or self.outliers is not None)
+
+    def partial_fit(self, columns: Mapping[str, np.ndarray]) -> "DataCleaner":
+        """Fold one chunk into the estimates of fill values and outlier bounds.
+
+        Call :meth:`finish_fit` after the last chunk; :meth:`fit` does both.
+        """
+        columns = {name: self._coerce(name, values) for name, values in columns.items()}
+        for name, values in self._fit_sample(columns).items():
+            if values.dtype.kind not in "if" or not len(values):
+                continue
+            fill, bounds = self._pending(name)
+            if fill or (bounds and self.outliers == "iqr"):
+                self._sketches.setdefault(name, QuantileSketch()).update(values)
+            if bounds and self.outliers == "zscore":
+                self._moments.setdefault(name, RunningStats()).update(values)
+        return self
+
+    def finish_fit(self) -> None:
+        """Set fill values and outlier bounds from the chunks folded by :meth:`partial_fit`."""
+        for name in set(self._sketches) | set(self._moments):
+            sketch, moments = self._sketches.get(name), self._moments.get(name)
+            self._estimate(
+                name,
+                lambda qs, sketch=sketch: sketch.quantiles(qs),
+                lambda moments=moments: (moments.mean, float(np.sqrt(moments.m2 / moments.count))),
+            )
+        self._sketches, self._moments = {}, {}
+        self._fitted = True
+
+    def fit(self, source: ChunkSource) -> "DataCleaner":
+        """Estimate fill values and outlier bounds in one pass over a dataset or stream.
+
+        Args:
+            source: Columnar dataset, iterable of chunks, or callable
+                returning a fresh iterable of chunks.
+        """
+        chunks = [source] if isinstance(source, Mapping) else source() if callable(source) else source
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        self.finish_fit()
+        return self
+
+    def clean(self, columns: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Clean one columnar dataset or chunk; the input is not modified."""
+        return self.accept(self.prepare(columns))
+
+    def prepare(self, columns: Mapping[str, np.ndarray]) -> Prepared:
+        """Run every per-chunk step: coercion, nulls, row hashing and clipping.
+
+        Only the removal of duplicates, which needs the hashes of earlier
+        chunks, is left to :meth:`accept`, so chunks can be prepared in
+        other processes by a :meth:`worker` copy of a fitted cleaner.
+        """
+        columns = {name: self._coerce(name, values) for name, values in columns.items()}
+        rows = len(next(iter(columns.values()))) if columns else 0
+        masks = {name: _null_mask(values) for name, values in columns.items()}
+        null_rows = np.zeros(rows, dtype=bool)
+        for mask in masks.values():
+            null_rows |= mask
+        dropped = self.nulls == "drop" and null_rows.any()
+        keep = ~null_rows
+
+        if not self._fitted:
+            self._fit(self._fit_sample(columns, masks))
+        if self.nulls == "fill":
+            for name, mask in masks.items():
+                if mask.any() and name in self.fill_values:
+                    filled = np.where(mask, self.fill_values[name], columns[name])
+                    columns[name] = filled if filled.dtype.kind == "U" else filled.astype(columns[name].dtype)
+        if dropped:
+            columns = {name: values[keep] for name, values in columns.items()}
+
+        # Rows are hashed before clipping, so rows differing only in outliers stay distinct.
+        hashes = row_hashes(columns) if self.deduplicate else None
+        clipped: Optional[np.ndarray] = None
+        for name, (low, high) in self.bounds.items():
+            values = columns.get(name)
+            if values is None or values.dtype.kind not in "if":
+                continue
+            if values.dtype.kind == "i":
+                low, high = np.ceil(low), np.floor(high)
+            outside = (values < low) | (values > high)
+            if outside.any():
+                clipped = outside.astype(np.int64) if clipped is None else clipped + outside
+                columns[name] = np.clip(values, low, high).astype(values.dtype)
+        return columns, hashes, clipped, rows, int(null_rows.sum()) if self.nulls == "drop" else 0
+
+    def accept(self, prepared: Prepared) -> Dict[str, np.ndarray]:
+        """Drop rows already seen from a prepared chunk and update ``stats``."""
+        columns, hashes, clipped, rows, nulls = prepared
+        duplicates = 0
+        if hashes is not None and self._seen is not None:
+            fresh = self._seen.add(hashes)
+            duplicates = int(len(hashes) - fresh.sum())
+            if duplicates:
+                columns = {name: values[fresh] for name, values in columns.items()}
+                clipped = clipped[fresh] if clipped is not None else None
+        self.stats["rows"] += rows
+        self.stats["kept"] += rows - nulls - duplicates
+        self.stats["nulls"] += nulls
+        self.stats["duplicates"] += duplicates
+        self.stats["clipped"] += int(clipped.sum()) if clipped is not None else 0
+        return columns
+
+    def worker(self) -> "DataCleaner":
+        """Copy of this cleaner for :meth:`prepare` in another process.
+
+        The copy shares the fitted fill values and bounds but not the set of
+        seen hashes, which stays with this cleaner.
+        """
+        clone = copy.copy(self)
+        clone._seen = None
+        clone.stats = dict.fromkeys(self.stats, 0)
+        return clone
+
+    def clean_chunks(
+        self, chunks: Union[Iterable[Mapping[str, np.ndarray]], Callable[[], Iterable]]
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Lazily clean a stream of chunks, skipping chunks left empty.
+
+        Fill values and outlier bounds that are still needed are first
+        estimated over the whole stream, which takes an extra pass: ``chunks``
+        must then be a re-iterable (such as a list) or a callable returning a
+        fresh iterable. A one-shot iterator is fitted on its first chunk only.
+        """
+        if self.needs_fit:
+            if isinstance(chunks, Iterator):
+                logger.warning(
+                    "Fill values and outlier bounds are estimated on the first chunk of a one-shot iterator; "
+                    "pass fill_values and bounds, or a callable returning fresh chunks, to fit the whole stream"
+                )
+            else:
+                self.fit(chunks)
+        for chunk in chunks() if callable(chunks) else chunks:
+            cleaned = self.clean(chunk)
+            if cleaned and len(next(iter(cleaned.values()))):
+                yield cleaned
+        logger.info(f"Data cleaning completed: {self.summary()}")
+
+    def summary(self) -> str:
+        """Describe the counts in ``stats``."""
+        counts = ", ".join(f"{self.stats[key]} {key}" for key in ("nulls", "duplicates", "clipped"))
+        return f"kept {self.stats['kept']} of {self.stats['rows']} rows ({counts})"
+
+    def _coerce(self, name: str, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values)
+        kind = self.schema.get(name)
+        if values.dtype.kind == "U":
+            values = np.char.strip(values)
+            if kind is None:
+                return values
+            converted, actual = _convert_text(values, kind)
+            if actual != kind:
+                logger.warning(f"Column '{name}' does not fit {kind}; kept as {actual}")
+            return converted
+        if kind is None or kind == _kind(values):
+            return values
+        if kind == "str":
+            return values.astype(str)
+        if kind == "float":
+            return values.astype(np.float64)
+        if kind == "bool":
+            return values.astype(bool)
+        if values.dtype.kind == "f" and np.isfinite(values).all() and (values == np.round(values)).all():
+            return values.astype(np.int64)
+        logger.warning(f"Column '{name}' does not fit int; kept as {_kind(values)}")
+        return values
+
+    def _fit_sample(
+        self, columns: Mapping[str, np.ndarray], masks: Optional[Mapping[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Values of every column that fill values and bounds are estimated from.
+
+        Each column contributes its own non-null values, and only those of
+        rows that survive when incomplete rows are dropped.
+        """
+        masks = masks if masks is not None else {name: _null_mask(values) for name, values in columns.items()}
+        keep = np.ones(len(next(iter(columns.values()))) if columns else 0, dtype=bool)
+        if self.nulls == "drop":
+            for mask in masks.values():
+                keep &= ~mask
+        return {name: values[keep & ~masks[name]] for name, values in columns.items()}
+
+    def _pending(self, name: str) -> Tuple[bool, bool]:
+        """Whether the fill value and the outlier bounds of ``name`` are still to be estimated."""
+        targets = self.outlier_columns
+        fill = self.nulls == "fill" and name not in self.fill_values
+        bounds = self.outliers is not None and name not in self.bounds and (targets is None or name in targets)
+        return fill, bounds
+
+    def _estimate(
+        self,
+        name: str,
+        quantiles: Callable[[Sequence[float]], Sequence[float]],
+        moments: Callable[[], Tuple[float, float]],
+    ) -> None:
+        fill, bounds = self._pending(name)
+        if fill:
+            self.fill_values[name] = float(quantiles([0.5])[0])
+        if not bounds:
+            return
+        if self.outliers == "iqr":
+            low, high = quantiles([0.25, 0.75])
+            spread = (high - low) * self.threshold
+            self.bounds[name] = (float(low - spread), float(high + spread))
+        else:
+            mean, std = moments()
+            self.bounds[name] = (mean - self.threshold * std, mean + self.threshold * std)
+
+    def _fit(self, sample: Mapping[str, np.ndarray]) -> None:
+        """Estimate fill values and outlier bounds exactly from the valid values of one chunk."""
+        if not any(len(values) for values in sample.values()):
+            return
+        self._fitted = True
+        for name, values in sample.items():
+            if values.dtype.kind not in "if" or not len(values):
+                continue
+            self._estimate(
+                name,
+                lambda qs, values=values: np.percentile(values, [100 * q for q in qs]),
+                lambda values=values: (float(np.mean(values)), float(np.std(values))),
+            )
+
+
+def _kind(values: np.ndarray) -> str:
+    return {"i": "int", "u": "int", "f": "float", "b": "bool"}.get(values.dtype.kind, "str")
+
+
+def _null_mask(values: np.ndarray) -> np.ndarray:
+    """Mask of missing or invalid values: NaN, infinities and null-token strings."""
+    if values.dtype.kind == "f":
+        return ~np.isfinite(values)
+    if values.dtype.kind == "U":
+        return np.isin(values, NULL_TOKENS)
+    if values.dtype.kind == "O":
+        return np.array([value is None for value in values], dtype=bool)
+    return np.zeros(len(values), dtype=bool)
+
@@ -1,3 +1,74 @@
-def preprocess_data(data):
-    # Placeholder for data preprocessing logic
-    return data
+"""scripts.data_preprocessing
+
+One-call preprocessing of datasets through a fused scripts.dataflow.Dataflow.
+- Loading, cleaning, transformation and writing run chunk by chunk in a
+  single pass, instead of one full pass (and intermediate dataset) each
+- Chunks can be processed by a pool of worker processes
+"""
+
+from typing import Any, Callable, Iterator, Mapping, Optional, Union
+
+from core.utils import setup_logger
+
+from .cleaning import is_columnar
+from .dataflow import Dataflow
+
+
+logger = setup_logger(__name__)
+
+
+def preprocess_data(
+    data: Any,
+    clean: Optional[Mapping[str, Any]] = None,
+    transform: Any = None,
+    sink: Optional[Union[str, Callable]] = None,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    stream: bool = False,
+    chunk_size: Optional[int] = None,
+    **load_options: Any,
+) -> Any:
+    """Load, clean and transform a dataset in one fused pass.
+
+    Args:
+        data: Dataset file path, columnar dataset (dict of NumPy arrays),
+            iterable of column chunks, or callable returning a fresh one.
+            Any other data is returned unchanged.
+        clean: DataCleaner options, or None to skip cleaning.
+        transform: Transform Pipeline, step specs or saved pipeline path,
+            or None to skip transforming.
+        sink: ``.csv``/``.jsonl`` path or callable receiving every chunk.
+        workers: Worker processes for the per-chunk stages, or None.
+        ordered: Whether output chunks keep the source order.
+        stream: Return an iterator of processed chunks instead of columns.
+        chunk_size: Rows per chunk for files and in-memory columns.
+        **load_options: Reader options for file paths, such as ``cache_dir``
+            or ``columns``.
+
+    Returns:
+        Processed columns, an iterator of chunks when ``stream`` is True,
+        or the sink's summary when a sink is given.
+    """
+    sizes = {} if chunk_size is None else {"chunk_size": chunk_size}
+    if isinstance(data, str):
+        flow = Dataflow.load(data, **sizes, **load_options)
+    elif is_columnar(data):
+        flow = Dataflow.from_columns(data, **sizes)
+    elif callable(data) or isinstance(data, Iterator) or _is_chunk_list(data):
+        flow = Dataflow.from_chunks(data)
+    else:
+        logger.info("Input is not a dataset; returned unchanged")
+        return data
+
+    if clean is not None:
+        flow = flow.clean(**clean)
+    if transform is not None:
+        flow = flow.transform(transform)
+    flow = flow.parallel(workers, ordered=ordered)
+    if sink is not None:
+        return flow.sink(sink).run()
+    return iter(flow) if stream else flow.collect()
+
+
+def _is_chunk_list(data: Any) -> bool:
+    return isinstance(data, (list, tuple)) and bool(data) and all(is_columnar(chunk) for chunk in data)
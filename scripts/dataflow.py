@@ -0,0 +1,447 @@
+"""scripts.dataflow
+
+Lazy, fused preprocessing pipelines over chunked columnar datasets.
+- A Dataflow is built by chaining a source (``load``, ``from_columns`` or
+  ``from_chunks``) with ``clean``, ``transform`` and ``map`` stages and an
+  optional ``sink``; nothing runs until it is iterated, collected or run
+- Adjacent per-chunk stages are fused, so every chunk goes through all of
+  them in one pass and no stage materializes an intermediate dataset
+- Stages that need state from earlier chunks are split: the per-chunk part
+  of cleaning (coercion, nulls, row hashing, clipping) runs with the other
+  fused stages, and only the cross-chunk duplicate check runs in the parent
+- With ``parallel(workers)`` the fused stages run in a process pool over
+  independent chunks; results are returned in source order unless
+  ``ordered=False``
+- Cleaning fill values and outlier bounds, and unfitted transform pipelines,
+  are fitted first, with extra passes over the stages upstream of them
+"""
+
+import csv
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.utils import setup_logger
+from simulation.result_cache import json_default
+
+from .cleaning import DataCleaner
+from .dataset_cache import DatasetCache
+from .datasets import DEFAULT_CHUNK_SIZE, DatasetReader
+from .transforms import Pipeline
+
+
+logger = setup_logger(__name__)
+
+Columns = Dict[str, np.ndarray]
+ChunkFunction = Callable[[Columns], Any]
+
+
+def _rows(columns: Mapping[str, np.ndarray]) -> int:
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+class _Stage:
+    """One step of a dataflow, bound afresh for every pass over the data.
+
+    ``bind`` returns ``(work, finish)``: ``work`` is a per-chunk function
+    that may run in a worker process; ``finish``, if not None, runs in the
+    parent on ``work``'s output, in chunk order. A finish only drops rows,
+    so row-wise stages after it are fused into the same segment, before it.
+    """
+
+    name = "stage"
+    rowwise = False
+
+    def bind(self) -> Tuple[ChunkFunction, Optional[Callable[[Any], Columns]]]:
+        raise NotImplementedError
+
+    def ready(self) -> bool:
+        """Whether ``work`` no longer changes state, so it can be copied to workers."""
+        return True
+
+    def workers_copy(self, work: ChunkFunction) -> ChunkFunction:
+        """Picklable version of ``work`` to install in worker processes."""
+        return work
+
+
+class _CleanStage(_Stage):
+    name = "clean"
+
+    def __init__(self, options: Mapping[str, Any]):
+        self.options = dict(options)
+        self.cleaner: Optional[DataCleaner] = None
+        self.fitted = not DataCleaner(**dict(options, max_hashes=1)).needs_fit
+
+    def fit(self, source: Callable[[], Iterable[Columns]]) -> None:
+        """Estimate fill values and outlier bounds over every chunk, once for all passes."""
+        cleaner = DataCleaner(**dict(self.options, deduplicate=False)).fit(source)
+        self.options = dict(self.options, fill_values=cleaner.fill_values, bounds=cleaner.bounds)
+        self.fitted = True
+
+    def bind(self) -> Tuple[ChunkFunction, Optional[Callable[[Any], Columns]]]:
+        self.cleaner = DataCleaner(**self.options)
+        if self.fitted:
+            self.cleaner.finish_fit()
+        return self.cleaner.prepare, self.cleaner.accept
+
+    def ready(self) -> bool:
+        return self.cleaner is None or not self.cleaner.needs_fit
+
+    def workers_copy(self, work: ChunkFunction) -> ChunkFunction:
+        return self.cleaner.worker().prepare
+
+
+class _TransformStage(_Stage):
+    name = "transform"
+    rowwise = True
+
+    def __init__(self, pipeline: Union[Pipeline, str, Sequence[Mapping[str, Any]]]):
+        if isinstance(pipeline, str):
+            pipeline = Pipeline.load(pipeline)
+        self.pipeline = pipeline if isinstance(pipeline, Pipeline) else Pipeline(pipeline)
+
+    def bind(self) -> Tuple[ChunkFunction, Optional[Callable[[Any], Columns]]]:
+        return self.pipeline.transform, None
+
+
+class _MapStage(_Stage):
+    name = "map"
+
+    def __init__(self, function: Callable[[Columns], Columns], rowwise: bool):
+        self.function = function
+        self.rowwise = rowwise
+
+    def bind(self) -> Tuple[ChunkFunction, Optional[Callable[[Any], Columns]]]:
+        return self.function, None
+
+
+class _OnColumns:
+    """Applies a row-wise function to the columns of a prepared cleaning chunk."""
+
+    def __init__(self, function: ChunkFunction):
+        self.function = function
+
+    def __call__(self, prepared: Tuple) -> Tuple:
+        return (self.function(prepared[0]),) + tuple(prepared[1:])
+
+
+class _Fused:
+    """Per-chunk functions applied back to back in a single pass."""
+
+    def __init__(self, functions: Sequence[ChunkFunction]):
+        self.functions = list(functions)
+
+    def __call__(self, chunk: Any) -> Any:
+        for function in self.functions:
+            if isinstance(chunk, Mapping) and not _rows(chunk):
+                return None
+            chunk = function(chunk)
+        return chunk
+
+
+class _Segment:
+    """Fused work of consecutive stages, plus the parent-side finish of one of them."""
+
+    def __init__(self) -> None:
+        self.stages: List[_Stage] = []
+        self.works: List[ChunkFunction] = []
+        self.finish: Optional[Callable[[Any], Columns]] = None
+
+    def fused(self) -> _Fused:
+        return _Fused(self.works)
+
+    def workers_fused(self) -> _Fused:
+        return _Fused([stage.workers_copy(work) for stage, work in zip(self.stages, self.works)])
+
+
+# Fused segments installed in each worker process by _install.
+_SEGMENTS: List[_Fused] = []
+
+
+def _install(segments: List[_Fused]) -> None:
+    _SEGMENTS[:] = segments
+
+
+def _run_segment(index: int, chunk: Columns) -> Any:
+    return _SEGMENTS[index](chunk)
+
+
+class _Sink:
+    """Writes chunks in order to a callable or a ``.csv``/``.jsonl`` file."""
+
+    def __init__(self, target: Union[str, Callable[[Columns], Any]]):
+        self.target = target
+        if isinstance(target, str) and not target.lower().endswith((".csv", ".jsonl", ".ndjson")):
+            raise ValueError(f"Unsupported sink {target!r}; use a .csv or .jsonl path or a callable")
+
+    def write(self, chunks: Iterable[Columns]) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"chunks": 0, "rows": 0}
+        if callable(self.target):
+            for chunk in chunks:
+                self.target(chunk)
+                summary["chunks"] += 1
+                summary["rows"] += _rows(chunk)
+            return summary
+        summary["output"] = self.target
+        with open(self.target, "w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle) if self.target.lower().endswith(".csv") else None
+            for chunk in chunks:
+                values = [column.tolist() for column in chunk.values()]
+                if writer is not None:
+                    if not summary["chunks"]:
+                        writer.writerow(list(chunk))
+                    writer.writerows(zip(*values))
+                else:
+                    names = list(chunk)
+                    handle.writelines(
+                        json.dumps(dict(zip(names, row)), default=json_default) + "\n" for row in zip(*values)
+                    )
+                summary["chunks"] += 1
+                summary["rows"] += _rows(chunk)
+        return summary
+
+
+class Dataflow:
+    """Lazy builder of a chunked load -> clean -> transform -> sink pipeline.
+
+    Every builder method returns a new Dataflow, so partial flows can be
+    shared and extended. Example::
+
+        flow = (Dataflow.load("data.csv", cache_dir=".cache")
+                .clean(outliers="iqr")
+                .transform([{"type": "standard_scaler"}])
+                .parallel(4)
+                .sink("clean.jsonl"))
+        summary = flow.run()
+
+    Attributes:
+        workers: Worker processes for the fused stages, or None to run them
+            in this process.
+        ordered: Whether chunks keep their source order.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Iterable[Columns]],
+        stages: Sequence[_Stage] = (),
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        target: Optional[_Sink] = None,
+        repeatable: bool = True,
+    ):
+        self._source = source
+        self._stages = list(stages)
+        self.workers = workers
+        self.ordered = ordered
+        self._sink = target
+        self._repeatable = repeatable
+
+    # Sources
+
+    @classmethod
+    def load(cls, path: str, cache_dir: Optional[str] = None, **options: Any) -> "Dataflow":
+        """Read a dataset file in chunks; see :class:`scripts.datasets.DatasetReader`.
+
+        With ``cache_dir`` the parsed columns come from (or go to) the
+        :class:`scripts.dataset_cache.DatasetCache`.
+        """
+        if cache_dir:
+            cache = DatasetCache(cache_dir)
+            return cls(lambda: cache.iter_chunks(path, **options))
+        DatasetReader(path, **options)
+        return cls(lambda: iter(DatasetReader(path, **options)))
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray], chunk_size: int = DEFAULT_CHUNK_SIZE) -> "Dataflow":
+        """Process an in-memory columnar dataset in chunks of ``chunk_size`` rows."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        rows = _rows(columns)
+
+        def chunks() -> Iterator[Columns]:
+            for start in range(0, rows, chunk_size):
+                yield {name: values[start:start + chunk_size] for name, values in columns.items()}
+
+        return cls(chunks)
+
+    @classmethod
+    def from_chunks(cls, chunks: Union[Iterable[Columns], Callable[[], Iterable[Columns]]]) -> "Dataflow":
+        """Process chunks from an iterable or a callable returning a fresh iterable.
+
+        A one-shot iterator can only be read once, so it cannot feed the
+        extra passes needed to fit transform pipelines.
+        """
+        if callable(chunks):
+            return cls(chunks)
+        if isinstance(chunks, Iterator):
+            return cls(lambda: chunks, repeatable=False)
+        return cls(lambda: iter(chunks))
+
+    # Stages
+
+    def _with(self, **changes: Any) -> "Dataflow":
+        state = {"source": self._source, "stages": self._stages, "workers": self.workers, "ordered": self.ordered,
+                 "target": self._sink, "repeatable": self._repeatable}
+        state.update(changes)
+        return Dataflow(**state)
+
+    def clean(self, **options: Any) -> "Dataflow":
+        """Add a cleaning stage; see :class:`scripts.cleaning.DataCleaner` for the options."""
+        return self._with(stages=self._stages + [_CleanStage(options)])
+
+    def transform(self, pipeline: Union[Pipeline, str, Sequence[Mapping[str, Any]]]) -> "Dataflow":
+        """Add a transform stage from a Pipeline, step specs or a saved pipeline path.
+
+        An unfitted pipeline is fitted (in place) when the flow first runs.
+        """
+        return self._with(stages=self._stages + [_TransformStage(pipeline)])
+
+    def map(self, function: Callable[[Columns], Columns], rowwise: bool = False) -> "Dataflow":
+        """Add a per-chunk function; it must be picklable to run in parallel.
+
+        Pass ``rowwise=True`` when the function maps every row independently
+        (same rows, same order), so it can be fused ahead of duplicate removal.
+        """
+        return self._with(stages=self._stages + [_MapStage(function, rowwise)])
+
+    def parallel(self, workers: Optional[int], ordered: bool = True) -> "Dataflow":
+        """Run the fused stages in ``workers`` processes (None or 1: in this process)."""
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1.")
+        return self._with(workers=workers, ordered=ordered)
+
+    def sink(self, target: Union[str, Callable[[Columns], Any]]) -> "Dataflow":
+        """Send results to a callable or a ``.csv``/``.jsonl`` file when the flow runs."""
+        return self._with(target=_Sink(target))
+
+    # Execution
+
+    def _segments(self, stages: Sequence[_Stage]) -> List[_Segment]:
+        """Bind the stages and fuse them into segments that each end with at most one finish."""
+        segments = [_Segment()]
+        for stage in stages:
+            work, finish = stage.bind()
+            segment = segments[-1]
+            if segment.finish is not None:
+                if stage.rowwise:
+                    # Dropping rows commutes with a row-wise stage, so it joins the fused work.
+                    segment.stages.append(stage)
+                    segment.works.append(_OnColumns(work))
+                    continue
+                segment = _Segment()
+                segments.append(segment)
+            segment.stages.append(stage)
+            segment.works.append(work)
+            segment.finish = finish
+        return [segment for segment in segments if segment.works]
+
+    def _fit_stages(self) -> None:
+        for index, stage in enumerate(self._stages):
+            upstream = self._with(stages=self._stages[:index], target=None)
+            if isinstance(stage, _CleanStage) and not stage.fitted:
+                if self._repeatable:
+                    stage.fit(lambda: iter(upstream))
+                else:
+                    logger.warning("A one-shot source can only fit cleaning on its first chunk; "
+                                   "pass a callable to from_chunks to fit on every chunk")
+                continue
+            if not isinstance(stage, _TransformStage) or stage.pipeline.fitted:
+                continue
+            if not self._repeatable:
+                raise ValueError("Fitting a transform needs a repeatable source; pass a callable to from_chunks")
+            stage.pipeline.fit(lambda: iter(upstream))
+
+    @staticmethod
+    def _serial(chunks: Iterable[Columns], segments: Sequence[_Segment]) -> Iterator[Columns]:
+        """Run every segment in this process, one chunk at a time."""
+        fused = [(segment.fused(), segment.finish) for segment in segments]
+        for chunk in chunks:
+            for work, finish in fused:
+                chunk = work(chunk)
+                if chunk is not None and finish is not None:
+                    chunk = finish(chunk)
+                if chunk is None or not _rows(chunk):
+                    break
+            else:
+                yield chunk
+
+    def _parallel(self, pool: ProcessPoolExecutor, index: int, chunks: Iterable[Any],
+                  finish: Optional[Callable[[Any], Columns]]) -> Iterator[Columns]:
+        """Run segment ``index`` in the pool with a bounded window of chunks in flight."""
+        window = 2 * self.workers
+        pending: Dict[Any, int] = {}
+        done_chunks: Dict[int, Any] = {}
+        submitted = emitted = 0
+        source = iter(chunks)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                chunk = next(source, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(_run_segment, index, chunk)] = submitted
+                submitted += 1
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                done_chunks[pending.pop(future)] = future.result()
+            ready = sorted(done_chunks) if not self.ordered else []
+            while self.ordered and emitted in done_chunks:
+                ready.append(emitted)
+                emitted += 1
+            for position in ready:
+                result = done_chunks.pop(position)
+                if result is not None and finish is not None:
+                    result = finish(result)
+                if result is not None and _rows(result):
+                    yield result
+
+    def __iter__(self) -> Iterator[Columns]:
+        """Run the flow lazily, yielding processed chunks."""
+        self._fit_stages()
+        segments = self._segments(self._stages)
+        chunks = iter(self._source())
+        if not self.workers or self.workers == 1 or not segments:
+            yield from self._serial(chunks, segments)
+            return
+
+        # Chunks go through this process until stateful stages have fitted,
+        # so every worker gets the same fitted copies.
+        while not all(stage.ready() for segment in segments for stage in segment.stages):
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield from self._serial([chunk], segments)
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_install, initargs=([s.workers_fused() for s in segments],)
+        ) as pool:
+            stream: Iterable[Any] = chunks
+            for index, segment in enumerate(segments):
+                stream = self._parallel(pool, index, stream, segment.finish)
+            yield from stream
+
+    def collect(self) -> Columns:
+        """Run the flow and concatenate the processed chunks into columns."""
+        parts: Dict[str, List[np.ndarray]] = {}
+        for chunk in self:
+            for name, values in chunk.items():
+                parts.setdefault(name, []).append(values)
+        return {name: np.concatenate(pieces) for name, pieces in parts.items()}
+
+    def run(self) -> Union[Columns, Dict[str, Any]]:
+        """Run the flow: write to the sink and return its summary, or collect the columns."""
+        if self._sink is None:
+            return self.collect()
+        summary = self._sink.write(self)
+        logger.info(f"Dataflow wrote {summary['rows']} rows in {summary['chunks']} chunks")
+        return summary
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Counts of the cleaning stages from the latest run."""
+        return [dict(stage.cleaner.stats) for stage in self._stages
+                if isinstance(stage, _CleanStage) and stage.cleaner is not None]
@@ -0,0 +1,215 @@
+"""scripts.dataset_cache
+
+Binary columnar cache for parsed external datasets.
+- Each parsed dataset is stored as one ``.npy`` file per column plus a
+  ``manifest.json`` in a directory named after the source path, the parse
+  options and the source file's size and modification time
+- Later loads memory-map the column files, so a cached dataset is available
+  without parsing or copying; chunked reads slice the memory maps
+- When the source changes its size or mtime no longer match, the dataset is
+  reparsed and the stale entry for that source is removed
+- Entries are built from the streaming reader in a temporary directory and
+  renamed into place when complete, so memory stays bounded by the chunk size
+  and concurrent loaders never see a partial entry
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.utils import setup_logger
+from simulation.result_cache import stable_hash
+
+from .datasets import DEFAULT_CHUNK_SIZE, DatasetReader
+
+
+logger = setup_logger(__name__)
+
+# Bump whenever the parser or the on-disk layout changes so old entries are rebuilt.
+CACHE_VERSION = "1"
+# Reader options that change the parsed columns; chunking options do not.
+_PARSE_OPTIONS = ("columns", "schema", "sample_size", "format", "delimiter", "encoding")
+_MANIFEST = "manifest.json"
+
+
+class DatasetCache:
+    """Memory-mapped ``.npy`` cache of datasets parsed by :class:`DatasetReader`.
+
+    Attributes:
+        cache_dir: Directory holding one subdirectory per cached dataset.
+    """
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Cache directory (created if needed).
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "rebuilds": 0}
+
+    @staticmethod
+    def _source_key(path: str, options: Dict[str, Any]) -> str:
+        parse = {name: options[name] for name in _PARSE_OPTIONS if options.get(name) is not None}
+        return stable_hash({"path": os.path.abspath(path), "options": parse, "version": CACHE_VERSION})[:24]
+
+    def entry_path(self, path: str, **options: Any) -> str:
+        """Return the entry directory for the current version of ``path``.
+
+        The name combines a key of the source path and parse options with a
+        key of the file's size and modification time, so any change to the
+        source maps to a different entry.
+        """
+        stat = os.stat(path)
+        version = stable_hash([stat.st_size, stat.st_mtime_ns])[:16]
+        return os.path.join(self.cache_dir, f"{self._source_key(path, options)}-{version}")
+
+    def _lookup(self, path: str, options: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        entry = self.entry_path(path, **options)
+        manifest = self._manifest(entry)
+        with self._lock:
+            self._stats["hits" if manifest is not None else "misses"] += 1
+        return entry, manifest
+
+    def load(self, path: str, **options: Any) -> Dict[str, np.ndarray]:
+        """Return every column of a dataset, parsing it only on a cache miss.
+
+        Args:
+            path (str): Source dataset file.
+            **options: :class:`DatasetReader` options.
+
+        Returns:
+            Dict[str, np.ndarray]: Read-only memory-mapped columns.
+        """
+        entry, manifest = self._lookup(path, options)
+        if manifest is None:
+            for _ in self._build(path, entry, options):
+                pass
+            manifest = self._manifest(entry)
+            if manifest is None:
+                # The source changed while it was parsed; nothing was published.
+                return DatasetReader(path, **options).read()
+        return self._columns(entry, manifest)
+
+    def iter_chunks(
+        self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, **options: Any
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Iterate a dataset in ``{column: array}`` chunks of ``chunk_size`` rows.
+
+        Cached datasets are served as slices of the memory-mapped columns;
+        otherwise chunks are streamed from the parser while the entry is built.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        entry, manifest = self._lookup(path, options)
+        if manifest is None:
+            return self._build(path, entry, dict(options, chunk_size=chunk_size))
+        return self._slices(self._columns(entry, manifest), manifest["rows"], chunk_size)
+
+    @staticmethod
+    def _slices(columns: Dict[str, np.ndarray], rows: int, chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+        for start in range(0, rows, chunk_size):
+            yield {name: values[start:start + chunk_size] for name, values in columns.items()}
+
+    @staticmethod
+    def _manifest(entry: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(entry, _MANIFEST), "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _columns(entry: str, manifest: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        return {
+            name: np.load(os.path.join(entry, f"{index}.npy"), mmap_mode="r", allow_pickle=False)
+            for index, name in enumerate(manifest["names"])
+        }
+
+    def _build(self, path: str, entry: str, options: Dict[str, Any]) -> Iterator[Dict[str, np.ndarray]]:
+        """Stream chunks from the parser while writing them to a new entry."""
+        before = os.stat(path)
+        reader = DatasetReader(path, **options)
+        work = tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            parts: List[int] = []
+            for number, chunk in enumerate(reader):
+                for index, values in enumerate(chunk.values()):
+                    np.save(os.path.join(work, f"{index}.{number}.part.npy"), values, allow_pickle=False)
+                parts.append(len(next(iter(chunk.values()))) if chunk else 0)
+                yield chunk
+            names = list(reader.names or [])
+            for index, name in enumerate(names):
+                self._consolidate(work, index, len(parts), reader.schema.get(name, "str"))
+            after = os.stat(path)
+            if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+                logger.warning(f"{path} changed while it was parsed; not caching it")
+                return
+            manifest = {"source": os.path.abspath(path), "size": before.st_size, "mtime_ns": before.st_mtime_ns,
+                        "rows": sum(parts), "names": names, "schema": {name: reader.schema.get(name) for name in names}}
+            with open(os.path.join(work, _MANIFEST), "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle)
+            try:
+                os.rename(work, entry)
+            except OSError:
+                # Another process published the same entry first.
+                return
+            self._prune(entry)
+            logger.info(f"Cached {manifest['rows']} rows of {path} in {entry}")
+        finally:
+            if os.path.isdir(work):
+                shutil.rmtree(work, ignore_errors=True)
+
+    @staticmethod
+    def _consolidate(work: str, index: int, count: int, kind: str) -> None:
+        """Concatenate a column's chunk files into one ``.npy`` file, chunk by chunk."""
+        part_paths = [os.path.join(work, f"{index}.{number}.part.npy") for number in range(count)]
+        pieces = [np.load(part, mmap_mode="r", allow_pickle=False) for part in part_paths]
+        target = os.path.join(work, f"{index}.npy")
+        if not pieces:
+            empty = {"int": np.int64, "float": np.float64, "bool": bool}.get(kind, str)
+            np.save(target, np.empty(0, dtype=empty), allow_pickle=False)
+            return
+        if any(piece.dtype.kind == "U" for piece in pieces):
+            # The column was promoted to text part-way through.
+            width = max(np.asarray(piece).astype(str).dtype.itemsize // 4 for piece in pieces)
+            dtype = np.dtype(f"<U{max(width, 1)}")
+        else:
+            dtype = np.result_type(*pieces)
+        rows = sum(len(piece) for piece in pieces)
+        out = np.lib.format.open_memmap(target, mode="w+", dtype=dtype, shape=(rows,))
+        offset = 0
+        for piece in pieces:
+            out[offset:offset + len(piece)] = piece.astype(str) if dtype.kind == "U" else piece
+            offset += len(piece)
+        out.flush()
+        del out, pieces
+        for part in part_paths:
+            os.remove(part)
+
+    def _prune(self, entry: str) -> None:
+        """Remove older entries of the same source and options."""
+        prefix = os.path.basename(entry).split("-")[0] + "-"
+        for item in os.scandir(self.cache_dir):
+            if item.name.startswith(prefix) and item.path != entry and item.is_dir():
+                shutil.rmtree(item.path, ignore_errors=True)
+                with self._lock:
+                    self._stats["rebuilds"] += 1
+
+    def clear(self) -> None:
+        """Remove every cached dataset."""
+        for item in os.scandir(self.cache_dir):
+            if item.is_dir():
+                shutil.rmtree(item.path, ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and rebuild counters."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,442 @@
+"""scripts.datasets
+
+Streaming loaders for external CSV, JSON-lines, JSON and YAML datasets.
+- Files are read in fixed-size chunks of rows, each a ``{column: array}``
+  dict of typed NumPy columns, so memory is bounded by the chunk size
+- CSV files are memory-mapped and cut into newline-aligned byte blocks that
+  are parsed with the csv module; JSON arrays are decoded element by element
+- Column types (int, float, bool, str) are inferred from a sample of rows;
+  a later value that does not fit promotes the column (int -> float -> str)
+- ``iter_chunks`` is the iterator API, ``load_columns`` the bulk API
+"""
+
+import csv
+import io
+import json
+import mmap
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.utils import setup_logger
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+
+logger = setup_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 65_536
+DEFAULT_SAMPLE_SIZE = 1_000
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+KINDS = ("int", "float", "bool", "str")
+NULL_TOKENS = ("", "NA", "N/A", "na", "n/a", "NaN", "nan", "NAN", "NULL", "null", "Null", "None", "none")
+TRUE_TOKENS = ("true", "t", "yes", "y")
+FALSE_TOKENS = ("false", "f", "no", "n")
+# Bytes of CSV parsed per block; blocks are cut at newlines.
+_BLOCK_BYTES = 8 << 20
+_READ_BYTES = 1 << 20
+
+
+def dataset_format(path: str) -> str:
+    """Return the dataset format for a path's extension, or raise ValueError."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported dataset format {extension!r}; use one of {sorted(FORMATS)}")
+    return FORMATS[extension]
+
+
+def _csv_blocks(path: str, delimiter: str, encoding: str, block_bytes: int) -> Iterator[List[List[str]]]:
+    """Yield the rows of newline-aligned blocks of a memory-mapped CSV file."""
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            start = 0
+            if view[:3] == b"\xef\xbb\xbf":
+                start = 3
+            while start < size:
+                end = min(size, start + block_bytes)
+                if end < size:
+                    cut = view.rfind(b"\n", start, end)
+                    end = cut + 1 if cut >= start else _line_end(view, end, size)
+                    # A quoted field may contain newlines; keep the quotes balanced.
+                    while view[start:end].count(b'"') % 2 and end < size:
+                        end = _line_end(view, end, size)
+                block = view[start:end].decode(encoding)
+                rows = [row for row in csv.reader(io.StringIO(block, newline=""), delimiter=delimiter) if row]
+                if rows:
+                    yield rows
+                start = end
+
+
+def _line_end(view: mmap.mmap, position: int, size: int) -> int:
+    newline = view.find(b"\n", position)
+    return size if newline == -1 else newline + 1
+
+
+def _json_array(path: str, encoding: str) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding=encoding) as handle:
+        buffer = handle.read(_READ_BYTES).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError("Not a JSON array")
+        position, exhausted = 1, False
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            if position < len(buffer):
+                try:
+                    value, position = decoder.raw_decode(buffer, position)
+                    yield value
+                    continue
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise
+            elif exhausted:
+                raise ValueError("Unterminated JSON array")
+            # The next element is incomplete: drop what was consumed and read more.
+            more = handle.read(_READ_BYTES)
+            exhausted = not more
+            buffer, position = buffer[position:] + more, 0
+
+
+def _record_batches(path: str, fmt: str, encoding: str, batch: int) -> Iterator[Tuple[Optional[List[str]], List[Any]]]:
+    """Yield ``(columns, records)`` batches of JSON-lines, JSON or YAML data.
+
+    ``columns`` is set when the file holds a dict of equal-length column
+    lists, in which case the records are rows of values in that order.
+    """
+    if fmt == "jsonl":
+        records: List[Any] = []
+        with open(path, "r", encoding=encoding) as handle:
+            for line in handle:
+                if line.strip():
+                    records.append(json.loads(line))
+                    if len(records) >= batch:
+                        yield None, records
+                        records = []
+        if records:
+            yield None, records
+        return
+
+    if fmt == "json":
+        with open(path, "r", encoding=encoding) as handle:
+            is_array = handle.read(_READ_BYTES).lstrip().startswith("[")
+        if is_array:
+            documents: Iterable[Any] = [_json_array(path, encoding)]
+        else:
+            with open(path, "r", encoding=encoding) as handle:
+                documents = [json.load(handle)]
+    else:
+        if yaml is None:
+            raise ImportError("PyYAML is required to load YAML datasets")
+        handle = open(path, "r", encoding=encoding)
+        documents = _closing(handle, yaml.safe_load_all(handle))
+
+    for document in documents:
+        if isinstance(document, Mapping) and document and all(isinstance(v, list) for v in document.values()):
+            columns = list(document)
+            length = min(len(values) for values in document.values())
+            for start in range(0, length, batch):
+                stop = min(length, start + batch)
+                yield columns, list(zip(*(document[name][start:stop] for name in columns)))
+            continue
+        items = iter([document]) if isinstance(document, Mapping) or not _is_iterable(document) else iter(document)
+        records = []
+        for record in items:
+            records.append(record)
+            if len(records) >= batch:
+                yield None, records
+                records = []
+        if records:
+            yield None, records
+
+
+def _closing(handle: io.TextIOBase, documents: Iterable[Any]) -> Iterator[Any]:
+    with handle:
+        yield from documents
+
+
+def _is_iterable(value: Any) -> bool:
+    return isinstance(value, (list, tuple)) or (hasattr(value, "__iter__") and hasattr(value, "__next__"))
+
+
+def _infer_text(values: np.ndarray) -> str:
+    """Infer the kind of a column of strings."""
+    nulls = np.isin(values, NULL_TOKENS)
+    present = np.char.strip(values[~nulls])
+    if present.size == 0:
+        return "str"
+    try:
+        present.astype(np.int64)
+        return "float" if nulls.any() else "int"
+    except (ValueError, OverflowError):
+        pass
+    try:
+        present.astype(np.float64)
+        return "float"
+    except ValueError:
+        pass
+    lowered = np.char.lower(present)
+    if not nulls.any() and np.isin(lowered, TRUE_TOKENS + FALSE_TOKENS).all():
+        return "bool"
+    return "str"
+
+
+def _convert_text(values: np.ndarray, kind: str) -> Tuple[np.ndarray, str]:
+    """Convert a column of strings to ``kind``, promoting it when values do not fit."""
+    nulls = np.isin(values, NULL_TOKENS)
+    if kind == "int":
+        if not nulls.any():
+            try:
+                return np.char.strip(values).astype(np.int64), "int"
+            except (ValueError, OverflowError):
+                pass
+        kind = "float"
+    if kind == "float":
+        try:
+            return np.where(nulls, "nan", np.char.strip(values)).astype(np.float64), "float"
+        except ValueError:
+            kind = "str"
+    if kind == "bool":
+        lowered = np.char.lower(np.char.strip(values))
+        truthy = np.isin(lowered, TRUE_TOKENS)
+        if (truthy | np.isin(lowered, FALSE_TOKENS)).all():
+            return truthy, "bool"
+        kind = "str"
+    return np.where(nulls, "", values), "str"
+
+
+def _infer_values(values: Sequence[Any]) -> str:
+    """Infer the kind of a column of parsed JSON/YAML values."""
+    present = [value for value in values if value is not None]
+    if not present:
+        return "str"
+    if all(isinstance(value, bool) for value in present):
+        return "bool" if len(present) == len(values) else "str"
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "int" if len(present) == len(values) else "float"
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "float"
+    return "str"
+
+
+def _convert_values(values: Sequence[Any], kind: str) -> Tuple[np.ndarray, str]:
+    """Convert parsed values to ``kind``, promoting the column when values do not fit."""
+    if all(value is None for value in values):
+        # All nulls fit any kind that can represent them.
+        kind = {"int": "float", "bool": "str"}.get(kind, kind)
+    else:
+        actual = _infer_values(values)
+        if actual != kind and not (kind == "float" and actual == "int"):
+            kind = _promote(kind, actual)
+    if kind == "int":
+        return np.array(values, dtype=np.int64), "int"
+    if kind == "float":
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64), "float"
+    if kind == "bool":
+        return np.array(values, dtype=bool), "bool"
+    text = ["" if value is None else value if isinstance(value, str) else json.dumps(value) for value in values]
+    return np.array(text, dtype=str), "str"
+
+
+def _promote(kind: str, other: str) -> str:
+    """Smallest kind holding both ``kind`` and ``other`` values."""
+    if kind == other:
+        return kind
+    if {kind, other} <= {"int", "float"}:
+        return "float"
+    return "str"
+
+
+class DatasetReader:
+    """Chunked reader of one external dataset.
+
+    Iterating yields ``{column: np.ndarray}`` chunks of ``chunk_size`` rows
+    (the last may be shorter); :meth:`read` concatenates them. The schema is
+    inferred from the first ``sample_size`` rows unless given.
+
+    Attributes:
+        path: Dataset file.
+        format: ``"csv"``, ``"jsonl"``, ``"json"`` or ``"yaml"``.
+        schema: ``{column: kind}`` once known; kinds may be promoted while
+            reading.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        columns: Optional[Sequence[str]] = None,
+        schema: Optional[Mapping[str, str]] = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        format: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        encoding: str = "utf-8",
+        block_bytes: int = _BLOCK_BYTES,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        unknown = sorted(set((schema or {}).values()) - set(KINDS))
+        if unknown:
+            raise ValueError(f"Unknown column kinds {unknown}; use {KINDS}")
+        self.path = path
+        self.format = format or dataset_format(path)
+        self.chunk_size = chunk_size
+        self.columns = list(columns) if columns is not None else None
+        self.schema: Dict[str, str] = dict(schema or {})
+        self.sample_size = max(1, sample_size)
+        self.delimiter = delimiter or ("\t" if path.lower().endswith(".tsv") else ",")
+        self.encoding = encoding
+        self.block_bytes = block_bytes
+        self.names: Optional[List[str]] = list(columns) if columns is not None else None
+
+    def __iter__(self) -> Iterator[Dict[str, np.ndarray]]:
+        if self.format == "csv":
+            return self._iter_csv()
+        return self._iter_records()
+
+    def read(self) -> Dict[str, np.ndarray]:
+        """Load the whole dataset as one array per column."""
+        parts: Dict[str, List[np.ndarray]] = {}
+        for chunk in self:
+            for name, values in chunk.items():
+                parts.setdefault(name, []).append(values)
+        columns = {}
+        for name in list(parts):
+            pieces = parts.pop(name)
+            if any(piece.dtype.kind == "U" for piece in pieces) and not all(p.dtype.kind == "U" for p in pieces):
+                # The column was promoted to text part-way through.
+                pieces = [piece.astype(str) for piece in pieces]
+            columns[name] = np.concatenate(pieces)
+        if not columns:
+            for name in self.names or []:
+                columns[name] = np.empty(0, dtype=_EMPTY_DTYPES[self.schema.get(name, "str")])
+        return columns
+
+    def _selected(self, header: Sequence[str]) -> List[str]:
+        if self.columns is None:
+            return list(header)
+        missing = [name for name in self.columns if name not in header]
+        if missing:
+            raise KeyError(f"Columns not in dataset: {missing}")
+        return list(self.columns)
+
+    def _iter_csv(self) -> Iterator[Dict[str, np.ndarray]]:
+        header: List[str] = []
+        pending: List[List[str]] = []
+        inferred = False
+        for rows in _csv_blocks(self.path, self.delimiter, self.encoding, self.block_bytes):
+            if not header:
+                header, rows = [name.strip() for name in rows[0]], rows[1:]
+                self.names = self._selected(header)
+                positions = [header.index(name) for name in self.names]
+            pending.extend(rows)
+            if not inferred:
+                if len(pending) < self.sample_size:
+                    continue
+                self._infer_csv(pending, len(header), positions)
+                inferred = True
+            start = 0
+            while len(pending) - start >= self.chunk_size:
+                yield self._text_chunk(pending[start:start + self.chunk_size], len(header), positions)
+                start += self.chunk_size
+            del pending[:start]
+        if pending and not inferred:
+            self._infer_csv(pending, len(header), positions)
+        for start in range(0, len(pending), self.chunk_size):
+            yield self._text_chunk(pending[start:start + self.chunk_size], len(header), positions)
+
+    def _table(self, rows: List[List[str]], width: int) -> np.ndarray:
+        ragged = sum(len(row) != width for row in rows)
+        if ragged:
+            logger.warning(f"{ragged} rows of {self.path} do not have {width} fields; padding or truncating")
+            rows = [row if len(row) == width else (row + [""] * width)[:width] for row in rows]
+        return np.array(rows, dtype=str).reshape(len(rows), width)
+
+    def _infer_csv(self, rows: List[List[str]], width: int, positions: List[int]) -> None:
+        sample = self._table(rows[: self.sample_size], width)
+        for name, position in zip(self.names, positions):
+            self.schema.setdefault(name, _infer_text(sample[:, position]))
+
+    def _text_chunk(self, rows: List[List[str]], width: int, positions: List[int]) -> Dict[str, np.ndarray]:
+        table = self._table(rows, width)
+        chunk = {}
+        for name, position in zip(self.names, positions):
+            chunk[name], kind = _convert_text(table[:, position], self.schema[name])
+            self._note_promotion(name, kind)
+        return chunk
+
+    def _iter_records(self) -> Iterator[Dict[str, np.ndarray]]:
+        pending: List[Mapping[str, Any]] = []
+        inferred = False
+        for columns, records in _record_batches(self.path, self.format, self.encoding, self.chunk_size):
+            if columns is not None:
+                pending.extend(dict(zip(columns, values)) for values in records)
+            else:
+                pending.extend(record if isinstance(record, Mapping) else {"value": record} for record in records)
+            if not inferred:
+                if len(pending) < self.sample_size:
+                    continue
+                self._infer_records(pending)
+                inferred = True
+            start = 0
+            while len(pending) - start >= self.chunk_size:
+                yield self._record_chunk(pending[start:start + self.chunk_size])
+                start += self.chunk_size
+            del pending[:start]
+        if pending and not inferred:
+            self._infer_records(pending)
+        for start in range(0, len(pending), self.chunk_size):
+            yield self._record_chunk(pending[start:start + self.chunk_size])
+
+    def _infer_records(self, records: List[Mapping[str, Any]]) -> None:
+        sample = records[: self.sample_size]
+        names: Dict[str, None] = {}
+        for record in sample:
+            names.update(dict.fromkeys(record))
+        self.names = self._selected(list(names))
+        for name in self.names:
+            self.schema.setdefault(name, _infer_values([record.get(name) for record in sample]))
+
+    def _record_chunk(self, records: List[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+        chunk = {}
+        for name in self.names:
+            values = [record.get(name) for record in records]
+            chunk[name], kind = _convert_values(values, self.schema[name])
+            self._note_promotion(name, kind)
+        return chunk
+
+    def _note_promotion(self, name: str, kind: str) -> None:
+        if kind != self.schema[name]:
+            logger.warning(f"Column '{name}' of {self.path} promoted from {self.schema[name]} to {kind}")
+            self.schema[name] = kind
+
+
+_EMPTY_DTYPES = {"int": np.int64, "float": np.float64, "bool": bool, "str": str}
+
+
+def iter_chunks(path: str, **options: Any) -> Iterator[Dict[str, np.ndarray]]:
+    """Iterate a dataset in ``{column: array}`` chunks; see :class:`DatasetReader`."""
+    return iter(DatasetReader(path, **options))
+
+
+def load_columns(path: str, **options: Any) -> Dict[str, np.ndarray]:
+    """Load a whole dataset as NumPy columns; see :class:`DatasetReader`."""
+    return DatasetReader(path, **options).read()
@@ -4,119 +4,190 @@ Preprocessing utilities for simulations and innovation modules.
 
 This module provides data cleaning, transformation, and loading utilities
 for preparing datasets for simulation or material discovery workflows.
+Datasets are loaded as typed NumPy columns by the streaming readers in
+scripts.datasets.
 """
 
+import itertools
 import logging
-from typing import Any
+import os
+from typing import Any, Iterator, Optional
 from core.utils import setup_logger, handle_error
+from .cleaning import DataCleaner, is_columnar
+from .dataset_cache import DatasetCache
+from .datasets import DatasetReader
+from .transforms import Pipeline
 
 
 logger = setup_logger(__name__)
 
 
-def clean_data(data: Any) -> Any:
+def clean_data(data: Any, **options: Any) -> Any:
     """Clean and standardize data for simulation or material discovery.
     
-    This is a placeholder function that will be extended to perform
-    comprehensive data cleaning operations such as:
-    - Removing null or invalid values
-    - Standardizing data formats
-    - Removing duplicates
-    - Handling outliers
+    Columnar data (a dict of equal-length NumPy arrays, as returned by
+    :func:`load_external_dataset`) is cleaned with vectorized operations:
+    - Coercing columns to a schema of kinds and stripping text
+    - Dropping or filling null and invalid values
+    - Removing duplicate rows, found by 64-bit row hashes
+    - Clipping outliers to IQR or z-score bounds
+    
+    An iterator of column chunks (``load_external_dataset(..., stream=True)``)
+    or a callable returning one is cleaned lazily, chunk by chunk; duplicates
+    are also removed across chunks through a bounded set of row hashes. Fill
+    values and outlier bounds are estimated over the whole stream when it
+    comes from a callable, and on the first chunk of a plain iterator. See
+    :class:`scripts.cleaning.DataCleaner` for the details.
     
     Args:
-        data: Input data to be cleaned. Can be any data structure
-              (dict, list, DataFrame, etc.).
+        data: Columnar dataset, iterator of chunks or callable returning
+              a fresh iterator of chunks. Any other data structure is
+              returned unchanged.
+        **options: DataCleaner options such as ``schema``, ``nulls``
+                   (``"drop"``, ``"fill"`` or ``"keep"``), ``deduplicate``,
+                   ``outliers`` (``"iqr"`` or ``"zscore"``) and ``threshold``.
     
     Returns:
-        Cleaned and standardized data in the same format as input.
-        
-    Note:
-        Future implementation will support multiple data formats and
-        cleaning strategies based on data type detection.
+        Cleaned columns, an iterator of cleaned chunks, or the input itself
+        when it is not columnar.
     """
     logger.info("Starting data cleaning process")
     logger.debug(f"Input data type: {type(data).__name__}")
     
-    # Placeholder for future cleaning logic
-    # Will include: null handling, duplicate removal, standardization
-    logger.info("Data cleaning completed (placeholder)")
+    if isinstance(data, Iterator) or callable(data):
+        logger.info("Cleaning chunked data lazily")
+        return DataCleaner(**options).clean_chunks(data)
+    if not is_columnar(data):
+        logger.info("Data cleaning completed: input is not columnar and was returned unchanged")
+        return data
+    
+    cleaner = DataCleaner(**options)
+    cleaned = cleaner.clean(data)
+    logger.info(f"Data cleaning completed: {cleaner.summary()}")
     
-    return data
+    return cleaned
 
 
-def transform_data(data: Any) -> Any:
+def transform_data(data: Any, pipeline: Any = None, save_path: Optional[str] = None) -> Any:
     """Apply feature transformations and scaling to data.
     
-    This is a placeholder function for data transformation operations
-    including:
-    - Feature engineering and extraction
-    - Data scaling and normalization
-    - Encoding categorical variables
-    - Dimensionality reduction
+    Columnar data is transformed by a :class:`scripts.transforms.Pipeline`
+    of steps such as:
+    - StandardScaler, MinMaxScaler for numerical features
+    - One-hot and ordinal encoding for categorical features
+    - PCA for dimensionality reduction
+    
+    Unfitted steps are fitted first, incrementally over chunks with
+    ``partial_fit``, so datasets larger than memory can be both fitted and
+    transformed one chunk at a time. Fitted pipelines can be saved and
+    passed back in by path so batch jobs reuse them instead of refitting.
     
     Args:
-        data: Input data to be transformed. Can be any data structure
-              (dict, list, DataFrame, etc.).
+        data: Columnar dataset (dict of NumPy arrays), iterator of chunks,
+              or callable returning a fresh chunk iterator (needed to fit
+              pipelines that take several passes over streamed data).
+              Without a pipeline, data is returned unchanged.
+        pipeline: Pipeline, list of step specs such as
+                  ``{"type": "standard_scaler", "columns": ["x"]}``, or path
+                  of a pipeline saved as JSON.
+        save_path: Where to save the fitted pipeline, or None.
     
     Returns:
-        Transformed data with applied feature engineering and scaling.
+        Transformed columns, or an iterator of transformed chunks for
+        chunked input.
         
-    Note:
-        Future implementation will support:
-        - StandardScaler, MinMaxScaler for numerical features
-        - One-hot encoding for categorical features
-        - PCA and other dimensionality reduction techniques
-        - Custom transformation pipelines
+    Raises:
+        TypeError: If a pipeline is given but the data is not columnar.
+        ValueError: If an unfitted pipeline cannot be fitted on a one-shot
+            iterator.
     """
     logger.info("Starting data transformation process")
     logger.debug(f"Input data type: {type(data).__name__}")
     
-    # Placeholder for future transformation logic
-    # Will include: scaling, encoding, feature engineering
-    logger.info("Data transformation completed (placeholder)")
+    if pipeline is None:
+        logger.info("Data transformation completed: no pipeline given, data returned unchanged")
+        return data
+    if isinstance(pipeline, str):
+        pipeline = Pipeline.load(pipeline)
+    elif not isinstance(pipeline, Pipeline):
+        pipeline = Pipeline(pipeline)
     
-    return data
+    chunked = isinstance(data, Iterator) or callable(data)
+    if not chunked and not is_columnar(data):
+        raise TypeError(f"transform_data needs columnar data, got {type(data).__name__}")
+    if not pipeline.fitted:
+        if isinstance(data, Iterator):
+            raise ValueError("Fit the pipeline first, or pass a callable returning fresh chunk iterators")
+        pipeline.fit(data)
+        if save_path:
+            pipeline.save(save_path)
+            logger.info(f"Saved fitted pipeline to {save_path}")
+    
+    if chunked:
+        logger.info("Transforming chunked data lazily")
+        return pipeline.transform_chunks(data() if callable(data) else data)
+    transformed = pipeline.transform(data)
+    logger.info(f"Data transformation completed: {len(transformed)} output columns")
+    
+    return transformed
 
 
-def load_external_dataset(file_path: str) -> Any:
-    """Load external datasets from CSV, JSON, or YAML files.
+def load_external_dataset(
+    file_path: str, stream: bool = False, cache_dir: Optional[str] = None, **options: Any
+) -> Any:
+    """Load external datasets from CSV, JSON-lines, JSON or YAML files.
     
-    This is a placeholder function for loading datasets from various
-    file formats. Includes error handling for common file operations
-    issues.
+    Files are read in fixed-size chunks of rows (CSV through a memory map)
+    and converted to typed NumPy columns inferred from a sample of rows, so
+    large files never have to fit in memory as Python objects; see
+    :class:`scripts.datasets.DatasetReader`. With ``cache_dir`` the parsed
+    columns are also stored as ``.npy`` files keyed by the file's path, size
+    and modification time, and later loads memory-map them instead of
+    parsing; see :class:`scripts.dataset_cache.DatasetCache`.
     
     Args:
         file_path: Path to the dataset file. Supported formats:
-                   - CSV (.csv)
-                   - JSON (.json)
-                   - YAML (.yaml, .yml)
+                   - CSV (.csv, .tsv)
+                   - JSON lines (.jsonl, .ndjson)
+                   - JSON (.json): an array of records or a dict of columns
+                   - YAML (.yaml, .yml; requires PyYAML)
+        stream: Return an iterator of ``{column: array}`` chunks instead of
+                loading every column at once.
+        cache_dir: Directory of the binary columnar cache, or None to
+                   always parse the file.
+        **options: DatasetReader options such as ``chunk_size``,
+                   ``columns``, ``schema`` and ``sample_size``.
     
     Returns:
-        Loaded dataset in appropriate data structure (dict, list, DataFrame).
-        Returns None if loading fails.
+        ``{column: np.ndarray}`` with the whole dataset, or the chunk
+        iterator when ``stream`` is True. Columns served from the cache are
+        read-only memory maps. Returns None if loading fails.
         
     Raises:
         Catches and logs all exceptions using core.utils.handle_error.
-        
-    Note:
-        Future implementation will:
-        - Auto-detect file format from extension
-        - Support additional formats (Excel, Parquet, HDF5)
-        - Implement streaming for large files
-        - Add validation and schema checking
+        With ``stream``, errors found after the first chunk are raised by
+        the iterator.
     """
     logger.info(f"Loading external dataset from: {file_path}")
     
     try:
-        # Placeholder for file format detection
         logger.debug(f"Detecting file format for: {file_path}")
+        reader = DatasetReader(file_path, **options)
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(file_path)
+        cache = DatasetCache(cache_dir) if cache_dir else None
         
-        # Placeholder for actual file loading logic
-        # Future: Use pandas.read_csv, json.load, yaml.safe_load
-        logger.info("Dataset loaded successfully (placeholder)")
+        if stream:
+            chunks = cache.iter_chunks(file_path, **options) if cache else iter(reader)
+            first = next(chunks, None)
+            logger.info(f"Streaming {reader.format} dataset in chunks of {reader.chunk_size} rows")
+            return itertools.chain([first], chunks) if first is not None else iter(())
         
-        return {}
+        columns = cache.load(file_path, **options) if cache else reader.read()
+        rows = len(next(iter(columns.values()))) if columns else 0
+        logger.info(f"Dataset loaded successfully: {rows} rows, {len(columns)} columns")
+        
+        return columns
         
     except FileNotFoundError as e:
         logger.error(f"File not found: {file_path}")
@@ -129,4 +200,4 @@ def load_external_dataset(file_path: str) -> Any:
     except Exception as e:
         logger.error(f"Failed to load dataset from {file_path}")
         handle_error(e)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,289 @@
+"""scripts.reporting
+
+Streaming report rendering for JSON, HTML and Markdown.
+- A report is a title plus sections of text, key/value metrics and tables;
+  table rows are consumed one at a time from any iterable (or a callable
+  returning one), so reports over millions of rows never sit in memory
+- Output is written to a temporary file next to the target and moved into
+  place when complete, so readers never see a half-written report
+- With a cache directory, each rendered section is stored under a
+  fingerprint of its inputs and copied back verbatim while the inputs are
+  unchanged, so regenerating a report only re-renders changed sections
+"""
+
+import html
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+from core.utils import default_file_mode, setup_logger
+from simulation.result_cache import json_default, stable_hash
+
+
+logger = setup_logger(__name__)
+
+# Bump whenever rendered output changes so cached sections are invalidated.
+RENDERER_VERSION = "1"
+FORMATS = {
+    ".json": "json",
+    ".html": "html",
+    ".htm": "html",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".txt": "markdown",
+}
+_BUFFER_SIZE = 1 << 20
+
+
+def report_format(output_path: str) -> str:
+    """Return the report format for a path's extension, or raise ValueError."""
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported report format {extension!r}; use one of {sorted(FORMATS)}")
+    return FORMATS[extension]
+
+
+def section_fingerprint(section: Mapping[str, Any], fmt: str) -> Optional[str]:
+    """Fingerprint of everything a rendered section depends on, or None if unknowable.
+
+    Table rows are identified by, in order of preference: an explicit
+    ``fingerprint``, the path, size and modification time of ``source``, or
+    the content of ``rows`` when it is a list or tuple. Sections whose rows
+    come from a generator or callable without either are never cached.
+    """
+    identity: Dict[str, Any] = {
+        "format": fmt,
+        "version": RENDERER_VERSION,
+        "title": section.get("title"),
+        "text": section.get("text"),
+        "columns": section.get("columns"),
+        "metrics": section.get("metrics"),
+    }
+    rows = section.get("rows")
+    if section.get("fingerprint") is not None:
+        identity["rows"] = section["fingerprint"]
+    elif section.get("source"):
+        stat = os.stat(section["source"])
+        identity["rows"] = [os.path.abspath(section["source"]), stat.st_size, stat.st_mtime_ns]
+    elif rows is None or isinstance(rows, (list, tuple)):
+        identity["rows"] = rows
+    else:
+        return None
+    try:
+        return stable_hash(identity)
+    except (TypeError, ValueError):
+        return None
+
+
+def _table(section: Mapping[str, Any]) -> Tuple[Optional[List[str]], Iterator[List[Any]]]:
+    """Return the section's columns and a lazy iterator of row value lists."""
+    columns = list(section["columns"]) if section.get("columns") is not None else None
+    if section.get("metrics") is not None:
+        return columns or ["metric", "value"], iter([[name, value] for name, value in section["metrics"].items()])
+    rows = section.get("rows")
+    if rows is None:
+        return columns, iter(())
+    rows = iter(rows() if callable(rows) else rows)
+    first = next(rows, None)
+    if first is None:
+        return columns, iter(())
+    if isinstance(first, Mapping) and columns is None:
+        columns = list(first)
+
+    def values(row: Any) -> List[Any]:
+        if isinstance(row, Mapping):
+            return [row.get(column) for column in columns]
+        if isinstance(row, (list, tuple)):
+            return list(row)
+        return [row]
+
+    return columns, (values(row) for row in itertools.chain([first], rows))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+
+
+class _JsonRenderer:
+    def header(self, title: str) -> str:
+        return '{"title": ' + json.dumps(title) + ', "sections": ['
+
+    separator = ", "
+
+    def section(self, out: TextIO, section: Mapping[str, Any], columns: Optional[List[str]], rows: Iterable) -> int:
+        out.write('{"title": ' + json.dumps(section.get("title")))
+        if section.get("text") is not None:
+            out.write(', "text": ' + json.dumps(section["text"]))
+        out.write(', "columns": ' + json.dumps(columns) + ', "rows": [')
+        count = 0
+        for row in rows:
+            out.write((", " if count else "") + json.dumps(row, default=json_default))
+            count += 1
+        out.write("]}")
+        return count
+
+    def footer(self) -> str:
+        return "]}\n"
+
+
+class _HtmlRenderer:
+    def header(self, title: str) -> str:
+        escaped = html.escape(title)
+        return (
+            f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{escaped}</title>\n"
+            "<style>table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:2px 6px}</style>\n"
+            f"</head>\n<body>\n<h1>{escaped}</h1>\n"
+        )
+
+    separator = ""
+
+    def section(self, out: TextIO, section: Mapping[str, Any], columns: Optional[List[str]], rows: Iterable) -> int:
+        out.write(f"<section>\n<h2>{html.escape(str(section.get('title', '')))}</h2>\n")
+        if section.get("text") is not None:
+            out.write(f"<p>{html.escape(str(section['text']))}</p>\n")
+        count = 0
+        for row in rows:
+            if not count:
+                out.write("<table>\n")
+                if columns:
+                    out.write("<tr>" + "".join(f"<th>{html.escape(str(c))}</th>" for c in columns) + "</tr>\n")
+            out.write("<tr>" + "".join(f"<td>{html.escape(_cell(value))}</td>" for value in row) + "</tr>\n")
+            count += 1
+        if count:
+            out.write("</table>\n")
+        out.write("</section>\n")
+        return count
+
+    def footer(self) -> str:
+        return "</body>\n</html>\n"
+
+
+class _MarkdownRenderer:
+    def header(self, title: str) -> str:
+        return f"# {title}\n"
+
+    separator = ""
+
+    def section(self, out: TextIO, section: Mapping[str, Any], columns: Optional[List[str]], rows: Iterable) -> int:
+        out.write(f"\n## {section.get('title', '')}\n")
+        if section.get("text") is not None:
+            out.write(f"\n{section['text']}\n")
+        count = 0
+        for row in rows:
+            if not count:
+                header = columns or [""] * len(row)
+                out.write("\n| " + " | ".join(_markdown_cell(c) for c in header) + " |\n")
+                out.write("|" + "---|" * len(header) + "\n")
+            out.write("| " + " | ".join(_markdown_cell(value) for value in row) + " |\n")
+            count += 1
+        return count
+
+    def footer(self) -> str:
+        return ""
+
+
+_RENDERERS = {"json": _JsonRenderer, "html": _HtmlRenderer, "markdown": _MarkdownRenderer}
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _markdown_cell(value: Any) -> str:
+    return _cell(value).replace("|", "\\|").replace("\n", " ")
+
+
+class _Tee:
+    """Writes to the report and to a cache fragment at once."""
+
+    def __init__(self, *handles: TextIO):
+        self.handles = handles
+
+    def write(self, text: str) -> None:
+        for handle in self.handles:
+            handle.write(text)
+
+
+def render_report(
+    output_path: str,
+    sections: Sequence[Mapping[str, Any]],
+    title: str = "Jarvis Report",
+    cache_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Render a report, streaming rows and reusing cached sections.
+
+    Args:
+        output_path: Target file; the extension selects the format.
+        sections: Section dicts with ``title`` and optionally ``text``,
+            ``metrics`` (mapping rendered as a two-column table), or a table
+            of ``rows`` (iterable or callable returning one; rows are
+            sequences, mappings or scalars) with optional ``columns``.
+            ``fingerprint`` or ``source`` (a file the rows come from) make
+            lazily produced rows cacheable; see :func:`section_fingerprint`.
+        title: Report title.
+        cache_dir: Directory of rendered section fragments, or None.
+
+    Returns:
+        Dict with the ``format``, the ``rendered`` and ``cached`` section
+        titles and the number of ``rows`` rendered.
+    """
+    fmt = report_format(output_path)
+    renderer = _RENDERERS[fmt]()
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    summary: Dict[str, Any] = {"format": fmt, "rendered": [], "cached": [], "rows": 0}
+    repeats: Dict[str, int] = {}
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", buffering=_BUFFER_SIZE) as out:
+            out.write(renderer.header(title))
+            for index, section in enumerate(sections):
+                if index:
+                    out.write(renderer.separator)
+                name = str(section.get("title", f"Section {index + 1}"))
+                fingerprint = section_fingerprint(section, fmt) if cache_dir else None
+                if fingerprint is None:
+                    summary["rows"] += renderer.section(out, section, *_table(section))
+                    summary["rendered"].append(name)
+                    continue
+                # Repeated keys are numbered ("_" never appears in a slug), so
+                # each section's stale-fragment cleanup only sees its own files.
+                key = _slug(str(section.get("key", name)))
+                repeats[key] = repeats.get(key, 0) + 1
+                prefix = f"{key}-" if repeats[key] == 1 else f"{key}_{repeats[key]}-"
+                fragment = os.path.join(cache_dir, f"{prefix}{fingerprint[:24]}.{fmt}")
+                if os.path.exists(fragment):
+                    with open(fragment, "r", encoding="utf-8") as cached:
+                        shutil.copyfileobj(cached, out, _BUFFER_SIZE)
+                    summary["cached"].append(name)
+                    continue
+                frag_fd, frag_tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(frag_fd, "w", encoding="utf-8", buffering=_BUFFER_SIZE) as frag:
+                        summary["rows"] += renderer.section(_Tee(out, frag), section, *_table(section))
+                except BaseException:
+                    os.remove(frag_tmp)
+                    raise
+                os.chmod(frag_tmp, default_file_mode())
+                os.replace(frag_tmp, fragment)
+                summary["rendered"].append(name)
+                # Older renderings of this section can never be hit again.
+                stale = re.compile(re.escape(prefix) + r"[0-9a-f]{24}\." + fmt)
+                for entry in os.scandir(cache_dir):
+                    if stale.fullmatch(entry.name) and entry.path != fragment:
+                        os.remove(entry.path)
+            out.write(renderer.footer())
+        os.chmod(tmp_path, default_file_mode())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return summary
@@ -0,0 +1,696 @@
+"""scripts.scheduler
+
+In-process scheduler for recurring innovation tasks.
+- Schedules are cron expressions (``"*/5 * * * *"``, ``"@daily"``), intervals
+  (``300``, ``"every 5m"``, ``"1h30m"``) or one-off runs; interval firing
+  times stay on the grid ``anchor + k * interval`` so they never drift
+- All timers live in one heap served by a single dispatcher thread; due jobs
+  run on a bounded worker pool in priority order, subject to per-task-type
+  concurrency limits
+- Jobs may depend on other jobs, are retried with exponential backoff, and
+  are persisted to SQLite so schedules survive restarts
+"""
+
+import bisect
+import heapq
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from core.utils import setup_logger
+
+
+logger = setup_logger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = {name: i for i, name in enumerate("jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1)}
+_DAY_NAMES = {name: i for i, name in enumerate("sun mon tue wed thu fri sat".split())}
+# (low, high, names) of the minute, hour, day-of-month, month and day-of-week fields.
+_CRON_FIELDS = ((0, 59, {}), (0, 23, {}), (1, 31, {}), (1, 12, _MONTH_NAMES), (0, 7, _DAY_NAMES))
+# Longest stretch searched for the next cron match (covers Feb 29 schedules).
+_CRON_SEARCH_DAYS = 366 * 8
+_INTERVAL_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0, "w": 604800.0}
+_INTERVAL_PART = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    task_type TEXT NOT NULL,
+    schedule TEXT,
+    anchor REAL NOT NULL,
+    parameters TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    max_retries INTEGER NOT NULL,
+    backoff REAL NOT NULL,
+    status TEXT NOT NULL,
+    next_run REAL,
+    attempt INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    last_run REAL,
+    last_success REAL,
+    last_status TEXT,
+    last_error TEXT
+)
+"""
+
+
+class OnceSchedule:
+    """Runs a single time at ``at``."""
+
+    def __init__(self, at: float):
+        self.at = at
+
+    def next_after(self, timestamp: float) -> Optional[float]:
+        """Return the first firing time strictly after ``timestamp``, or None."""
+        return self.at if self.at > timestamp else None
+
+
+class IntervalSchedule:
+    """Fires every ``interval`` seconds on the grid ``anchor + k * interval``."""
+
+    def __init__(self, interval: float, anchor: float):
+        if interval <= 0:
+            raise ValueError("Schedule interval must be positive.")
+        self.interval = interval
+        self.anchor = anchor
+
+    def next_after(self, timestamp: float) -> float:
+        """Return the first grid point strictly after ``timestamp``."""
+        if timestamp < self.anchor:
+            return self.anchor + self.interval
+        steps = int((timestamp - self.anchor) // self.interval) + 1
+        return self.anchor + steps * self.interval
+
+
+class CronSchedule:
+    """Five-field cron expression (minute hour day-of-month month day-of-week).
+
+    Fields accept ``*``, values, ranges, steps (``*/15``, ``1-10/2``), lists
+    and month/day names. As in Vixie cron, when both day fields are
+    restricted a day matches if either does.
+    """
+
+    def __init__(self, expression: str, tz: tzinfo = timezone.utc):
+        expression = CRON_ALIASES.get(expression.strip().lower(), expression)
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        parsed = [_parse_cron_field(field, *spec) for field, spec in zip(fields, _CRON_FIELDS)]
+        self.expression = expression
+        self.tz = tz
+        self.minutes, self.hours, days, months, weekdays = (sorted(values) for values in parsed)
+        self.days, self.months = set(days), set(months)
+        # Day-of-week 7 is Sunday, like 0.
+        self.weekdays = {day % 7 for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, timestamp: float) -> float:
+        """Return the first matching minute strictly after ``timestamp``."""
+        moment = datetime.fromtimestamp(timestamp, self.tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(_CRON_SEARCH_DAYS):
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            hour = _next_value(self.hours, moment.hour)
+            if hour == moment.hour:
+                minute = _next_value(self.minutes, moment.minute)
+                if minute is not None:
+                    return moment.replace(minute=minute).timestamp()
+                hour = _next_value(self.hours, moment.hour + 1)
+            if hour is None:
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            return moment.replace(hour=hour, minute=self.minutes[0]).timestamp()
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+def _next_value(values: Sequence[int], start: int) -> Optional[int]:
+    index = bisect.bisect_left(values, start)
+    return values[index] if index < len(values) else None
+
+
+def _parse_cron_field(field: str, low: int, high: int, names: Mapping[str, int]) -> Set[int]:
+    def value(token: str) -> int:
+        number = names.get(token.lower()) if not token.isdigit() else int(token)
+        if number is None or not low <= number <= high:
+            raise ValueError(f"Invalid cron value {token!r}")
+        return number
+
+    values: Set[int] = set()
+    for part in field.split(","):
+        span, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid cron step in {part!r}")
+        if span == "*":
+            start, stop = low, high
+        elif "-" in span:
+            start, stop = (value(token) for token in span.split("-", 1))
+        else:
+            start = value(span)
+            stop = high if step_text else start
+        if start > stop:
+            raise ValueError(f"Invalid cron range {part!r}")
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+def parse_interval(text: str) -> float:
+    """Parse ``"90"``, ``"5m"``, ``"every 1h30m"`` or ``"@every 2d"`` into seconds."""
+    body = re.sub(r"^@?every\s*", "", text.strip().lower())
+    try:
+        return float(body)
+    except ValueError:
+        pass
+    parts = _INTERVAL_PART.findall(body)
+    if not parts or _INTERVAL_PART.sub("", body).strip():
+        raise ValueError(f"Invalid interval: {text!r}")
+    return sum(float(amount) * _INTERVAL_UNITS[unit] for amount, unit in parts)
+
+
+def parse_schedule(spec: Any, anchor: float, tz: tzinfo = timezone.utc):
+    """Build a schedule from its specification.
+
+    Args:
+        spec: None (run once at ``anchor``), seconds, an interval string,
+            a cron expression or alias, or ``{"at": timestamp}``.
+        anchor: Creation time; the origin of interval grids and the run
+            time of one-off jobs.
+        tz: Time zone of cron expressions.
+
+    Returns:
+        An OnceSchedule, IntervalSchedule or CronSchedule.
+    """
+    if spec is None:
+        return OnceSchedule(anchor)
+    if isinstance(spec, Mapping) and "at" in spec:
+        return OnceSchedule(float(spec["at"]))
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return IntervalSchedule(float(spec), anchor)
+    if isinstance(spec, str):
+        text = spec.strip()
+        if text.lower() in CRON_ALIASES or len(text.split()) == 5:
+            return CronSchedule(text, tz)
+        return IntervalSchedule(parse_interval(text), anchor)
+    raise ValueError(f"Unsupported schedule: {spec!r}")
+
+
+# Handler parameters without defaults, checked when a job of the type is added.
+DEFAULT_REQUIRED_PARAMETERS: Dict[str, Tuple[str, ...]] = {
+    "material_discovery": ("target_properties", "constraints"),
+    "material_optimization": ("properties",),
+    "cross_pollination": ("problem",),
+}
+
+
+def default_handlers() -> Dict[str, Handler]:
+    """Handlers for the built-in innovation task types, keyed by ``task_type``."""
+    from innovation.cross_pollinator import CrossPollinationEngine
+    from innovation.material_discovery import MaterialDiscovery
+
+    from .automation import run_simulation_batch
+
+    return {
+        "material_discovery": lambda params: MaterialDiscovery().discover_new_material(**params),
+        "material_optimization": lambda params: MaterialDiscovery().optimize_material(**params),
+        "cross_pollination": lambda params: CrossPollinationEngine().generate_breakthroughs(**params),
+        "simulation_batch": run_simulation_batch,
+    }
+
+
+class Job:
+    """A scheduled task and its run state."""
+
+    __slots__ = (
+        "id", "task_type", "schedule_spec", "anchor", "schedule", "parameters", "priority", "depends_on",
+        "max_retries", "backoff", "status", "next_run", "attempt", "runs", "failures", "last_run",
+        "last_success", "last_status", "last_error", "last_result", "version",
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job definition and state as a plain dict."""
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ("schedule", "version")}
+
+
+class Scheduler:
+    """Priority scheduler with one timer heap and a bounded worker pool.
+
+    Jobs move from the timer heap to a ready heap (highest priority, then
+    earliest due time) when due; a job whose task type is at its concurrency
+    limit waits without blocking other types. A recurring job's next run is
+    the first occurrence after both its scheduled time and the current time,
+    so missed occurrences (e.g. while the process was down) are coalesced
+    into one run. Heap entries are invalidated lazily by a version counter.
+
+    A job with ``depends_on`` runs only once every dependency has succeeded
+    since the job's previous run; it waits while a dependency is pending and
+    its occurrence is skipped if a dependency fails for good.
+
+    Attributes:
+        store_path: SQLite job store, or None to keep jobs in memory.
+        workers: Worker threads running jobs.
+        limits: Maximum concurrent runs per task type.
+        default_limit: Limit for task types not in ``limits`` (None: no limit).
+        max_backoff: Cap on the retry delay in seconds.
+    """
+
+    def __init__(
+        self,
+        store_path: Optional[str] = None,
+        workers: int = 4,
+        limits: Optional[Mapping[str, int]] = None,
+        default_limit: Optional[int] = None,
+        handlers: Optional[Mapping[str, Handler]] = None,
+        required: Optional[Mapping[str, Sequence[str]]] = None,
+        max_backoff: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+        tz: tzinfo = timezone.utc,
+    ):
+        self.store_path = store_path
+        self.workers = workers
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.tz = tz
+        self._handlers: Dict[str, Handler] = dict(handlers or {})
+        self._required: Dict[str, Tuple[str, ...]] = {name: tuple(keys) for name, keys in (required or {}).items()}
+        self._jobs: Dict[str, Job] = {}
+        self._timers: List[Tuple[float, int, str, int]] = []
+        self._ready: List[Tuple[int, float, int, str, int]] = []
+        self._blocked: Dict[str, List[Tuple[int, float, int, str, int]]] = {}
+        self._waiting: Dict[str, Set[str]] = {}
+        self._running: Dict[str, int] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+        self._conn: Optional[sqlite3.Connection] = None
+        if store_path:
+            self._conn = sqlite3.connect(store_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            with self._conn:
+                self._conn.execute(_SCHEMA)
+            self._load()
+
+    # ------------------------------------------------------------------ jobs
+
+    def register(self, task_type: str, handler: Handler, required: Sequence[str] = ()) -> None:
+        """Register the callable run for jobs of ``task_type``.
+
+        ``required`` names the parameters every job of the type must define.
+        """
+        with self._cond:
+            self._handlers[task_type] = handler
+            self._required[task_type] = tuple(required)
+
+    def add_job(
+        self,
+        task_type: str,
+        schedule: Any = None,
+        parameters: Optional[Mapping[str, Any]] = None,
+        priority: int = 0,
+        depends_on: Iterable[str] = (),
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """Add a job, or redefine the job with the same id keeping its run history.
+
+        Args:
+            task_type: Selects the handler; see :meth:`register`.
+            schedule: See :func:`parse_schedule`.
+            parameters: JSON-serializable handler argument.
+            priority: Higher priorities run first when several jobs are due.
+            depends_on: Ids of jobs that must succeed before each run.
+            max_retries: Retries of a failed run before it counts as failed.
+            backoff: First retry delay in seconds; doubles per retry.
+            job_id: Stable id; defaults to a random one.
+
+        Returns:
+            The job id.
+
+        Raises:
+            ValueError: If no handler is registered for ``task_type`` or a
+                parameter it requires is missing.
+        """
+        now = self.clock()
+        parameters = dict(parameters or {})
+        json.dumps(parameters)
+        with self._cond:
+            if task_type not in self._handlers:
+                raise ValueError(f"No handler registered for task type '{task_type}'")
+            missing = [name for name in self._required.get(task_type, ()) if name not in parameters]
+            if missing:
+                raise ValueError(f"Task type '{task_type}' requires parameters {missing}")
+            job_id = job_id or uuid.uuid4().hex[:16]
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = Job()
+                job.id = job_id
+                job.anchor = now
+                job.version = 0
+                job.attempt = job.runs = job.failures = 0
+                job.last_run = job.last_success = job.last_status = job.last_error = job.last_result = None
+                self._jobs[job_id] = job
+            elif job.schedule_spec != schedule:
+                job.anchor = now
+            job.task_type = task_type
+            job.schedule_spec = schedule
+            job.schedule = parse_schedule(schedule, job.anchor, self.tz)
+            job.parameters = parameters
+            job.priority = int(priority)
+            job.depends_on = list(depends_on)
+            job.max_retries = int(max_retries)
+            job.backoff = float(backoff)
+            job.attempt = 0
+            self._deleted.discard(job_id)
+            first = job.schedule.at if isinstance(job.schedule, OnceSchedule) else job.schedule.next_after(now)
+            self._arm(job, first)
+            self._flush()
+            self._cond.notify()
+        return job_id
+
+    def remove_job(self, job_id: str) -> bool:
+        """Remove a job; a running instance finishes but is not rescheduled."""
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.version += 1
+            job.status = "removed"
+            self._dirty.discard(job_id)
+            self._deleted.add(job_id)
+            self._flush()
+            return True
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's definition and state, or None."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            return None if job is None else job.to_dict()
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Return every job's definition and state."""
+        with self._cond:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def next_run_time(self) -> Optional[float]:
+        """Return the earliest pending timer, or None."""
+        with self._cond:
+            self._drop_stale_timers()
+            return self._timers[0][0] if self._timers else None
+
+    # ------------------------------------------------------------ execution
+
+    def run_pending(self) -> int:
+        """Run every due job in the calling thread.
+
+        Useful for tests and for driving the scheduler from an external
+        loop; concurrency limits do not apply since runs are sequential.
+
+        Returns:
+            Number of runs executed (including failed attempts).
+        """
+        executed = 0
+        while True:
+            with self._cond:
+                now = self.clock()
+                self._collect_due(now)
+                picked = self._pop_ready(now, ignore_limits=True)
+                if picked is None:
+                    self._flush()
+                    return executed
+                job, handler = picked
+            self._finish(job, *self._call(job, handler))
+            executed += 1
+
+    def start(self) -> None:
+        """Start the dispatcher thread and worker pool (idempotent)."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-worker")
+            self._thread = threading.Thread(target=self._dispatch_loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop dispatching; with ``wait``, let running jobs finish."""
+        with self._cond:
+            thread, pool = self._thread, self._pool
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(wait=wait)
+        with self._cond:
+            self._thread = self._pool = None
+            self._flush()
+
+    def close(self) -> None:
+        """Shut down and close the job store."""
+        self.shutdown()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "Scheduler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _dispatch_loop(self) -> None:
+        with self._cond:
+            while not self._stopping:
+                now = self.clock()
+                self._collect_due(now)
+                while sum(self._running.values()) < self.workers:
+                    picked = self._pop_ready(now, ignore_limits=False)
+                    if picked is None:
+                        break
+                    job, handler = picked
+                    self._pool.submit(self._run_in_pool, job, handler)
+                self._flush()
+                self._drop_stale_timers()
+                timeout = max(0.0, self._timers[0][0] - self.clock()) if self._timers else None
+                self._cond.wait(timeout)
+
+    def _run_in_pool(self, job: Job, handler: Optional[Handler]) -> None:
+        self._finish(job, *self._call(job, handler))
+        with self._cond:
+            self._cond.notify()
+
+    def _call(self, job: Job, handler: Optional[Handler]) -> Tuple[bool, Any]:
+        if handler is None:
+            return False, LookupError(f"No handler registered for task type '{job.task_type}'")
+        try:
+            return True, handler(dict(job.parameters))
+        except Exception as e:
+            return False, e
+
+    # ---------------------------------------------------------------- state
+
+    def _arm(self, job: Job, when: Optional[float]) -> None:
+        """Point the job at its next run time (or mark it done)."""
+        job.version += 1
+        job.next_run = when
+        if when is None:
+            job.status = "failed" if job.last_status == "failed" else "done"
+        else:
+            job.status = "retrying" if job.attempt else "scheduled"
+            heapq.heappush(self._timers, (when, next(self._counter), job.id, job.version))
+        self._dirty.add(job.id)
+
+    def _drop_stale_timers(self) -> None:
+        while self._timers:
+            _, _, job_id, version = self._timers[0]
+            job = self._jobs.get(job_id)
+            if job is not None and job.version == version:
+                return
+            heapq.heappop(self._timers)
+
+    def _collect_due(self, now: float) -> None:
+        while self._timers and self._timers[0][0] <= now:
+            when, seq, job_id, version = heapq.heappop(self._timers)
+            job = self._jobs.get(job_id)
+            if job is None or job.version != version:
+                continue
+            self._make_ready(job, when, seq)
+
+    def _make_ready(self, job: Job, when: float, seq: int) -> None:
+        for dependency_id in job.depends_on:
+            dependency = self._jobs.get(dependency_id)
+            if dependency is None or dependency.status == "failed":
+                self._skip(job, f"dependency '{dependency_id}' is {'missing' if dependency is None else 'failed'}")
+                return
+            if dependency.last_success is None or (
+                job.last_run is not None and dependency.last_success <= job.last_run
+            ):
+                job.status = "waiting"
+                self._waiting.setdefault(dependency_id, set()).add(job.id)
+                self._dirty.add(job.id)
+                return
+        job.status = "ready"
+        heapq.heappush(self._ready, (-job.priority, when, seq, job.id, job.version))
+
+    def _skip(self, job: Job, reason: str) -> None:
+        logger.warning(f"Skipping run of job {job.id}: {reason}")
+        job.last_status = "skipped"
+        job.last_error = reason
+        job.attempt = 0
+        self._arm(job, self._following(job, self.clock()))
+
+    def _following(self, job: Job, now: float) -> Optional[float]:
+        scheduled = job.next_run if job.next_run is not None else now
+        return job.schedule.next_after(max(scheduled, now))
+
+    def _limit(self, task_type: str) -> Optional[int]:
+        return self.limits.get(task_type, self.default_limit)
+
+    def _pop_ready(self, now: float, ignore_limits: bool) -> Optional[Tuple[Job, Optional[Handler]]]:
+        while self._ready:
+            entry = heapq.heappop(self._ready)
+            job = self._jobs.get(entry[3])
+            if job is None or job.version != entry[4]:
+                continue
+            limit = self._limit(job.task_type)
+            if not ignore_limits and limit is not None and self._running.get(job.task_type, 0) >= limit:
+                self._blocked.setdefault(job.task_type, []).append(entry)
+                continue
+            self._running[job.task_type] = self._running.get(job.task_type, 0) + 1
+            job.status = "running"
+            job.last_run = now
+            self._dirty.add(job.id)
+            return job, self._handlers.get(job.task_type)
+        return None
+
+    def _finish(self, job: Job, ok: bool, outcome: Any) -> None:
+        with self._cond:
+            current = self.clock()
+            self._running[job.task_type] -= 1
+            for entry in self._blocked.pop(job.task_type, []):
+                heapq.heappush(self._ready, entry)
+            job.runs += 1
+            if job.id not in self._jobs:
+                return
+            if ok:
+                job.last_status, job.last_error, job.last_result = "succeeded", None, outcome
+                job.last_success = current
+                job.attempt = 0
+                self._arm(job, self._following(job, current))
+            else:
+                job.failures += 1
+                job.last_error = f"{type(outcome).__name__}: {outcome}"
+                if job.attempt < job.max_retries:
+                    job.attempt += 1
+                    delay = min(self.max_backoff, job.backoff * 2 ** (job.attempt - 1))
+                    logger.warning(f"Job {job.id} failed ({job.last_error}); retry {job.attempt} in {delay:.3g}s")
+                    self._arm(job, current + delay)
+                    self._flush()
+                    return
+                logger.error(f"Job {job.id} failed after {job.attempt + 1} attempts: {job.last_error}")
+                job.last_status = "failed"
+                job.attempt = 0
+                self._arm(job, self._following(job, current))
+            self._release_waiting(job, current)
+            self._flush()
+
+    def _release_waiting(self, job: Job, now: float) -> None:
+        for waiting_id in self._waiting.pop(job.id, set()):
+            waiting = self._jobs.get(waiting_id)
+            if waiting is None or waiting.status != "waiting":
+                continue
+            if job.last_status == "succeeded":
+                self._make_ready(waiting, waiting.next_run, next(self._counter))
+            else:
+                self._skip(waiting, f"dependency '{job.id}' failed")
+
+    # ---------------------------------------------------------------- store
+
+    def _flush(self) -> None:
+        """Write changed jobs to the store in one transaction."""
+        if self._conn is None:
+            self._dirty.clear()
+            self._deleted.clear()
+            return
+        if not self._dirty and not self._deleted:
+            return
+        rows = [self._row(self._jobs[job_id]) for job_id in self._dirty if job_id in self._jobs]
+        with self._conn:
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in self._deleted])
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO jobs VALUES ({', '.join('?' * 18)})", rows
+            )
+        self._dirty.clear()
+        self._deleted.clear()
+
+    @staticmethod
+    def _row(job: Job) -> Tuple[Any, ...]:
+        return (
+            job.id, job.task_type, json.dumps(job.schedule_spec), job.anchor, json.dumps(job.parameters),
+            job.priority, json.dumps(job.depends_on), job.max_retries, job.backoff, job.status, job.next_run,
+            job.attempt, job.runs, job.failures, job.last_run, job.last_success, job.last_status, job.last_error,
+        )
+
+    def _load(self) -> None:
+        """Restore jobs from the store; runs interrupted by a restart are due again."""
+        rows = self._conn.execute("SELECT * FROM jobs").fetchall()
+        for row in rows:
+            job = Job()
+            (
+                job.id, job.task_type, schedule, job.anchor, parameters, job.priority, depends_on,
+                job.max_retries, job.backoff, job.status, job.next_run, job.attempt, job.runs, job.failures,
+                job.last_run, job.last_success, job.last_status, job.last_error,
+            ) = row
+            job.schedule_spec = json.loads(schedule)
+            job.schedule = parse_schedule(job.schedule_spec, job.anchor, self.tz)
+            job.parameters = json.loads(parameters)
+            job.depends_on = json.loads(depends_on)
+            job.last_result = None
+            job.version = 0
+            self._jobs[job.id] = job
+            if job.next_run is not None and job.status not in ("done", "failed"):
+                self._arm(job, job.next_run)
+        self._dirty.clear()
+        logger.info(f"Loaded {len(rows)} jobs from {self.store_path}")
@@ -0,0 +1,529 @@
+"""scripts.transforms
+
+Out-of-core fit/transform pipelines over columnar datasets.
+- Transformers (standard and min-max scalers, one-hot and ordinal encoders,
+  PCA) fit their statistics incrementally with ``partial_fit``, one chunk of
+  ``{column: np.ndarray}`` at a time, so datasets larger than memory can be
+  fitted and transformed chunk by chunk
+- Statistics are merged exactly (Chan's parallel mean/variance and
+  covariance updates), so fitting in chunks matches fitting in one go
+- A Pipeline fits as many steps per pass over the data as it can: steps
+  that do not read the output of an earlier unfitted step share a pass
+- Fitted pipelines serialize to JSON and load back without refitting
+"""
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.utils import default_file_mode, setup_logger
+from simulation.statistics import RunningStats
+
+
+logger = setup_logger(__name__)
+
+PIPELINE_VERSION = 1
+Columns = Dict[str, np.ndarray]
+# Kinds in a simulated schema; "num" covers int and float columns.
+_KIND_OF = {"i": "num", "u": "num", "f": "num", "b": "bool"}
+
+
+def _schema(columns: Mapping[str, np.ndarray]) -> Dict[str, str]:
+    return {name: _KIND_OF.get(np.asarray(values).dtype.kind, "cat") for name, values in columns.items()}
+
+
+def _replace(columns: Mapping[str, np.ndarray], inputs: Sequence[str], outputs: Mapping[str, np.ndarray]) -> Columns:
+    """Return ``columns`` with ``inputs`` replaced by ``outputs`` at the first input's position."""
+    result: Columns = {}
+    first = inputs[0] if inputs else None
+    for name, values in columns.items():
+        if name == first:
+            result.update(outputs)
+        elif name not in inputs:
+            result[name] = values
+    if first is None:
+        result.update(outputs)
+    return result
+
+
+class Transformer:
+    """Base class of incrementally fitted column transformers.
+
+    Attributes:
+        columns: Input columns, or None to pick them from the first chunk
+            (``default_kinds`` of the schema).
+        fitted: Whether fitting is complete.
+    """
+
+    name = "transformer"
+    default_kinds: Tuple[str, ...] = ("num",)
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        self.columns = list(columns) if columns is not None else None
+        self.fitted = False
+
+    def resolve(self, schema: Mapping[str, str]) -> List[str]:
+        """Fix the input columns against a schema and return them."""
+        if self.columns is None:
+            self.columns = [name for name, kind in schema.items() if kind in self.default_kinds]
+        missing = [name for name in self.columns if name not in schema]
+        if missing:
+            raise KeyError(f"{self.name} columns not in data: {missing}")
+        return self.columns
+
+    def output_schema(self, schema: Mapping[str, str]) -> Optional[Dict[str, str]]:
+        """Schema after this step, or None if it depends on fitted state."""
+        return {**schema, **{name: "num" for name in self.columns}}
+
+    def written(self) -> List[str]:
+        """Columns this step replaces or creates."""
+        return list(self.columns or [])
+
+    def partial_fit(self, columns: Mapping[str, np.ndarray]) -> "Transformer":
+        """Fold one chunk into the fitted statistics."""
+        self.resolve(_schema(columns))
+        self._update(columns)
+        return self
+
+    def fit(self, data: Union[Mapping[str, np.ndarray], Iterable[Mapping[str, np.ndarray]]]) -> "Transformer":
+        """Fit on a columnar dataset or an iterable of chunks."""
+        for chunk in [data] if isinstance(data, Mapping) else data:
+            self.partial_fit(chunk)
+        self.finish()
+        return self
+
+    def finish(self) -> None:
+        """Mark fitting as complete."""
+        if not self._seen():
+            raise ValueError(f"{self.name} saw no data to fit")
+        self.fitted = True
+
+    def transform(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        """Transform one chunk; the input is not modified."""
+        if not self._seen():
+            raise RuntimeError(f"{self.name} is not fitted")
+        return self._apply(columns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable parameters and fitted state."""
+        return {"type": self.name, "columns": self.columns, "fitted": self.fitted, **self._params(),
+                "state": self._state()}
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "Transformer":
+        """Rebuild a transformer from :meth:`to_dict` output or a bare spec."""
+        spec = dict(spec)
+        kind = spec.pop("type")
+        if kind not in TRANSFORMERS:
+            raise ValueError(f"Unknown transformer {kind!r}; use one of {sorted(TRANSFORMERS)}")
+        state = spec.pop("state", None)
+        fitted = spec.pop("fitted", False)
+        transformer = TRANSFORMERS[kind](**spec)
+        if state:
+            transformer._load(state)
+        transformer.fitted = bool(fitted)
+        return transformer
+
+    def _params(self) -> Dict[str, Any]:
+        return {}
+
+    def _seen(self) -> bool:
+        raise NotImplementedError
+
+    def _update(self, columns: Mapping[str, np.ndarray]) -> None:
+        raise NotImplementedError
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        raise NotImplementedError
+
+    def _state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _load(self, state: Mapping[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class _ScalerBase(Transformer):
+    """Per-column running statistics of finite values."""
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        super().__init__(columns)
+        self._stats: Dict[str, RunningStats] = {}
+
+    def _seen(self) -> bool:
+        return bool(self._stats) and any(stats.count for stats in self._stats.values())
+
+    def _update(self, columns: Mapping[str, np.ndarray]) -> None:
+        for name in self.columns:
+            values = np.asarray(columns[name], dtype=np.float64)
+            self._stats.setdefault(name, RunningStats()).update(values[np.isfinite(values)])
+
+    def _state(self) -> Dict[str, Any]:
+        return {name: [s.count, s.mean, s.m2, s.min, s.max] for name, s in self._stats.items()}
+
+    def _load(self, state: Mapping[str, Any]) -> None:
+        for name, (count, mean, m2, low, high) in state.items():
+            stats = self._stats[name] = RunningStats()
+            stats.count, stats.mean, stats.m2, stats.min, stats.max = count, mean, m2, low, high
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        result = dict(columns)
+        for name in self.columns:
+            offset, scale = self._affine(self._stats.get(name) or RunningStats())
+            result[name] = (np.asarray(columns[name], dtype=np.float64) - offset) * scale
+        return result
+
+    def _affine(self, stats: RunningStats) -> Tuple[float, float]:
+        raise NotImplementedError
+
+
+class StandardScaler(_ScalerBase):
+    """Center columns to zero mean and scale them to unit (population) variance."""
+
+    name = "standard_scaler"
+
+    def _affine(self, stats: RunningStats) -> Tuple[float, float]:
+        std = float(np.sqrt(stats.m2 / stats.count)) if stats.count else 0.0
+        return stats.mean, 1.0 / std if std > 0 else 1.0
+
+
+class MinMaxScaler(_ScalerBase):
+    """Scale columns linearly so the fitted minimum and maximum map to ``feature_range``."""
+
+    name = "minmax_scaler"
+
+    def __init__(self, columns: Optional[Sequence[str]] = None, feature_range: Sequence[float] = (0.0, 1.0)):
+        super().__init__(columns)
+        self.feature_range = (float(feature_range[0]), float(feature_range[1]))
+
+    def _params(self) -> Dict[str, Any]:
+        return {"feature_range": list(self.feature_range)}
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        low, high = self.feature_range
+        result = super()._apply(columns)
+        for name in self.columns:
+            result[name] = result[name] * (high - low) + low
+        return result
+
+    def _affine(self, stats: RunningStats) -> Tuple[float, float]:
+        if not stats.count:
+            return 0.0, 1.0
+        span = stats.max - stats.min
+        return stats.min, 1.0 / span if span > 0 else 0.0
+
+
+class _EncoderBase(Transformer):
+    """Categories of each column, collected chunk by chunk and kept sorted."""
+
+    default_kinds = ("cat",)
+
+    def __init__(self, columns: Optional[Sequence[str]] = None):
+        super().__init__(columns)
+        self.categories: Dict[str, np.ndarray] = {}
+
+    def _seen(self) -> bool:
+        return bool(self.categories)
+
+    def _update(self, columns: Mapping[str, np.ndarray]) -> None:
+        for name in self.columns:
+            values = np.unique(np.asarray(columns[name]))
+            known = self.categories.get(name)
+            self.categories[name] = values if known is None else np.union1d(known, values)
+
+    def _state(self) -> Dict[str, Any]:
+        return {name: values.tolist() for name, values in self.categories.items()}
+
+    def _load(self, state: Mapping[str, Any]) -> None:
+        self.categories = {name: np.asarray(values) for name, values in state.items()}
+
+    def _codes(self, name: str, values: np.ndarray) -> np.ndarray:
+        """Index of each value in the column's categories, or -1 when unknown."""
+        categories = self.categories.get(name)
+        if categories is None or not len(categories):
+            return np.full(len(values), -1, dtype=np.int64)
+        values = np.asarray(values)
+        if values.dtype.kind != categories.dtype.kind and "U" in (values.dtype.kind, categories.dtype.kind):
+            values = values.astype(str)
+        codes = np.searchsorted(categories, values)
+        codes[codes == len(categories)] = 0
+        return np.where(categories[codes] == values, codes, -1).astype(np.int64)
+
+
+class OrdinalEncoder(_EncoderBase):
+    """Replace categories by their index in the sorted categories; unknown values become -1."""
+
+    name = "ordinal_encoder"
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        result = dict(columns)
+        for name in self.columns:
+            result[name] = self._codes(name, columns[name])
+        return result
+
+
+class OneHotEncoder(_EncoderBase):
+    """Replace each column by one ``column=category`` indicator column per category.
+
+    Unknown values get zeros in every indicator column.
+    """
+
+    name = "onehot_encoder"
+
+    def output_schema(self, schema: Mapping[str, str]) -> Optional[Dict[str, str]]:
+        if not self.fitted:
+            return None
+        for name in self.columns:
+            outputs = {f"{name}={value}": "num" for value in self.categories.get(name, np.empty(0)).tolist()}
+            schema = _replace(schema, [name], outputs)
+        return dict(schema)
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        result = dict(columns)
+        for name in self.columns:
+            codes = self._codes(name, columns[name])
+            categories = self.categories.get(name, np.empty(0))
+            indicators = np.zeros((len(codes), len(categories)), dtype=np.float64)
+            known = codes >= 0
+            indicators[np.flatnonzero(known), codes[known]] = 1.0
+            outputs = {f"{name}={value}": indicators[:, index] for index, value in enumerate(categories.tolist())}
+            result = _replace(result, [name], outputs)
+        return result
+
+
+class PCA(Transformer):
+    """Project numeric columns onto their principal components ``pc0``, ``pc1``, ...
+
+    The mean and covariance are accumulated exactly over chunks; rows with
+    non-finite values are skipped while fitting.
+    """
+
+    name = "pca"
+
+    def __init__(self, columns: Optional[Sequence[str]] = None, n_components: Optional[int] = None,
+                 whiten: bool = False, prefix: str = "pc"):
+        super().__init__(columns)
+        if n_components is not None and n_components < 1:
+            raise ValueError("n_components must be at least 1.")
+        self.n_components = n_components
+        self.whiten = whiten
+        self.prefix = prefix
+        self.count = 0
+        self.mean: Optional[np.ndarray] = None
+        self.scatter: Optional[np.ndarray] = None
+        self._decomposition: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _params(self) -> Dict[str, Any]:
+        return {"n_components": self.n_components, "whiten": self.whiten, "prefix": self.prefix}
+
+    def _outputs(self) -> List[str]:
+        count = min(self.n_components or len(self.columns), len(self.columns))
+        return [f"{self.prefix}{index}" for index in range(count)]
+
+    def output_schema(self, schema: Mapping[str, str]) -> Optional[Dict[str, str]]:
+        return _replace(schema, self.columns, {name: "num" for name in self._outputs()})
+
+    def written(self) -> List[str]:
+        return list(self.columns or []) + self._outputs()
+
+    def _seen(self) -> bool:
+        return self.count > 1
+
+    def _matrix(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in self.columns])
+
+    def _update(self, columns: Mapping[str, np.ndarray]) -> None:
+        matrix = self._matrix(columns)
+        matrix = matrix[np.isfinite(matrix).all(axis=1)]
+        if not len(matrix):
+            return
+        count = len(matrix)
+        mean = matrix.mean(axis=0)
+        centered = matrix - mean
+        scatter = centered.T @ centered
+        if self.count == 0:
+            self.count, self.mean, self.scatter = count, mean, scatter
+        else:
+            total = self.count + count
+            delta = mean - self.mean
+            self.scatter = self.scatter + scatter + np.outer(delta, delta) * (self.count * count / total)
+            self.mean = self.mean + delta * (count / total)
+            self.count = total
+        self._decomposition = None
+
+    def components(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(components, explained_variance)``, largest variance first.
+
+        Each component's largest coefficient is positive, so the result does
+        not depend on the eigen solver's sign choice.
+        """
+        if self._decomposition is None:
+            variance, vectors = np.linalg.eigh(self.scatter / (self.count - 1))
+            order = np.argsort(variance)[::-1][: len(self._outputs())]
+            vectors = vectors[:, order]
+            signs = np.sign(vectors[np.abs(vectors).argmax(axis=0), np.arange(vectors.shape[1])])
+            signs[signs == 0] = 1.0
+            self._decomposition = ((vectors * signs).T, np.clip(variance[order], 0.0, None))
+        return self._decomposition
+
+    def _apply(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        components, variance = self.components()
+        projected = (self._matrix(columns) - self.mean) @ components.T
+        if self.whiten:
+            projected /= np.sqrt(np.where(variance > 0, variance, 1.0))
+        return _replace(columns, self.columns, {name: projected[:, i] for i, name in enumerate(self._outputs())})
+
+    def _state(self) -> Dict[str, Any]:
+        if not self.count:
+            return {}
+        return {"count": self.count, "mean": self.mean.tolist(), "scatter": self.scatter.tolist()}
+
+    def _load(self, state: Mapping[str, Any]) -> None:
+        self.count = int(state["count"])
+        self.mean = np.asarray(state["mean"], dtype=np.float64)
+        self.scatter = np.asarray(state["scatter"], dtype=np.float64)
+
+
+TRANSFORMERS = {
+    cls.name: cls for cls in (StandardScaler, MinMaxScaler, OrdinalEncoder, OneHotEncoder, PCA)
+}
+
+
+ChunkSource = Union[Mapping[str, np.ndarray], Iterable[Mapping[str, np.ndarray]], Callable[[], Iterable]]
+
+
+class Pipeline:
+    """Sequence of transformers fitted in as few passes over the data as possible.
+
+    Out-of-core fitting calls :meth:`partial_fit` for every chunk and then
+    :meth:`end_pass`, repeating until :attr:`fitted`; :meth:`fit` does this
+    for a columnar dataset, a list of chunks or a callable returning a fresh
+    chunk iterator. Each pass fits the next run of unfitted steps that only
+    read columns already final at the start of the pass.
+
+    Attributes:
+        steps: Transformers applied in order.
+    """
+
+    def __init__(self, steps: Sequence[Union[Transformer, Mapping[str, Any]]]):
+        self.steps: List[Transformer] = [
+            step if isinstance(step, Transformer) else Transformer.from_dict(step) for step in steps
+        ]
+        self._run: Optional[Tuple[int, int]] = None
+        self._chunks = 0
+
+    @property
+    def fitted(self) -> bool:
+        """Whether every step is fitted."""
+        return all(step.fitted for step in self.steps)
+
+    def _start(self) -> int:
+        return next(index for index, step in enumerate(self.steps) if not step.fitted)
+
+    def _plan(self, start: int, schema: Dict[str, str]) -> Tuple[int, int]:
+        """Return the ``[start, stop)`` run of steps that can be fitted in one pass."""
+        written: set = set()
+        stop = start
+        current: Optional[Dict[str, str]] = schema
+        while stop < len(self.steps) and current is not None:
+            step = self.steps[stop]
+            if step.fitted:
+                break
+            inputs = step.resolve(current)
+            if stop > start and (written.intersection(inputs) or any(schema.get(n) != current[n] for n in inputs)):
+                break
+            written.update(step.written())
+            current = step.output_schema(current)
+            stop += 1
+        return start, stop
+
+    def _prefix(self, columns: Mapping[str, np.ndarray], stop: int) -> Columns:
+        for step in self.steps[:stop]:
+            columns = step.transform(columns)
+        return dict(columns)
+
+    def partial_fit(self, columns: Mapping[str, np.ndarray]) -> "Pipeline":
+        """Fold one chunk into the steps fitted in the current pass."""
+        if self.fitted:
+            return self
+        start = self._start()
+        base = self._prefix(columns, start)
+        if self._run is None:
+            self._run = self._plan(start, _schema(base))
+        for step in self.steps[self._run[0]:self._run[1]]:
+            step.partial_fit(base)
+        self._chunks += 1
+        return self
+
+    def end_pass(self) -> None:
+        """Finish the current pass, marking its steps fitted."""
+        if self._run is None or not self._chunks:
+            raise ValueError("No data was fitted in this pass")
+        for step in self.steps[self._run[0]:self._run[1]]:
+            step.finish()
+        logger.info(f"Fitted pipeline steps {[s.name for s in self.steps[self._run[0]:self._run[1]]]}")
+        self._run, self._chunks = None, 0
+
+    def fit(self, source: ChunkSource) -> "Pipeline":
+        """Fit every step, making one pass over ``source`` per run of steps.
+
+        Args:
+            source: Columnar dataset, list of chunks, or callable returning a
+                fresh iterable of chunks per pass. A one-shot iterator only
+                works when a single pass fits the whole pipeline.
+        """
+        single = isinstance(source, Iterator)
+        while not self.fitted:
+            if isinstance(source, Mapping):
+                chunks: Iterable = [source]
+            elif callable(source):
+                chunks = source()
+            else:
+                chunks = source
+            for chunk in chunks:
+                self.partial_fit(chunk)
+            self.end_pass()
+            if single and not self.fitted:
+                raise ValueError("Pipeline needs several passes; pass a callable returning fresh chunk iterators")
+        return self
+
+    def transform(self, columns: Mapping[str, np.ndarray]) -> Columns:
+        """Transform one columnar dataset or chunk."""
+        if not self.fitted:
+            raise RuntimeError("Pipeline is not fitted")
+        return self._prefix(columns, len(self.steps))
+
+    def transform_chunks(self, chunks: Iterable[Mapping[str, np.ndarray]]) -> Iterator[Columns]:
+        """Lazily transform a stream of chunks."""
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable description of the steps and their fitted state."""
+        return {"version": PIPELINE_VERSION, "steps": [step.to_dict() for step in self.steps]}
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "Pipeline":
+        """Rebuild a pipeline from :meth:`to_dict` output."""
+        if spec.get("version", PIPELINE_VERSION) != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported pipeline version {spec.get('version')!r}")
+        return cls(spec["steps"])
+
+    def save(self, path: str) -> None:
+        """Write the pipeline to a JSON file atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle)
+        os.chmod(tmp_path, default_file_mode())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Pipeline":
+        """Read a pipeline written by :meth:`save`."""
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
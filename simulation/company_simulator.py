@@ -0,0 +1,228 @@
+"""simulation.company_simulator
+
+Defines VirtualCompany and ConglomerateSimulator for asynchronous decision
+simulation across virtual companies.
+Companies are lightweight state machines driven by a discrete-event scheduler,
+so each decision costs a few heap operations instead of a real asyncio sleep.
+Consensus across companies is computed from their decision history.
+"""
+
+import asyncio
+import bisect
+import time as wall_time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.seeding import SeedManager
+
+from .consensus import ConsensusMatrix
+from .events import EventScheduler
+
+# Company states, visited cyclically: idle -> analyzing -> deciding -> executing.
+IDLE, ANALYZING, DECIDING, EXECUTING = range(4)
+STATE_NAMES = ("idle", "analyzing", "deciding", "executing")
+DEFAULT_OPTIONS = ("build", "partner", "acquire", "wait")
+# Mean number of simulated days spent in each state.
+DEFAULT_DURATIONS = (7.0, 14.0, 3.0, 30.0)
+
+_BUFFER_SIZE = 65_536
+
+
+class VirtualCompany:
+    """A virtual company modelled as a small state machine.
+
+    Attributes:
+        name: Company name.
+        state: Current state index (see ``STATE_NAMES``).
+        preferences: Probability of picking each option when deciding.
+        durations: Mean days spent in each state.
+        decisions: Number of times each option was chosen.
+        last_decision: Index of the most recent decision, or None.
+    """
+
+    __slots__ = ("name", "state", "preferences", "durations", "decisions", "last_decision", "_cumulative")
+
+    def __init__(
+        self, name: str, preferences: Sequence[float], durations: Sequence[float] = DEFAULT_DURATIONS
+    ):
+        """Initialize an idle company.
+
+        Args:
+            name (str): Company name.
+            preferences (Sequence[float]): Non-negative option weights; normalized.
+            durations (Sequence[float]): Mean days per state (four values).
+        """
+        weights = np.asarray(preferences, dtype=np.float64)
+        if weights.ndim != 1 or weights.size == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("preferences must be non-negative weights with a positive sum.")
+        if len(durations) != len(STATE_NAMES):
+            raise ValueError(f"durations must have {len(STATE_NAMES)} values.")
+        self.name = name
+        self.state = IDLE
+        self.preferences = (weights / weights.sum()).tolist()
+        self.durations = tuple(float(d) for d in durations)
+        self.decisions = [0] * weights.size
+        self.last_decision: Optional[int] = None
+        self._cumulative = np.cumsum(self.preferences).tolist()
+
+    def choose(self, draw: float) -> int:
+        """Pick an option from a uniform draw in [0, 1) and record it."""
+        option = min(bisect.bisect_right(self._cumulative, draw), len(self.decisions) - 1)
+        self.decisions[option] += 1
+        self.last_decision = option
+        return option
+
+
+class ConglomerateSimulator:
+    """Simulates decisions across many virtual companies in simulated time.
+
+    Attributes:
+        companies: The simulated companies.
+        options: Names of the options companies decide between.
+        scheduler: The underlying discrete-event scheduler.
+        reviews: Snapshots recorded by the periodic review timer.
+    """
+
+    def __init__(
+        self,
+        companies: Sequence[VirtualCompany],
+        options: Sequence[str] = DEFAULT_OPTIONS,
+        seed: int = 0,
+        review_interval: float = 90.0,
+    ):
+        """Initialize the simulator.
+
+        Args:
+            companies (Sequence[VirtualCompany]): Companies to simulate.
+            options (Sequence[str]): Option names; must match preference length.
+            seed (int): Seed for duration and decision draws.
+            review_interval (float): Days between review snapshots.
+        """
+        for company in companies:
+            if len(company.decisions) != len(options):
+                raise ValueError(f"Company '{company.name}' preferences do not match the options.")
+        self.companies: List[VirtualCompany] = list(companies)
+        self.options = tuple(options)
+        self.review_interval = review_interval
+        self.scheduler = EventScheduler()
+        self.reviews: List[Dict[str, Any]] = []
+        self.total_decisions = 0
+        self._rng = SeedManager(seed).generator("company_events")
+        self._exp: List[float] = []
+        self._uniform: List[float] = []
+        self._started = False
+
+    @classmethod
+    def generate(
+        cls, n_companies: int, options: Sequence[str] = DEFAULT_OPTIONS, seed: int = 0, **kwargs: Any
+    ) -> "ConglomerateSimulator":
+        """Create a simulator with randomly parameterized companies.
+
+        Args:
+            n_companies (int): Number of companies.
+            options (Sequence[str]): Option names.
+            seed (int): Seed for company traits and simulation draws.
+            **kwargs (Any): Forwarded to the constructor.
+
+        Returns:
+            ConglomerateSimulator: The new simulator.
+        """
+        rng = SeedManager(seed).generator("company_traits")
+        preferences = rng.dirichlet(np.ones(len(options)), size=n_companies)
+        speed = rng.uniform(0.5, 2.0, size=n_companies)
+        companies = [
+            VirtualCompany(f"company_{i}", preferences[i], [d * speed[i] for d in DEFAULT_DURATIONS])
+            for i in range(n_companies)
+        ]
+        return cls(companies, options, seed=seed, **kwargs)
+
+    def _next_exponential(self) -> float:
+        if not self._exp:
+            self._exp = self._rng.standard_exponential(_BUFFER_SIZE).tolist()
+        return self._exp.pop()
+
+    def _next_uniform(self) -> float:
+        if not self._uniform:
+            self._uniform = self._rng.random(_BUFFER_SIZE).tolist()
+        return self._uniform.pop()
+
+    def _advance(self, company: VirtualCompany) -> None:
+        """Leave the current state and schedule the next transition."""
+        if company.state == DECIDING:
+            company.choose(self._next_uniform())
+            self.total_decisions += 1
+        company.state = (company.state + 1) % len(STATE_NAMES)
+        delay = company.durations[company.state] * self._next_exponential()
+        self.scheduler.schedule(delay, self._advance, company)
+
+    def _review(self) -> None:
+        counts = self.decision_counts().sum(axis=0)
+        self.reviews.append({
+            "time": self.scheduler.now,
+            "decisions": self.total_decisions,
+            "by_option": dict(zip(self.options, counts.tolist())),
+        })
+
+    def _start(self) -> None:
+        for company in self.companies:
+            delay = company.durations[company.state] * self._next_exponential()
+            self.scheduler.schedule(delay, self._advance, company)
+        if self.review_interval > 0:
+            self.scheduler.every(self.review_interval, self._review)
+        self._started = True
+
+    def run(self, horizon: float) -> Dict[str, Any]:
+        """Advance the simulation by ``horizon`` simulated days.
+
+        Calling run again continues from where the previous call stopped.
+
+        Returns:
+            Dict[str, Any]: Summary with event counts, decisions per option and
+                throughput.
+        """
+        if not self._started:
+            self._start()
+        started = wall_time.perf_counter()
+        events = self.scheduler.run(until=self.scheduler.now + horizon)
+        elapsed = wall_time.perf_counter() - started
+        counts = self.decision_counts().sum(axis=0)
+        return {
+            "companies": len(self.companies),
+            "simulated_days": self.scheduler.now,
+            "events": events,
+            "decisions": self.total_decisions,
+            "by_option": dict(zip(self.options, counts.tolist())),
+            "states": {name: sum(c.state == i for c in self.companies) for i, name in enumerate(STATE_NAMES)},
+            "elapsed_seconds": elapsed,
+            "events_per_second": events / elapsed if elapsed > 0 else float("inf"),
+        }
+
+    def decision_counts(self) -> np.ndarray:
+        """Return the companies x options matrix of decision counts."""
+        return np.array([c.decisions for c in self.companies], dtype=np.int64).reshape(
+            len(self.companies), len(self.options)
+        )
+
+    def consensus(self, company_weights: Optional[Sequence[float]] = None) -> ConsensusMatrix:
+        """Build a consensus matrix whose votes are each company's decision shares."""
+        counts = self.decision_counts().astype(np.float64)
+        totals = counts.sum(axis=1, keepdims=True)
+        shares = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+        return ConsensusMatrix.from_votes(
+            [c.name for c in self.companies], self.options, shares, company_weights=company_weights
+        )
+
+    async def simulate_conglomerate_decision(self, problem: str, horizon: float = 365.0) -> Dict[str, Any]:
+        """Async entrypoint: simulate company decisions for a problem.
+
+        The discrete-event run is CPU bound, so it is executed in a worker
+        thread to keep the event loop responsive.
+        """
+        if not isinstance(problem, str) or not problem.strip():
+            raise ValueError("Problem must be a non-empty string")
+        summary = await asyncio.to_thread(self.run, horizon)
+        summary["problem"] = problem
+        summary["consensus"] = self.consensus().results()
+        summary["recommendation"] = summary["consensus"]["recommendation"]
+        return summary
@@ -0,0 +1,172 @@
+"""simulation.consensus
+
+Defines the ConsensusMatrix class for consensus and recommendation generation
+across companies.
+Votes are held as a companies x options score matrix and tallied with NumPy
+under weighted majority, Borda and approval rules. Running totals are kept for
+all three rules so a single company changing its vote costs O(options).
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _contributions(
+    votes: np.ndarray, weights: np.ndarray, approval_threshold: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-option majority, Borda and approval totals for some rows.
+
+    Rows without a positive score count as abstentions.
+    """
+    n_rows, n_options = votes.shape
+    active = votes.max(axis=1, initial=0.0) > 0
+    row_weights = np.where(active, weights, 0.0)
+
+    majority = np.bincount(votes.argmax(axis=1), weights=row_weights, minlength=n_options)
+
+    order = np.argsort(-votes, axis=1, kind="stable")
+    points = np.empty_like(votes)
+    ranks = np.broadcast_to(np.arange(n_options - 1, -1, -1, dtype=votes.dtype), votes.shape)
+    np.put_along_axis(points, order, ranks, axis=1)
+    borda = row_weights @ points
+
+    top = votes.max(axis=1, keepdims=True, initial=0.0)
+    approved = (votes >= approval_threshold * top) & active[:, None]
+    approval = row_weights @ approved
+    return majority, borda, approval
+
+
+class ConsensusMatrix:
+    """Weighted votes of companies over options.
+
+    Each company scores every option (higher is better). A company's top
+    score is its majority vote, its ranking gives Borda points
+    (``n_options - 1`` for first place down to 0), and it approves every
+    option scoring at least ``approval_threshold`` times its top score.
+
+    Attributes:
+        companies: Company names (rows).
+        options: Option names (columns).
+        votes: The companies x options score matrix.
+        weights: Voting weight of each company.
+    """
+
+    def __init__(
+        self,
+        companies: Sequence[str],
+        options: Sequence[str],
+        company_weights: Optional[Sequence[float]] = None,
+        approval_threshold: float = 0.5,
+    ):
+        """Initialize an empty matrix where every company abstains.
+
+        A company abstains while none of its scores is positive.
+
+        Args:
+            companies (Sequence[str]): Company names.
+            options (Sequence[str]): Option names.
+            company_weights (Optional[Sequence[float]]): Voting weights; default 1.
+            approval_threshold (float): Fraction of a company's top score an
+                option needs to be approved, in (0, 1].
+        """
+        if not 0 < approval_threshold <= 1:
+            raise ValueError("approval_threshold must be in (0, 1].")
+        self.companies = list(companies)
+        self.options = list(options)
+        self._index = {name: i for i, name in enumerate(self.companies)}
+        self.approval_threshold = approval_threshold
+        self.votes = np.zeros((len(self.companies), len(self.options)), dtype=np.float64)
+        if company_weights is None:
+            self.weights = np.ones(len(self.companies), dtype=np.float64)
+        else:
+            self.weights = np.asarray(company_weights, dtype=np.float64).copy()
+            if self.weights.shape != (len(self.companies),):
+                raise ValueError("company_weights must have one entry per company.")
+        self.recompute()
+
+    @classmethod
+    def from_votes(
+        cls, companies: Sequence[str], options: Sequence[str], votes: Any, **kwargs: Any
+    ) -> "ConsensusMatrix":
+        """Build a matrix from a full companies x options score array."""
+        matrix = cls(companies, options, **kwargs)
+        scores = np.asarray(votes, dtype=np.float64)
+        if scores.shape != matrix.votes.shape:
+            raise ValueError(f"votes must have shape {matrix.votes.shape}, got {scores.shape}")
+        matrix.votes[:] = scores
+        matrix.recompute()
+        return matrix
+
+    def recompute(self) -> None:
+        """Recompute every running total from the full matrix."""
+        self._majority, self._borda, self._approval = _contributions(
+            self.votes, self.weights, self.approval_threshold
+        )
+
+    def _apply_row(self, row: int, sign: float) -> None:
+        majority, borda, approval = _contributions(
+            self.votes[row : row + 1], self.weights[row : row + 1], self.approval_threshold
+        )
+        self._majority += sign * majority
+        self._borda += sign * borda
+        self._approval += sign * approval
+
+    def update_vote(self, company: str, scores: Sequence[float]) -> None:
+        """Replace one company's scores, updating totals incrementally.
+
+        Args:
+            company (str): Company name.
+            scores (Sequence[float]): New score for every option.
+        """
+        row = self._index[company]
+        new_scores = np.asarray(scores, dtype=np.float64)
+        if new_scores.shape != (len(self.options),):
+            raise ValueError(f"scores must have {len(self.options)} entries.")
+        self._apply_row(row, -1.0)
+        self.votes[row] = new_scores
+        self._apply_row(row, 1.0)
+
+    def set_company_weight(self, company: str, weight: float) -> None:
+        """Change one company's voting weight, updating totals incrementally."""
+        row = self._index[company]
+        self._apply_row(row, -1.0)
+        self.weights[row] = weight
+        self._apply_row(row, 1.0)
+
+    def _result(self, totals: np.ndarray) -> Dict[str, Any]:
+        grand_total = totals.sum()
+        winner = int(totals.argmax()) if grand_total > 0 else None
+        return {
+            "winner": None if winner is None else self.options[winner],
+            "totals": dict(zip(self.options, totals.tolist())),
+            "share": float(totals[winner] / grand_total) if winner is not None else 0.0,
+        }
+
+    def weighted_majority(self) -> Dict[str, Any]:
+        """Tally each company's top option, weighted by company weight."""
+        return self._result(self._majority)
+
+    def borda(self) -> Dict[str, Any]:
+        """Tally weighted Borda points."""
+        return self._result(self._borda)
+
+    def approval(self) -> Dict[str, Any]:
+        """Tally weighted approvals."""
+        return self._result(self._approval)
+
+    def results(self) -> Dict[str, Any]:
+        """Return all three tallies and a recommendation.
+
+        The recommendation is the majority winner, flagged as a consensus when
+        Borda and approval agree with it.
+        """
+        majority, borda, approval = self.weighted_majority(), self.borda(), self.approval()
+        return {
+            "weighted_majority": majority,
+            "borda": borda,
+            "approval": approval,
+            "recommendation": majority["winner"],
+            "consensus": majority["winner"] is not None
+            and majority["winner"] == borda["winner"] == approval["winner"],
+        }
@@ -0,0 +1,141 @@
+"""simulation.events
+
+Defines the EventScheduler class, a discrete-event simulation core.
+Events are kept in a binary heap ordered by simulated time, so simulating
+years of activity costs only the number of events processed, not wall time.
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+
+class EventScheduler:
+    """Heap-based discrete-event scheduler.
+
+    Events scheduled for the same time fire in scheduling order. Cancellation
+    is lazy: cancelled events stay in the heap and are skipped when popped.
+
+    Attributes:
+        now: Current simulated time.
+        processed: Number of events executed so far.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        """Initialize an empty scheduler.
+
+        Args:
+            start_time (float): Initial simulated time.
+        """
+        self.now: float = start_time
+        self.processed: int = 0
+        self._queue: List[Tuple[float, int, Callable[..., Any], tuple]] = []
+        self._counter = itertools.count()
+        self._cancelled: Set[int] = set()
+        self._timers: Set[int] = set()
+
+    def __len__(self) -> int:
+        """Return the number of queued events (including lazily cancelled ones)."""
+        return len(self._queue)
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> int:
+        """Schedule ``callback(*args)`` to run ``delay`` time units from now.
+
+        Args:
+            delay (float): Non-negative delay.
+            callback (Callable[..., Any]): Function to call.
+            *args (Any): Positional arguments for the callback.
+
+        Returns:
+            int: Event id usable with :meth:`cancel`.
+        """
+        if delay < 0:
+            raise ValueError("Events cannot be scheduled in the past.")
+        return self.schedule_at(self.now + delay, callback, *args)
+
+    def schedule_at(self, time: float, callback: Callable[..., Any], *args: Any) -> int:
+        """Schedule ``callback(*args)`` at an absolute simulated time.
+
+        Returns:
+            int: Event id usable with :meth:`cancel`.
+        """
+        if time < self.now:
+            raise ValueError("Events cannot be scheduled in the past.")
+        event_id = next(self._counter)
+        heapq.heappush(self._queue, (time, event_id, callback, args))
+        return event_id
+
+    def every(
+        self, interval: float, callback: Callable[..., Any], *args: Any, start: Optional[float] = None
+    ) -> int:
+        """Schedule a repeating timer.
+
+        Firing times are computed as ``start + k * interval`` so the timer
+        never drifts, whatever the callbacks do.
+
+        Args:
+            interval (float): Positive period.
+            callback (Callable[..., Any]): Function to call on every tick.
+            *args (Any): Positional arguments for the callback.
+            start (Optional[float]): First firing time; defaults to now + interval.
+
+        Returns:
+            int: Timer id usable with :meth:`cancel`.
+        """
+        if interval <= 0:
+            raise ValueError("Timer interval must be positive.")
+        first = self.now + interval if start is None else start
+        timer_id = next(self._counter)
+        self._timers.add(timer_id)
+
+        def tick(tick_index: int) -> None:
+            if timer_id not in self._timers:
+                return
+            callback(*args)
+            self.schedule_at(first + (tick_index + 1) * interval, tick, tick_index + 1)
+
+        self.schedule_at(first, tick, 0)
+        return timer_id
+
+    def cancel(self, event_id: int) -> None:
+        """Cancel a pending event or stop a repeating timer.
+
+        Args:
+            event_id (int): Id returned by :meth:`schedule`, :meth:`schedule_at`
+                or :meth:`every`.
+        """
+        if event_id in self._timers:
+            self._timers.discard(event_id)
+        else:
+            self._cancelled.add(event_id)
+
+    def run(self, until: Optional[float] = None, max_events: Optional[int] = None) -> int:
+        """Process events in time order.
+
+        Args:
+            until (Optional[float]): Stop before events later than this time;
+                the clock is then advanced to ``until``.
+            max_events (Optional[int]): Stop after this many events.
+
+        Returns:
+            int: Number of events processed by this call.
+        """
+        queue = self._queue
+        cancelled = self._cancelled
+        heappop = heapq.heappop
+        budget = float("inf") if max_events is None else max_events
+        count = 0
+        while queue and count < budget:
+            if until is not None and queue[0][0] > until:
+                break
+            time, event_id, callback, args = heappop(queue)
+            if cancelled and event_id in cancelled:
+                cancelled.discard(event_id)
+                continue
+            self.now = time
+            callback(*args)
+            count += 1
+        if until is not None and (not queue or queue[0][0] > until):
+            self.now = max(self.now, until)
+        self.processed += count
+        return count
@@ -0,0 +1,104 @@
+"""simulation.keyword_automaton
+
+Defines the KeywordAutomaton class, a compiled multi-pattern matcher
+(Aho-Corasick) used to scan problem statements against many weighted
+keywords and phrases in a single pass per statement.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of patterns.
+
+    The automaton is built once from the patterns and then reused to scan any
+    number of texts. Matching is case-insensitive and substring based, so a
+    pattern matches wherever it occurs inside a text.
+
+    Attributes:
+        patterns: The lower-cased patterns, indexed by pattern id.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        """Compile the automaton for the given patterns.
+
+        Args:
+            patterns (Sequence[str]): Keywords or phrases to match. Empty
+                patterns are rejected.
+
+        Raises:
+            ValueError: If a pattern is empty.
+        """
+        self.patterns: List[str] = [p.lower() for p in patterns]
+        # Trie transitions, failure links and per-state output pattern ids.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        outputs: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Patterns must be non-empty strings.")
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(pattern_id)
+
+        # Breadth-first pass to resolve failure links and merge outputs.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+        self._out = [tuple(sorted(set(ids))) for ids in outputs]
+
+    def __len__(self) -> int:
+        """Return the number of compiled patterns."""
+        return len(self.patterns)
+
+    def find(self, text: str) -> Set[int]:
+        """Return the ids of all patterns occurring in a text.
+
+        Args:
+            text (str): Text to scan.
+
+        Returns:
+            Set[int]: Ids of the matched patterns (each reported once).
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        matched: Set[int] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                matched.update(out[state])
+        return matched
+
+    def find_all(self, texts: Iterable[str]) -> List[Set[int]]:
+        """Scan several texts.
+
+        Args:
+            texts (Iterable[str]): Texts to scan.
+
+        Returns:
+            List[Set[int]]: Matched pattern ids for each text, in order.
+        """
+        return [self.find(text) for text in texts]
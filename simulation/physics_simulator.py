@@ -3,13 +3,63 @@ from __future__ import annotations
 simulation.physics_simulator
 
 Physics simulator placeholder for basic feasibility checks.
+- Scores problem statements against a weighted keyword/phrase rule table
+- Batch scoring uses a compiled Aho-Corasick automaton built once per rule table
 """
-from typing import Dict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .keyword_automaton import KeywordAutomaton
+
+# Base score for a problem that matches no rule, and the default rule table.
+BASE_SCORE = 0.5
+DEFAULT_RULES: Dict[str, float] = {"energy": 0.2}
 
 
 class PhysicsSimulator:
-    """Performs simple physics feasibility checks (placeholder)."""
+    """Performs simple physics feasibility checks (placeholder).
+
+    A problem starts at ``base_score``; every rule (keyword or phrase) found in
+    it adds its weight once, and the total is clipped to [0, 1].
+    """
+
+    def __init__(self, rules: Optional[Mapping[str, float]] = None, base_score: float = BASE_SCORE):
+        self.base_score = base_score
+        self.set_rules(DEFAULT_RULES if rules is None else rules)
+
+    def set_rules(self, rules: Mapping[str, float]) -> None:
+        """Replace the rule table and recompile the matcher."""
+        self.rules: List[str] = [phrase.lower() for phrase in rules]
+        self.weights = np.asarray(list(rules.values()), dtype=np.float64)
+        self._automaton = KeywordAutomaton(self.rules)
 
     def feasibility_score(self, problem: str) -> float:
-        """Return a dummy score between 0 and 1."""
-        return 0.7 if "energy" in problem.lower() else 0.5
+        """Return a score between 0 and 1."""
+        scores, _ = self.feasibility_scores([problem])
+        return float(scores[0])
+
+    def feasibility_scores(self, problems: Iterable[str]) -> Tuple[np.ndarray, List[List[str]]]:
+        """Score many problems in one pass over the compiled rule table.
+
+        Returns:
+            The score array (one float per problem) and, per problem, the
+            matched rules in rule-table order.
+        """
+        find = self._automaton.find
+        problem_ids: List[int] = []
+        rule_ids: List[int] = []
+        matched: List[List[str]] = []
+        for index, problem in enumerate(problems):
+            hits = sorted(find(problem))
+            problem_ids.extend([index] * len(hits))
+            rule_ids.extend(hits)
+            matched.append([self.rules[i] for i in hits])
+
+        totals = np.bincount(
+            np.asarray(problem_ids, dtype=np.intp),
+            weights=self.weights[np.asarray(rule_ids, dtype=np.intp)],
+            minlength=len(matched),
+        )
+        scores = np.clip(self.base_score + totals, 0.0, 1.0)
+        return scores, matched
@@ -0,0 +1,195 @@
+"""simulation.result_cache
+
+Defines the ScenarioCache class, a content-addressed cache for scenario results.
+Results are keyed by a stable hash of the problem, scenario parameters and engine
+version, kept in an in-memory LRU tier and optionally in an on-disk tier made of
+zlib-compressed JSON blobs with a total size cap.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def json_default(value: Any) -> Any:
+    """Make NumPy values and other containers JSON-serializable."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stable_hash(payload: Any) -> str:
+    """Return a SHA-256 hex digest of a canonical JSON encoding of ``payload``.
+
+    Dict key order does not affect the digest.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ScenarioCache:
+    """Two-tier content-addressed cache for scenario results.
+
+    Attributes:
+        cache_dir: Directory of the disk tier, or None for memory only.
+        max_memory_entries: Capacity of the in-memory LRU tier.
+        max_disk_bytes: Size cap of the disk tier; least recently used blobs
+            are evicted once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        """Initialize the cache and index any blobs already on disk.
+
+        Args:
+            cache_dir (Optional[str]): Disk tier directory (created if needed).
+            max_memory_entries (int): Number of results kept in memory.
+            max_disk_bytes (int): Maximum total size of the disk tier.
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    @staticmethod
+    def make_key(problem: str, parameters: Optional[Dict[str, Any]], version: str) -> str:
+        """Build the content address for a scenario run.
+
+        Args:
+            problem (str): Problem statement.
+            parameters (Optional[Dict[str, Any]]): Scenario parameters.
+            version (str): Engine version; bumping it invalidates old entries.
+
+        Returns:
+            str: Hex digest key.
+        """
+        return stable_hash({"problem": problem, "parameters": parameters or {}, "version": version})
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.z")
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for blob in os.scandir(shard.path):
+                if blob.name.endswith(".json.z"):
+                    stat = blob.stat()
+                    entries.append((stat.st_mtime, blob.name[: -len(".json.z")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None on a miss.
+
+        Args:
+            key (str): Key from :meth:`make_key`.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return copy.deepcopy(self._memory[key])
+            if key in self._disk:
+                path = self._blob_path(key)
+                try:
+                    with open(path, "rb") as handle:
+                        value = json.loads(zlib.decompress(handle.read()).decode("utf-8"))
+                    os.utime(path)
+                except (OSError, ValueError, zlib.error):
+                    self._drop_disk(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._stats["disk_hits"] += 1
+                    self._remember(key, value)
+                    return copy.deepcopy(value)
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result in both tiers.
+
+        Args:
+            key (str): Key from :meth:`make_key`.
+            value (Dict[str, Any]): JSON-serializable result.
+        """
+        encoded = json.dumps(value, sort_keys=True, default=json_default)
+        with self._lock:
+            self._remember(key, json.loads(encoded))
+            if self.cache_dir:
+                self._write_blob(key, zlib.compress(encoded.encode("utf-8"), 6))
+
+    def _remember(self, key: str, value: Dict[str, Any]) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _write_blob(self, key: str, blob: bytes) -> None:
+        path = self._blob_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(blob)
+        os.replace(tmp_path, path)
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+        self._disk[key] = len(blob)
+        self._disk_bytes += len(blob)
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            oldest = next(iter(self._disk))
+            self._drop_disk(oldest)
+            self._stats["disk_evictions"] += 1
+
+    def _drop_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.remove(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk):
+                self._drop_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and tier sizes."""
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = lookups - self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,380 @@
+"""simulation.statistics
+
+Streaming statistics for large simulation sweeps.
+Provides constant-memory, mergeable accumulators so partial results computed
+by separate workers can be combined without keeping the raw samples.
+- RunningStats: count, mean, variance, min and max
+- QuantileSketch: KLL-style quantile estimates
+- TopK: the k largest or smallest values with their keys
+- MetricAggregator: all of the above per numeric metric of streamed records
+"""
+
+import heapq
+from numbers import Real
+from typing import Any, Dict, Hashable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class RunningStats:
+    """Streaming count, mean, variance, min and max (Welford/Chan).
+
+    Batches are folded in with Chan's parallel update, so feeding one large
+    array, many small arrays or merging partial accumulators all give the
+    same result up to floating-point rounding.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: float = float("inf")
+        self.max: float = float("-inf")
+
+    def update(self, values: Sequence[float]) -> None:
+        """Fold a batch of values into the accumulator.
+
+        Args:
+            values (Sequence[float]): Observations; NaNs are not filtered.
+        """
+        batch = np.asarray(values, dtype=np.float64).ravel()
+        if batch.size == 0:
+            return
+        mean = float(batch.mean())
+        m2 = float(((batch - mean) ** 2).sum())
+        self._combine(batch.size, mean, m2, float(batch.min()), float(batch.max()))
+
+    def merge(self, other: "RunningStats") -> None:
+        """Merge another accumulator into this one.
+
+        Args:
+            other (RunningStats): Partial accumulator to absorb.
+        """
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1); 0.0 with fewer than two observations."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self) -> Dict[str, float]:
+        """Return the summary as plain Python numbers."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch with bounded memory.
+
+    Items live in a hierarchy of compactors; an item at level ``h`` stands for
+    ``2**h`` observations. When a level exceeds its capacity it is sorted and
+    every other item is promoted to the next level. Compaction offsets
+    alternate per level, which keeps the sketch deterministic for a given
+    input order.
+    """
+
+    def __init__(self, k: int = 256):
+        """Initialize the sketch.
+
+        Args:
+            k (int): Capacity of the top compactor; larger is more accurate.
+        """
+        if k < 8:
+            raise ValueError("k must be at least 8.")
+        self.k = k
+        self.count: int = 0
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._offsets: List[int] = [0]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: Sequence[float]) -> None:
+        """Add a batch of observations.
+
+        Args:
+            values (Sequence[float]): Observations to add.
+        """
+        batch = np.asarray(values, dtype=np.float64).ravel()
+        if batch.size == 0:
+            return
+        self.count += batch.size
+        self._levels[0] = np.concatenate([self._levels[0], batch])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch to absorb.
+        """
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+            self._offsets.append(0)
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0, dtype=np.float64))
+                self._offsets.append(0)
+            items = np.sort(items)
+            even = len(items) - len(items) % 2
+            offset = self._offsets[level]
+            self._offsets[level] ^= 1
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], items[offset:even:2]])
+            self._levels[level] = items[even:]
+            # Capacities of lower levels shrink as the hierarchy grows.
+            level = 0
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Estimate quantiles.
+
+        Args:
+            qs (Sequence[float]): Quantile levels in [0, 1].
+
+        Returns:
+            List[float]: Estimated values, NaN when the sketch is empty.
+        """
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        targets = np.clip(np.asarray(qs, dtype=np.float64), 0.0, 1.0) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, targets, side="left"), len(items) - 1)
+        return [float(v) for v in items[index]]
+
+    def __len__(self) -> int:
+        """Return the number of retained items."""
+        return sum(len(items) for items in self._levels)
+
+
+class TopK:
+    """Mergeable k largest (or smallest) values, each with a key.
+
+    Ties keep the entry seen first.
+    """
+
+    def __init__(self, k: int = 10, largest: bool = True):
+        """Initialize an empty heap.
+
+        Args:
+            k (int): Number of entries to keep.
+            largest (bool): Keep the largest values, otherwise the smallest.
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1.")
+        self.k = k
+        self.largest = largest
+        # Min-heap of (signed value, -sequence, key); the root is the entry to evict next.
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seen = 0
+
+    def update(self, values: Sequence[float], keys: Sequence[Any]) -> None:
+        """Offer a batch of values with their keys.
+
+        Args:
+            values (Sequence[float]): Candidate values; NaNs are ignored.
+            keys (Sequence[Any]): One key per value.
+        """
+        batch = np.asarray(values, dtype=np.float64).ravel()
+        signed = batch if self.largest else -batch
+        index = np.flatnonzero(~np.isnan(signed))
+        if len(index) > self.k:
+            # Only the batch's own top k can enter the heap.
+            index = index[np.argpartition(-signed[index], self.k - 1)[: self.k]]
+        for i in np.sort(index).tolist():
+            self._push(float(signed[i]), self._seen + i, keys[i])
+        self._seen += batch.size
+
+    def _push(self, signed: float, sequence: int, key: Any) -> None:
+        entry = (signed, -sequence, key)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopK") -> None:
+        """Merge another heap into this one; its entries rank after this one's on ties.
+
+        Args:
+            other (TopK): Heap with the same direction to absorb.
+        """
+        if other.largest != self.largest:
+            raise ValueError("Cannot merge TopK heaps of opposite direction.")
+        for signed, negated_sequence, key in other._heap:
+            self._push(signed, self._seen - negated_sequence, key)
+        self._seen += other._seen
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """Return ``(value, key)`` pairs, best first."""
+        ordered = sorted(self._heap, reverse=True)
+        return [(signed if self.largest else -signed, key) for signed, _, key in ordered]
+
+    def __len__(self) -> int:
+        """Return the number of retained entries."""
+        return len(self._heap)
+
+
+def numeric_leaves(record: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yield ``(dotted path, value)`` for every real-number leaf of nested mappings.
+
+    Booleans, strings and sequences are skipped; a bare number is yielded
+    under ``prefix`` (or ``"value"`` without one).
+    """
+    if isinstance(record, Mapping):
+        for name, value in record.items():
+            yield from numeric_leaves(value, f"{prefix}.{name}" if prefix else str(name))
+    elif isinstance(record, (Real, np.number)) and not isinstance(record, (bool, np.bool_)):
+        yield prefix or "value", float(record)
+
+
+class MetricAggregator:
+    """Streaming per-metric summaries of records such as simulation results.
+
+    Every numeric leaf of a record (see :func:`numeric_leaves`) is a metric;
+    each metric keeps RunningStats, a QuantileSketch and the top and bottom
+    ``top_k`` values keyed by record key. Values are buffered and folded in
+    vectorized batches, so memory is bounded by the number of metrics, not
+    the number of records. Aggregators fed by separate workers are combined
+    with :meth:`merge`.
+
+    Attributes:
+        metrics: Metric paths to track, or None to track every numeric leaf.
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[Sequence[str]] = None,
+        top_k: int = 10,
+        sketch_k: int = 256,
+        buffer_size: int = 4096,
+    ):
+        """Initialize an empty aggregator.
+
+        Args:
+            metrics (Optional[Sequence[str]]): Metric paths to track.
+            top_k (int): Entries kept by each top and bottom heap.
+            sketch_k (int): Quantile sketch size.
+            buffer_size (int): Values buffered per metric before folding.
+        """
+        self.metrics = None if metrics is None else set(metrics)
+        self.top_k = top_k
+        self.sketch_k = sketch_k
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._stats: Dict[str, RunningStats] = {}
+        self._sketches: Dict[str, QuantileSketch] = {}
+        self._top: Dict[str, TopK] = {}
+        self._bottom: Dict[str, TopK] = {}
+        self._buffers: Dict[str, Tuple[List[float], List[Hashable]]] = {}
+
+    def add(self, record: Any, key: Hashable = None) -> None:
+        """Feed one record.
+
+        Args:
+            record (Any): Number or nested mapping of numbers.
+            key (Hashable): Identifier reported by the top and bottom heaps.
+        """
+        self.records += 1
+        for name, value in numeric_leaves(record):
+            if self.metrics is not None and name not in self.metrics:
+                continue
+            values, keys = self._buffers.setdefault(name, ([], []))
+            values.append(value)
+            keys.append(key)
+            if len(values) >= self.buffer_size:
+                self._fold(name)
+
+    def _fold(self, name: str) -> None:
+        values, keys = self._buffers.get(name, ([], []))
+        if name not in self._stats:
+            self._stats[name] = RunningStats()
+            self._sketches[name] = QuantileSketch(self.sketch_k)
+            self._top[name] = TopK(self.top_k, largest=True)
+            self._bottom[name] = TopK(self.top_k, largest=False)
+        if not values:
+            return
+        batch = np.asarray(values, dtype=np.float64)
+        self._stats[name].update(batch)
+        self._sketches[name].update(batch)
+        self._top[name].update(batch, keys)
+        self._bottom[name].update(batch, keys)
+        self._buffers[name] = ([], [])
+
+    def flush(self) -> None:
+        """Fold every buffered value into the summaries."""
+        for name in list(self._buffers):
+            self._fold(name)
+
+    def merge(self, other: "MetricAggregator") -> None:
+        """Merge another aggregator into this one.
+
+        Args:
+            other (MetricAggregator): Partial aggregator to absorb.
+        """
+        self.flush()
+        other.flush()
+        self.records += other.records
+        for name in other._stats:
+            self._fold(name)
+            self._stats[name].merge(other._stats[name])
+            self._sketches[name].merge(other._sketches[name])
+            self._top[name].merge(other._top[name])
+            self._bottom[name].merge(other._bottom[name])
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        """Return the per-metric summary as plain Python values.
+
+        Args:
+            quantiles (Sequence[float]): Quantile levels to estimate.
+
+        Returns:
+            Dict[str, Any]: ``records`` and, per metric, its statistics,
+            ``quantiles``, ``top`` and ``bottom`` lists of ``[value, key]``.
+        """
+        self.flush()
+        metrics = {}
+        for name in sorted(self._stats):
+            entry: Dict[str, Any] = self._stats[name].to_dict()
+            estimates = self._sketches[name].quantiles(quantiles)
+            entry["quantiles"] = {str(q): v for q, v in zip(quantiles, estimates)}
+            entry["top"] = [[value, key] for value, key in self._top[name].items()]
+            entry["bottom"] = [[value, key] for value, key in self._bottom[name].items()]
+            metrics[name] = entry
+        return {"records": self.records, "metrics": metrics}
@@ -1,8 +1,12 @@
 """Test cases for the core module."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 from core.orchestrator import Orchestrator
+from core.seeding import SeedManager
 from core.utils import read_config, setup_logger, handle_error
 
 
@@ -130,6 +134,37 @@ class TestUtils:
             assert f"Error occurred: {type(exc).__name__}" in caplog.text
 
 
+class TestSeedManager:
+    """Test cases for the SeedManager class."""
+
+    def test_streams_are_reproducible_and_independent(self):
+        """Test the same address gives the same stream and others differ."""
+        seeds = SeedManager(42)
+        first = seeds.scenario(3).random(5)
+        np.testing.assert_array_equal(first, SeedManager(42).scenario(3).random(5))
+        assert not np.array_equal(first, seeds.scenario(4).random(5))
+        assert not np.array_equal(first, seeds.material(3).random(5))
+        assert not np.array_equal(first, SeedManager(43).scenario(3).random(5))
+        np.testing.assert_array_equal(seeds.material("Fe-C").random(3), seeds.material("Fe-C").random(3))
+
+    def test_results_independent_of_scheduling(self):
+        """Test keyed streams give identical results under any worker count or order."""
+        seeds = SeedManager(7)
+
+        def work(index):
+            return index, seeds.sequence("scenario", index).generate_state(2).tolist()
+
+        serial = dict(work(i) for i in range(16))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            parallel = dict(pool.map(work, reversed(range(16))))
+        assert parallel == serial
+
+    def test_negative_key_rejected(self):
+        """Test negative integer keys are rejected."""
+        with pytest.raises(ValueError):
+            SeedManager(1).generator("scenario", -1)
+
+
 def test_core_placeholder():
     """Placeholder test for the core module."""
     assert True
\ No newline at end of file
@@ -1,6 +1,36 @@
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
-from innovation.research import Research
+
+import numpy as np
+
+from innovation.research import Research, ResearchModule
 from innovation.material_discovery import MaterialDiscovery
+from innovation.catalog import MaterialsCatalog
+from innovation.cross_pollinator import CrossPollinationEngine
+from innovation.elements import ELEMENTS, PROPERTY_NAMES, property_table
+from innovation.pareto import ParetoFront, non_dominated_sort, pareto_mask
+from innovation.property_model import BatchPropertyPredictor, PropertyModel
+from innovation.screening import simplex_grid
+
+
+def _sleep_and_sum(params, inputs):
+    time.sleep(params.get("sleep", 0.0))
+    return params.get("value", 0) + sum(inputs.values())
+
+
+def _clip(params, inputs):
+    return min(params["max"], sum(inputs.values()))
+
+
+def _fail(params, inputs):
+    raise RuntimeError("boom")
+
 
 class TestInnovation(unittest.TestCase):
 
@@ -26,5 +56,455 @@ class TestInnovation(unittest.TestCase):
         opt = discovery.optimize_material({"hardness": "medium"})
         self.assertEqual(opt["status"], "optimized")
 
+    def test_discover_new_material_ranks_grid(self):
+        discovery = MaterialDiscovery()
+        result = discovery.discover_new_material({"strength": "high"}, {"composition": "Fe-C"}, top_k=3)
+        self.assertEqual(result["elements"], ["Fe", "C"])
+        self.assertEqual(result["screened"], 21)
+        self.assertEqual(result["candidates"][0]["composition"], {"Fe": 1.0})
+        scores = [c["score"] for c in result["candidates"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_discover_new_material_pruning_matches_brute_force(self):
+        discovery = MaterialDiscovery()
+        elements = ["Fe", "Al", "Ti", "Mg"]
+        constraints = {"elements": elements, "density": {"max": 3.5}, "max_fraction": {"Ti": 0.5}}
+        result = discovery.discover_new_material(
+            {"strength": "high"}, constraints, top_k=1, resolution=30, chunk_size=50
+        )
+        grid = simplex_grid(30, 4) / 30
+        props = grid @ property_table(elements)
+        feasible = (props[:, 0] <= 3.5 + 1e-9) & (grid[:, 2] <= 0.5 + 1e-9)
+        self.assertEqual(result["feasible"], int(feasible.sum()))
+        self.assertLess(result["screened"], len(grid))
+        self.assertGreater(result["pruned_regions"], 0)
+        self.assertAlmostEqual(result["candidates"][0]["properties"]["strength"], props[feasible, 3].max())
+
+    def test_discover_new_material_explicit_candidates(self):
+        discovery = MaterialDiscovery()
+        candidates = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+        result = discovery.discover_new_material(
+            {"density": "low"}, {"elements": ["Fe", "Al"], "cost": (0, 2)}, candidates=candidates, chunk_size=2
+        )
+        self.assertEqual(result["screened"], 3)
+        self.assertEqual([c["composition"] for c in result["candidates"]], [{"Al": 0.5, "Fe": 0.5}, {"Fe": 1.0}])
+
+    def test_predict_material_properties(self):
+        discovery = MaterialDiscovery()
+        pred = discovery.predict_material_properties({"Fe": 2, "C": 2, "note": "x"})
+        table = property_table(["Fe", "C"])
+        self.assertAlmostEqual(pred["properties"]["density"], table[:, 0].mean())
+        self.assertEqual(pred["ignored"], ["note"])
+
+    def test_batch_predictor_dedupes_and_memoizes(self):
+        predictor = BatchPropertyPredictor(cache_size=3)
+        fe, al = ELEMENTS.index("Fe"), ELEMENTS.index("Al")
+        batch = np.zeros((4, len(ELEMENTS)))
+        batch[0, fe] = batch[1, fe] = 1.0
+        batch[2, [fe, al]] = [0.5, 0.5]
+        batch[3, [fe, al]] = [2.0, 2.0]
+        first = predictor.predict(batch)
+        self.assertEqual(first.shape, (4, len(PROPERTY_NAMES)))
+        np.testing.assert_allclose(first[0], first[1])
+        np.testing.assert_allclose(first[2], first[3])
+        self.assertEqual(predictor.stats()["misses"], 2)
+
+        second = predictor.predict([{"Fe": 3.0}, {"Al": 1.0, "Fe": 1.0}])
+        np.testing.assert_allclose(second, first[[0, 2]])
+        self.assertEqual(predictor.stats()["hits"], 2)
+
+        predictor.predict(np.eye(len(ELEMENTS))[:4])
+        self.assertEqual(predictor.stats()["cached"], 3)
+        self.assertGreater(predictor.stats()["evictions"], 0)
+
+    def test_optimize_material_improves_and_is_reproducible(self):
+        discovery = MaterialDiscovery()
+        targets = {"strength": "high", "density": "low"}
+        constraints = {"elements": ["Fe", "Al", "Ti", "Mg"], "cost": {"max": 5}}
+        result = discovery.optimize_material(targets, constraints, generations=30, seed=3)
+        self.assertEqual(result["status"], "optimized")
+        self.assertGreaterEqual(result["fitness_gain"], 0.0)
+        self.assertLessEqual(result["optimized"]["properties"]["cost"], 5.0 + 0.05)
+        self.assertGreater(result["evaluations_per_second"], 0)
+        self.assertEqual(len(result["history"]), result["generations"] + 1)
+        bests = [entry["best"] for entry in result["history"]]
+        self.assertEqual(bests, sorted(bests))
+
+        parallel = discovery.optimize_material(targets, constraints, generations=30, seed=3, workers=2)
+        self.assertEqual(parallel["history"], result["history"])
+
+        warm = discovery.optimize_material(targets, constraints, generations=1, seed=4, warm_start=result)
+        self.assertGreaterEqual(warm["history"][0]["best"], result["history"][-1]["best"] - 1e-6)
+
+    def test_optimize_material_checkpoint_resume(self):
+        discovery = MaterialDiscovery()
+        targets = {"hardness": "medium", "cost": "low"}
+        constraints = {"elements": ["Fe", "Cr", "Ni", "Mo"]}
+        straight = discovery.optimize_material(targets, constraints, generations=20, patience=100, seed=9)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "opt.npz")
+            discovery.optimize_material(targets, constraints, generations=10, patience=100, seed=9, checkpoint_path=path)
+            resumed = discovery.optimize_material(
+                targets, constraints, generations=20, patience=100, seed=9, checkpoint_path=path, resume=True
+            )
+        self.assertEqual(resumed["history"], straight["history"])
+        self.assertEqual(resumed["optimized"], straight["optimized"])
+
+        # A run checkpointed two stale generations into a patience of three
+        # must stop after one more, like the uninterrupted run.
+        targets = {"strength": "high", "density": "low"}
+        constraints = {"elements": ["Fe", "Al", "Ti", "Mg"], "cost": {"max": 5}}
+        straight = discovery.optimize_material(targets, constraints, generations=80, patience=3, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "opt.npz")
+            discovery.optimize_material(targets, constraints, generations=14, patience=3, seed=3, checkpoint_path=path)
+            resumed = discovery.optimize_material(
+                targets, constraints, generations=80, patience=3, seed=3, checkpoint_path=path, resume=True
+            )
+        self.assertEqual(resumed["generations"], straight["generations"])
+        self.assertEqual(resumed["history"], straight["history"])
+
+    @staticmethod
+    def _brute_pareto(costs):
+        keep = np.ones(len(costs), dtype=bool)
+        for i, row in enumerate(costs):
+            for j, other in enumerate(costs):
+                if j != i and np.all(other <= row) and (np.any(other < row) or j < i):
+                    keep[i] = False
+                    break
+        return keep
+
+    def test_pareto_mask_matches_brute_force(self):
+        rng = np.random.default_rng(5)
+        for dims in (1, 2, 3, 4, 6):
+            for _ in range(10):
+                costs = rng.integers(0, 6, size=(80, dims)).astype(float)
+                np.testing.assert_array_equal(pareto_mask(costs), self._brute_pareto(costs))
+        line = np.arange(20_000, dtype=float)
+        self.assertTrue(pareto_mask(np.column_stack([line, -line, line])).all())
+
+    def test_pareto_front_incremental_and_ranks(self):
+        rng = np.random.default_rng(6)
+        for dims in (2, 3, 5):
+            costs = rng.integers(0, 8, size=(200, dims)).astype(float)
+            front = ParetoFront(dims)
+            for start in range(0, len(costs), 23):
+                front.add(costs[start : start + 23])
+            expected = np.flatnonzero(self._brute_pareto(costs))
+            self.assertEqual(sorted(front.rows.tolist()), expected.tolist())
+            self.assertEqual(front.seen, len(costs))
+
+        ranks = non_dominated_sort(np.array([[1.0, 1.0], [1.0, 1.0], [2.0, 2.0], [0.0, 3.0], [3.0, 3.0]]))
+        self.assertEqual(ranks.tolist(), [0, 0, 1, 0, 2])
+
+    def test_discover_new_material_pareto_front(self):
+        discovery = MaterialDiscovery()
+        targets = {"strength": "high", "density": "low", "cost": "low"}
+        constraints = {"elements": ["Fe", "Al", "Ti", "Mg"]}
+        result = discovery.discover_new_material(targets, constraints, top_k=1, resolution=10, pareto=True)
+        front = result["pareto_front"]
+        self.assertGreater(len(front), 1)
+        self.assertEqual(front[0]["score"], result["candidates"][0]["score"])
+
+        table = property_table(result["elements"])
+        grid = simplex_grid(10, len(result["elements"])) / 10
+        properties = grid @ table
+        costs = np.column_stack([-properties[:, 3], properties[:, 0], properties[:, 2]])
+        expected = {tuple(np.round(row, 6)) for row in grid[pareto_mask(costs)]}
+        found = {
+            tuple(round(member["composition"].get(el, 0.0), 6) for el in result["elements"]) for member in front
+        }
+        self.assertEqual(found, expected)
+
+        self.assertIsNone(discovery.discover_new_material(targets, constraints)["pareto_front"])
+        optimized = discovery.optimize_material(targets, constraints, generations=10, pareto=True)
+        self.assertTrue(optimized["pareto_front"])
+
+    def test_materials_catalog_queries(self):
+        with tempfile.TemporaryDirectory() as tmp, MaterialsCatalog(os.path.join(tmp, "materials.db")) as catalog:
+            records = [
+                {"composition": {"Fe": 0.98, "C": 0.02}, "name": "steel"},
+                {"composition": {"Al": 1}, "name": "aluminium"},
+                {"composition": {"Ti": 9, "Al": 1}, "name": "ti-al"},
+                {"composition": {"Cu": 1}, "properties": {"conductivity": 58.0}, "name": "copper"},
+            ]
+            self.assertEqual(catalog.bulk_import(records, batch_size=3), 4)
+            self.assertFalse(catalog.add({"Fe": 49, "C": 1}))
+            self.assertEqual(len(catalog), 4)
+
+            light = catalog.query(properties={"density": {"max": 5.0}}, order_by="density")
+            self.assertEqual([m["name"] for m in light], ["aluminium", "ti-al"])
+            self.assertEqual([m["name"] for m in catalog.query(elements=["Al"], within=["Al"])], ["aluminium"])
+            self.assertEqual(catalog.query(properties={"conductivity": (57, 59)})[0]["name"], "copper")
+
+            nearest = catalog.nearest({"density": 7.8}, k=2)
+            self.assertEqual(nearest[0]["name"], "steel")
+            self.assertLessEqual(nearest[0]["distance"], nearest[1]["distance"])
+
+            fractions = np.array([[0.98, 0.02], [0.5, 0.5]])
+            self.assertEqual(catalog.known_mask(fractions, ["Fe", "C"]).tolist(), [True, False])
+
+    def test_discover_new_material_skips_catalog_materials(self):
+        catalog = MaterialsCatalog()
+        catalog.bulk_import([{"composition": {"Fe": 1}}, {"composition": {"Fe": 0.95, "C": 0.05}}, {"composition": {"Cu": 1}}])
+        discovery = MaterialDiscovery(catalog=catalog)
+        result = discovery.discover_new_material({"strength": "high"}, {"composition": "Fe-C"}, top_k=3)
+        self.assertEqual(result["known_skipped"], 2)
+        self.assertEqual([m["composition"] for m in result["known_materials"]], [{"Fe": 1.0}, {"Fe": 0.95, "C": 0.05}])
+        self.assertNotIn({"Fe": 1.0}, [c["composition"] for c in result["candidates"]])
+
+        optimized = discovery.optimize_material({"strength": "high"}, {"composition": "Fe-C"}, generations=1)
+        self.assertGreaterEqual(optimized["history"][0]["best"], result["known_materials"][0]["score"] - 1e-9)
+
+    def test_property_model_update_learns_corrections(self):
+        model = PropertyModel(["Fe", "C"], regularization=1e-9)
+        predictor = BatchPropertyPredictor(model)
+        before = predictor.predict(np.array([[1.0, 0.0]]))[0, 3]
+        fractions = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+        observed = np.full((3, len(PROPERTY_NAMES)), np.nan)
+        observed[:, 3] = fractions @ np.array([600.0, 30.0])
+        model.update(fractions, observed)
+        np.testing.assert_allclose(model.table[:, 3], [600.0, 30.0])
+        np.testing.assert_allclose(model.corrections[:, 0], 0.0)
+        self.assertEqual(model.version, 1)
+        self.assertAlmostEqual(predictor.predict(np.array([[1.0, 0.0]]))[0, 3], 600.0, places=5)
+        self.assertNotEqual(before, 600.0)
+        self.assertEqual(predictor.stats()["invalidations"], 1)
+
+    def test_integrate_with_simulations_streams_feedback(self):
+        discovery = MaterialDiscovery()
+        first = discovery.discover_new_material({"strength": "high"}, {"composition": "Fe-Al"}, top_k=2, watch="fe-al")
+        self.assertEqual(first["candidates"][0]["composition"], {"Fe": 1.0})
+        self.assertEqual(len(discovery.watches["fe-al"].rows), 21)
+
+        async def outputs():
+            for step in range(50):
+                yield {"composition": {"Al": 1}, "properties": {"strength": 900.0}}
+            yield {"composition": {}, "properties": {"strength": 1.0}}
+            yield {"composition": {"Fe": None}, "properties": {"strength": 1.0}}
+            yield {"note": "no composition"}
+
+        summary = asyncio.run(discovery.integrate_with_simulations_async(outputs(), batch_size=8, max_queue=4))
+        self.assertEqual(summary["status"], "integrated")
+        self.assertEqual(summary["received"], 53)
+        self.assertEqual(summary["applied"], 50)
+        self.assertEqual(summary["skipped"], 3)
+        self.assertGreaterEqual(summary["batches"], 50 // 8)
+        self.assertEqual(summary["model_version"], summary["batches"])
+        self.assertEqual(summary["rankings"]["fe-al"][0]["composition"], {"Al": 1.0})
+
+        rescreened = discovery.discover_new_material({"strength": "high"}, {"composition": "Fe-Al"}, top_k=2)
+        for fresh, refreshed in zip(rescreened["candidates"], summary["rankings"]["fe-al"]):
+            self.assertEqual(fresh["composition"], refreshed["composition"])
+            self.assertEqual(fresh["properties"], refreshed["properties"])
+        self.assertEqual(discovery.refresh_rankings(), {})
+
+        output = {"composition": {"Fe": 1}, "properties": {"strength": 500.0}}
+        synchronous = discovery.integrate_with_simulations(output)
+        self.assertEqual((synchronous["received"], synchronous["applied"]), (1, 1))
+        self.assertEqual(synchronous["model_version"], summary["model_version"] + 1)
+
+    def test_feedback_put_fails_fast_when_consumer_dies(self):
+        discovery = MaterialDiscovery()
+        output = {"composition": {"Al": 1}, "properties": {"strength": 900.0}}
+
+        def fail():
+            raise RuntimeError("refresh failed")
+
+        discovery.refresh_rankings = fail
+
+        async def produce():
+            stream = discovery.feedback(batch_size=1, max_queue=1)
+            await stream.start()
+            for _ in range(10):
+                await stream.put(output)
+
+        with self.assertRaisesRegex(RuntimeError, "refresh failed"):
+            asyncio.run(asyncio.wait_for(produce(), timeout=5))
+
+    def test_research_runs_dependency_graph_concurrently(self):
+        for executor in ("thread", "process"):
+            research = Research(name="graph", workers=2, executor=executor)
+            research.add_experiment({"name": "a", "function": _sleep_and_sum, "params": {"value": 1, "sleep": 0.05}})
+            research.add_experiment(
+                {"name": "b", "depends_on": ["a"], "function": _sleep_and_sum, "params": {"value": 10, "sleep": 0.3}}
+            )
+            research.add_experiment(
+                {"name": "c", "depends_on": ["a"], "function": _sleep_and_sum, "params": {"value": 100, "sleep": 0.05}}
+            )
+            research.add_experiment({"name": "d", "depends_on": ["b", "c"], "function": _sleep_and_sum})
+            summary = research.run_all_experiments()
+
+            self.assertEqual(summary["status"], "success")
+            self.assertEqual(summary["results"]["d"]["result"], 11 + 101)
+            self.assertEqual(summary["order"][0], "a")
+            self.assertEqual(summary["order"][-1], "d")
+            self.assertEqual(summary["critical_path"]["path"], ["a", "b", "d"])
+            self.assertLess(summary["makespan"], 0.05 + 0.3 + 0.05 + 0.3)
+
+    def test_research_timeouts_and_failures_skip_dependents(self):
+        research = Research(name="faults", workers=3)
+        research.add_experiment({"name": "slow", "function": _sleep_and_sum, "params": {"sleep": 1.0}, "timeout": 0.05})
+        research.add_experiment({"name": "after_slow", "depends_on": ["slow"]})
+        research.add_experiment({"name": "broken", "function": _fail})
+        research.add_experiment({"name": "after_broken", "depends_on": ["broken"]})
+        research.add_experiment({"name": "last", "depends_on": ["after_broken"]})
+        research.add_experiment({"name": "independent", "function": _sleep_and_sum, "params": {"value": 7}})
+        summary = research.run_all_experiments()
+
+        statuses = {name: result["status"] for name, result in summary["results"].items()}
+        self.assertEqual(summary["status"], "failed")
+        self.assertEqual(statuses, {
+            "slow": "timeout",
+            "after_slow": "skipped",
+            "broken": "failed",
+            "after_broken": "skipped",
+            "last": "skipped",
+            "independent": "success",
+        })
+        self.assertLess(summary["makespan"], 1.0)
+
+        serial = Research(name="serial", workers=1)
+        serial.add_experiment(
+            {"name": "stuck", "function": _sleep_and_sum, "params": {"sleep": 0.4}, "timeout": 0.05, "estimate": 9}
+        )
+        serial.add_experiment({"name": "next", "function": _sleep_and_sum, "params": {"sleep": 0.05}, "timeout": 0.3})
+        statuses = {name: result["status"] for name, result in serial.run_all_experiments()["results"].items()}
+        self.assertEqual(statuses, {"stuck": "timeout", "next": "success"})
+
+        cyclic = Research(name="cycle")
+        cyclic.add_experiment({"name": "x", "depends_on": ["y"]})
+        cyclic.add_experiment({"name": "y", "depends_on": ["x"]})
+        with self.assertRaises(ValueError):
+            cyclic.run_all_experiments()
+
+    def test_research_module_runs_campaigns(self):
+        module = ResearchModule(workers=2)
+        module.research("alpha").add_experiment({"name": "one"})
+        module.research("beta").add_experiment({"name": "two", "function": _sleep_and_sum, "params": {"value": 3}})
+        summaries = module.run()
+        self.assertEqual(sorted(summaries), ["alpha", "beta"])
+        self.assertEqual(summaries["beta"]["results"]["two"]["result"], 3)
+
+    def test_research_reruns_only_changed_experiments(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            def campaign(base_value, threshold):
+                research = Research(name="incremental", cache_dir=tmp)
+                research.add_experiment({"name": "load", "function": _sleep_and_sum, "params": {"value": base_value}})
+                research.add_experiment(
+                    {"name": "clip", "depends_on": ["load"], "function": _clip, "params": {"max": threshold}}
+                )
+                research.add_experiment({"name": "other", "function": _sleep_and_sum, "params": {"value": 5}})
+                research.add_experiment(
+                    {"name": "report", "depends_on": ["clip", "other"], "function": _sleep_and_sum}
+                )
+                return research
+
+            first = campaign(10, 100).run_all_experiments()
+            self.assertEqual(sorted(first["executed"]), ["clip", "load", "other", "report"])
+            self.assertEqual(first["results"]["report"]["result"], 15)
+
+            # A fresh campaign object with the same inputs is served from disk.
+            again = campaign(10, 100).run_all_experiments()
+            self.assertEqual(again["executed"], [])
+            self.assertEqual(again["results"]["report"]["result"], 15)
+
+            # Changing one parameter reruns that experiment and its dependents.
+            changed = campaign(10, 8).run_all_experiments()
+            self.assertEqual(sorted(changed["executed"]), ["clip", "report"])
+            self.assertEqual(changed["results"]["report"]["result"], 13)
+
+            # "clip" reruns but reproduces its output, so "report" stays cached.
+            cutoff = campaign(20, 8).run_all_experiments()
+            self.assertEqual(sorted(cutoff["executed"]), ["clip", "load"])
+            self.assertIn("report", cutoff["cached"])
+
+            forced = campaign(20, 8).run_all_experiments(force=True)
+            self.assertEqual(len(forced["executed"]), 4)
+
+    def test_code_version_is_stable_across_processes(self):
+        source = (
+            "def experiment(values):\n"
+            "    squares = [v * v for v in values if v in {'a', 'b', 'c'} or v]\n"
+            "    key = lambda v: -v\n"
+            "    def inner(v):\n"
+            "        return v + 1\n"
+            "    return sorted(map(inner, squares), key=key)\n"
+        )
+        script = (
+            "import importlib.util, sys\n"
+            "from innovation.artifacts import code_version\n"
+            "spec = importlib.util.spec_from_file_location('exp_module', sys.argv[1])\n"
+            "module = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(module)\n"
+            "print(code_version(module.experiment))\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        hashes = []
+        with tempfile.TemporaryDirectory() as tmp:
+            # Different hash seeds, and the function moved down the file.
+            for seed, padding in (("1", ""), ("2", "\n\n\n")):
+                path = os.path.join(tmp, f"seed{seed}", "exp_module.py")
+                os.makedirs(os.path.dirname(path))
+                with open(path, "w") as handle:
+                    handle.write(padding + source)
+                env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=root)
+                result = subprocess.run([sys.executable, "-c", script, path], capture_output=True, text=True,
+                                        env=env, check=True, cwd=root)
+                hashes.append(result.stdout.strip().splitlines()[-1])
+            self.assertEqual(hashes[0], hashes[1])
+            self.assertEqual(len(hashes[0]), 64)
+
+    def test_cross_pollination_returns_distinct_company_breakthroughs(self):
+        engine = CrossPollinationEngine()
+        result = engine.generate_breakthroughs("clean energy storage for space missions", top_k=5, max_size=3)
+        breakthroughs = result["breakthroughs"]
+        self.assertEqual(len(breakthroughs), 5)
+        scores = [b["score"] for b in breakthroughs]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for breakthrough in breakthroughs:
+            self.assertIn(len(breakthrough["companies"]), (2, 3))
+            self.assertEqual(len(set(breakthrough["companies"])), len(breakthrough["companies"]))
+            self.assertEqual(len(set(breakthrough["capabilities"])), len(breakthrough["capabilities"]))
+        self.assertTrue(any("energy" in cap for b in breakthroughs for cap in b["capabilities"]))
+        self.assertFalse(result["timed_out"])
+
+    def test_cross_pollination_matches_brute_force(self):
+        rng = np.random.default_rng(3)
+        stacks = {
+            f"company{i}": {f"cap{j}": float(rng.random()) for j in rng.choice(10, 3, replace=False)} for i in range(5)
+        }
+        domains = {f"cap{j}": tuple(f"tag{k}" for k in rng.choice(5, 2, replace=False)) for j in range(10)}
+        small = CrossPollinationEngine(stacks, domains)
+        cases = [(CrossPollinationEngine(), "fraud detection for digital payments", 3), (small, "tag1 tag2", 4)]
+        for engine, problem, max_size in cases:
+            relevance = engine.relevance(problem)[engine.atom_capability]
+            unary = engine.weights["relevance"] * relevance + engine.weights["strength"] * engine.atom_strength
+            expected = []
+            for size in range(2, max_size + 1):
+                for combo in itertools.combinations(range(len(unary)), size):
+                    pair = sum(engine._pair[a, b] for a, b in itertools.combinations(combo, 2))
+                    if np.isfinite(pair):
+                        expected.append(unary[list(combo)].mean() + pair / (size * (size - 1) / 2))
+            expected = sorted(expected, reverse=True)[:5]
+            result = engine.generate_breakthroughs(problem, max_size=max_size, beam_width=5000)
+            np.testing.assert_allclose([b["score"] for b in result["breakthroughs"]], expected)
+
+    def test_cross_pollination_respects_time_budget(self):
+        rng = np.random.default_rng(0)
+        capabilities = {
+            f"company{i}": {f"cap{j}": float(rng.random()) for j in rng.choice(2000, 300, replace=False)}
+            for i in range(8)
+        }
+        domains = {f"cap{j}": tuple(f"tag{k}" for k in rng.choice(40, 3, replace=False)) for j in range(2000)}
+        engine = CrossPollinationEngine(capabilities, domains)
+        result = engine.generate_breakthroughs("tag1 tag2", max_size=4, time_budget=0.02)
+        self.assertTrue(result["timed_out"])
+        self.assertLess(result["elapsed"], 0.5)
+        self.assertTrue(result["breakthroughs"])
+        with self.assertRaises(ValueError):
+            engine.generate_breakthroughs("tag1", max_size=1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,51 @@
 """Test cases for the scripts module."""
 
+import json
 import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
 import pytest
+from scripts.cleaning import BoundedHashSet, row_hashes
+from scripts.dataset_cache import DatasetCache
+from scripts.transforms import MinMaxScaler, OneHotEncoder, OrdinalEncoder, Pipeline
+from scripts.data_preprocessing import preprocess_data
+from scripts.dataflow import Dataflow
 from scripts.preprocessing import clean_data, transform_data, load_external_dataset
-from scripts.automation import run_simulation_batch, schedule_innovation_task, generate_report
+from scripts import automation
+from scripts.automation import get_scheduler, run_simulation_batch, schedule_innovation_task, generate_report
+from scripts.scheduler import DEFAULT_REQUIRED_PARAMETERS, CronSchedule, Scheduler, parse_interval, parse_schedule
+from scripts.benchmark import BENCHMARKS, compare_runs, load_history, main as benchmark_main, run_benchmarks
+
+
+def _flaky_square(simulation):
+    """Batch runner that fails on request, or only on the first attempt when flaky."""
+    if simulation.get("broken"):
+        raise RuntimeError("broken run")
+    if simulation.get("flaky"):
+        marker = os.path.join(simulation["marker_dir"], f"attempted-{simulation['value']}")
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            raise RuntimeError("transient failure")
+    return simulation["value"] ** 2
+
+
+def _halve(columns):
+    """Row-wise dataflow stage; module level so worker processes can unpickle it."""
+    return {name: values / 2 if values.dtype.kind == "f" else values for name, values in columns.items()}
+
+
+@pytest.fixture
+def stub_scheduler(monkeypatch):
+    """Process-wide scheduler with no-op handlers, shut down after the test."""
+    handlers = {name: (lambda params: params) for name in DEFAULT_REQUIRED_PARAMETERS}
+    scheduler = Scheduler(handlers=handlers, required=DEFAULT_REQUIRED_PARAMETERS)
+    monkeypatch.setattr(automation, "_scheduler", scheduler)
+    yield scheduler
+    scheduler.shutdown()
 
 
 class TestPreprocessing:
@@ -27,7 +69,67 @@ class TestPreprocessing:
             clean_data({"test": "data"})
         
         assert "Starting data cleaning process" in caplog.text
-        assert "Data cleaning completed (placeholder)" in caplog.text
+        assert "Data cleaning completed" in caplog.text
+
+    def test_clean_data_columnar(self):
+        """Test null handling, coercion, hashed deduplication and outlier clipping on columns."""
+        data = {
+            "id": np.array([1, 2, 2, 3, 4, 5, 6]),
+            "score": np.array([1.0, 2.0, 2.0, np.nan, 2.5, 1.5, 90.0]),
+            "label": np.array([" a", "b", "b ", "c", "NA", "e", "f"]),
+            "flag": np.array(["yes", "no", "no", "yes", "no", "yes", "no"]),
+        }
+        cleaned = clean_data(data, schema={"flag": "bool"}, outliers="iqr")
+        assert cleaned["id"].tolist() == [1, 2, 5, 6]
+        assert cleaned["label"].tolist() == ["a", "b", "e", "f"]
+        assert cleaned["flag"].dtype == bool and cleaned["flag"].tolist() == [True, False, True, False]
+        assert cleaned["score"][:3].tolist() == [1.0, 2.0, 1.5] and cleaned["score"][3] < 90.0
+        assert data["score"][6] == 90.0 and data["label"][0] == " a"
+
+        filled = clean_data(data, nulls="fill", fill_values={"label": "?"}, deduplicate=False)
+        assert filled["score"][3] == 2.0 and filled["label"][4] == "?"
+        partial = clean_data({"a": np.array([1.0, np.nan, 3.0, 100.0]), "b": np.array([np.nan, 5.0, 5.0, 0.0])},
+                             nulls="fill", outliers=None, deduplicate=False)
+        assert partial["a"][1] == 3.0 and partial["b"][0] == 5.0  # each column's own median
+        zscore = clean_data(data, nulls="keep", outliers="zscore", threshold=1.0, bounds={"id": (2, 5)})
+        assert zscore["id"].min() == 2 and zscore["id"].max() == 5 and np.isnan(zscore["score"][2])
+
+    def test_clean_data_chunked_deduplicates_across_chunks(self):
+        """Test lazy chunk cleaning with a bounded cross-chunk hash set."""
+        rng = np.random.default_rng(7)
+        values = rng.integers(0, 50, size=(3_000, 2))
+        chunks = [{"x": values[i:i + 700, 0], "y": values[i:i + 700, 1].astype(float)} for i in range(0, 3_000, 700)]
+        cleaned = clean_data(iter(chunks))
+        assert not isinstance(cleaned, dict)
+        rows = [(x, y) for chunk in cleaned for x, y in zip(chunk["x"].tolist(), chunk["y"].tolist())]
+        assert rows == list(dict.fromkeys(map(tuple, values.astype(float).tolist())))
+
+        hashes = row_hashes({"x": np.array([1, 2, 1]), "y": np.array(["a", "b", "a"])})
+        assert hashes[0] == hashes[2] and hashes[0] != hashes[1]
+        seen = BoundedHashSet(capacity=2)
+        assert seen.add(np.array([1, 2, 1], dtype=np.uint64)).tolist() == [True, True, False]
+        assert seen.add(np.array([3, 2], dtype=np.uint64)).tolist() == [True, False]
+        assert seen.add(np.array([1], dtype=np.uint64)).tolist() == [True] and len(seen) == 2
+
+    def test_clean_data_chunked_fits_bounds_on_the_whole_stream(self, caplog):
+        """Test a sorted stream is fitted on every chunk, not just the first."""
+        chunks = [{"x": np.arange(start, start + 100, dtype=float)} for start in range(0, 500, 100)]
+        cleaned = clean_data(lambda: iter(chunks), outliers="iqr")
+        np.testing.assert_array_equal(np.concatenate([chunk["x"] for chunk in cleaned]), np.arange(500.0))
+        flow = Dataflow.from_chunks(chunks).clean(outliers="zscore", threshold=1.0)
+        low, high = flow.collect()["x"][[0, -1]]
+        assert 100 < low < 110 and 390 < high < 400
+
+        with caplog.at_level(logging.WARNING):
+            clipped = np.concatenate([chunk["x"] for chunk in clean_data(iter(chunks), outliers="iqr")])
+        assert clipped.max() < 499 and "first chunk of a one-shot iterator" in caplog.text
+
+    def test_clean_data_chunked_deduplicates_text_of_any_width(self):
+        """Test that equal strings match across chunks with different text widths."""
+        cleaned = clean_data(iter([{"s": np.array(["abc", "de"])}, {"s": np.array(["abc", "defgh"])}]))
+        assert [value for chunk in cleaned for value in chunk["s"].tolist()] == ["abc", "de", "defgh"]
+        narrow, wide = (row_hashes({"s": np.array(["abc", "ab"], dtype=dtype)}) for dtype in ("U3", "U9"))
+        assert narrow.tolist() == wide.tolist() and narrow[0] != narrow[1]
 
     def test_transform_data_returns_data(self):
         """Test that transform_data returns the input data."""
@@ -54,12 +156,64 @@ class TestPreprocessing:
             transform_data([1, 2, 3])
         
         assert "Starting data transformation process" in caplog.text
-        assert "Data transformation completed (placeholder)" in caplog.text
+        assert "Data transformation completed" in caplog.text
+
+    def test_transform_data_pipeline_fits_in_chunks(self, tmp_path):
+        """Test that chunked partial_fit matches a full fit and saved pipelines are reused."""
+        rng = np.random.default_rng(3)
+        data = {
+            "x": rng.normal(5.0, 2.0, 5_000),
+            "y": rng.integers(0, 10, 5_000),
+            "color": np.array(["red", "green", "blue"])[rng.integers(0, 3, 5_000)],
+            "size": np.array(["s", "m", "l"])[rng.integers(0, 3, 5_000)],
+        }
+        chunks = [{name: values[i:i + 600] for name, values in data.items()} for i in range(0, 5_000, 600)]
+        steps = [
+            {"type": "standard_scaler"},
+            {"type": "onehot_encoder", "columns": ["color"]},
+            {"type": "ordinal_encoder", "columns": ["size"]},
+            {"type": "pca", "n_components": 2},
+        ]
+        full = transform_data(data, steps)
+        path = str(tmp_path / "pipeline.json")
+        streamed = list(transform_data(lambda: iter(chunks), steps, save_path=path))
+        assert list(full) == ["pc0", "pc1"]
+        for name in full:
+            np.testing.assert_allclose(np.concatenate([chunk[name] for chunk in streamed]), full[name], atol=1e-9)
+
+        features = np.column_stack(
+            [(data["x"] - data["x"].mean()) / data["x"].std(), (data["y"] - data["y"].mean()) / data["y"].std()]
+            + [(data["color"] == color).astype(float) for color in ["blue", "green", "red"]]
+            + [np.searchsorted(["l", "m", "s"], data["size"]).astype(float)]
+        )
+        centered = features - features.mean(axis=0)
+        expected = centered @ np.linalg.svd(centered, full_matrices=False)[2][:2].T
+        np.testing.assert_allclose(np.abs(np.column_stack([full["pc0"], full["pc1"]])), np.abs(expected), atol=1e-9)
 
-    def test_load_external_dataset_returns_empty_dict(self):
-        """Test that load_external_dataset returns empty dict as placeholder."""
+        reused = transform_data(iter(chunks), path)
+        np.testing.assert_allclose(next(reused)["pc0"], full["pc0"][:600], atol=1e-9)
+        with pytest.raises(ValueError):
+            transform_data(iter(chunks), steps)
+        with pytest.raises(TypeError):
+            transform_data([1, 2, 3], steps)
+
+    def test_transformers_scale_and_encode(self):
+        """Test scaler ranges, unknown categories and JSON round trips of single transformers."""
+        scaler = MinMaxScaler(feature_range=(-1, 1))
+        scaler.partial_fit({"v": np.array([2.0, 4.0])}).partial_fit({"v": np.array([np.nan, 6.0])})
+        assert scaler.transform({"v": np.array([2.0, 6.0, 8.0])})["v"].tolist() == [-1.0, 1.0, 2.0]
+        encoder = OneHotEncoder().fit({"tag": np.array(["b", "a"]), "n": np.array([1, 2])})
+        encoded = encoder.transform({"n": np.array([1, 2, 3]), "tag": np.array(["a", "z", "b"])})
+        assert list(encoded) == ["n", "tag=a", "tag=b"]
+        assert encoded["tag=a"].tolist() == [1.0, 0.0, 0.0] and encoded["tag=b"].tolist() == [0.0, 0.0, 1.0]
+        ordinal = Pipeline([OrdinalEncoder(["tag"])]).fit({"tag": np.array(["b", "a"])})
+        restored = Pipeline.from_dict(json.loads(json.dumps(ordinal.to_dict())))
+        assert restored.fitted and restored.transform({"tag": np.array(["a", "b", "c"])})["tag"].tolist() == [0, 1, -1]
+
+    def test_load_external_dataset_missing_file_returns_none(self):
+        """Test that load_external_dataset returns None for a missing file."""
         result = load_external_dataset("/path/to/dataset.csv")
-        assert result == {}
+        assert result is None
 
     def test_load_external_dataset_logging(self, caplog):
         """Test that load_external_dataset logs appropriately."""
@@ -67,20 +221,138 @@ class TestPreprocessing:
             load_external_dataset("/path/to/data.json")
         
         assert "Loading external dataset from: /path/to/data.json" in caplog.text
-        assert "Dataset loaded successfully (placeholder)" in caplog.text
+        assert "File not found: /path/to/data.json" in caplog.text
 
-    def test_load_external_dataset_with_different_extensions(self):
+    def test_load_external_dataset_with_different_extensions(self, tmp_path):
         """Test load_external_dataset with various file extensions."""
-        file_paths = [
-            "/data/test.csv",
-            "/data/test.json",
-            "/data/test.yaml",
-            "/data/test.yml"
-        ]
+        records = [{"id": 1, "score": 0.5, "name": "a"}, {"id": 2, "score": None, "name": "b"}]
+        (tmp_path / "test.csv").write_text("id,score,name\n1,0.5,a\n2,,b\n")
+        (tmp_path / "test.jsonl").write_text("\n".join(json.dumps(record) for record in records) + "\n")
+        (tmp_path / "test.json").write_text(json.dumps(records))
         
-        for file_path in file_paths:
-            result = load_external_dataset(file_path)
-            assert result == {}
+        for name in ["test.csv", "test.jsonl", "test.json"]:
+            self._assert_loaded(load_external_dataset(str(tmp_path / name)))
+        assert load_external_dataset(str(tmp_path / "test.parquet")) is None
+
+    def test_load_external_dataset_yaml(self, tmp_path):
+        """Test YAML record lists and column mappings (needs the optional PyYAML)."""
+        pytest.importorskip("yaml")
+        (tmp_path / "test.yaml").write_text("- {id: 1, score: 0.5, name: a}\n- {id: 2, score: null, name: b}\n")
+        (tmp_path / "test.yml").write_text("id: [1, 2]\nscore: [0.5, null]\nname: [a, b]\n")
+        for name in ["test.yaml", "test.yml"]:
+            self._assert_loaded(load_external_dataset(str(tmp_path / name)))
+
+    @staticmethod
+    def _assert_loaded(result):
+        assert list(result) == ["id", "score", "name"]
+        assert result["id"].dtype == np.int64 and result["id"].tolist() == [1, 2]
+        assert result["score"][0] == 0.5 and np.isnan(result["score"][1])
+        assert result["name"].tolist() == ["a", "b"]
+
+    def test_load_external_dataset_streams_chunks(self, tmp_path):
+        """Test chunked CSV streaming with quoted fields, inference and promotion."""
+        path = tmp_path / "big.csv"
+        with open(path, "w") as handle:
+            handle.write("id,flag,note,code\n")
+            for i in range(2_500):
+                code = i if i < 2_400 else f"x{i}"
+                handle.write(f'{i},{"yes" if i % 2 else "no"},"line {i},\nwrapped",{code}\n')
+        chunks = list(load_external_dataset(str(path), stream=True, chunk_size=1_000, block_bytes=4_096))
+        assert [len(chunk["id"]) for chunk in chunks] == [1_000, 1_000, 500]
+        assert chunks[0]["flag"].dtype == bool and chunks[0]["flag"][:2].tolist() == [False, True]
+        assert chunks[2]["note"][0] == "line 2000,\nwrapped"
+        assert chunks[0]["code"].dtype == np.int64 and chunks[2]["code"].dtype.kind == "U"
+
+        columns = load_external_dataset(str(path), columns=["code", "id"], chunk_size=700)
+        assert list(columns) == ["code", "id"]
+        assert columns["id"].tolist() == list(range(2_500))
+        assert columns["code"][:2].tolist() == ["0", "1"] and columns["code"][-1] == "x2499"
+
+    def test_load_external_dataset_uses_columnar_cache(self, tmp_path):
+        """Test that cached columns are memory-mapped and rebuilt when the source changes."""
+        path = tmp_path / "data.csv"
+        path.write_text("id,score,name\n1,0.5,a\n2,1.5,b\n3,,c\n")
+        cache_dir = str(tmp_path / "cache")
+        parsed = load_external_dataset(str(path))
+        first = load_external_dataset(str(path), cache_dir=cache_dir)
+        cached = load_external_dataset(str(path), cache_dir=cache_dir)
+        assert isinstance(cached["id"], np.memmap) and not cached["id"].flags.writeable
+        for name in parsed:
+            np.testing.assert_array_equal(first[name], parsed[name])
+            np.testing.assert_array_equal(cached[name], parsed[name])
+        assert DatasetCache(cache_dir).entry_path(str(path)) == os.path.dirname(cached["id"].filename)
+
+        chunks = list(load_external_dataset(str(path), stream=True, cache_dir=cache_dir, chunk_size=2))
+        assert [chunk["name"].tolist() for chunk in chunks] == [["a", "b"], ["c"]]
+
+        with open(path, "a") as handle:
+            handle.write("4,2.5,dd\n")
+        updated = load_external_dataset(str(path), cache_dir=cache_dir)
+        assert updated["id"].tolist() == [1, 2, 3, 4] and updated["name"][-1] == "dd"
+        assert len(os.listdir(cache_dir)) == 1
+
+
+class TestDataflow:
+    """Test cases for the fused dataflow and preprocess_data."""
+
+    @staticmethod
+    def _data(rows=6_000):
+        rng = np.random.default_rng(11)
+        data = {
+            "x": rng.integers(0, 40, rows).astype(float),
+            "y": rng.integers(0, 40, rows),
+            "tag": np.array(["a", "b", "c"])[rng.integers(0, 3, rows)],
+        }
+        data["x"][::50] = np.nan
+        return data
+
+    def test_dataflow_fuses_stages_and_matches_separate_passes(self):
+        """Test that a fused flow gives the same rows as separate clean and transform passes."""
+        data = self._data()
+        steps = [{"type": "standard_scaler"}, {"type": "onehot_encoder"}]
+        flow = Dataflow.from_columns(data, chunk_size=1_000).clean().map(_halve, rowwise=True).transform(steps)
+        assert len(flow._segments(flow._stages)) == 1
+
+        result = flow.collect()
+        expected = transform_data(_halve(clean_data(data)), steps)
+        assert list(result) == list(expected) == ["x", "y", "tag=a", "tag=b", "tag=c"]
+        for name in expected:
+            np.testing.assert_allclose(result[name], expected[name])
+        assert flow.stats()[0]["kept"] == len(expected["x"])
+        split = Dataflow.from_columns(data).clean().map(_halve).clean()
+        assert len(split._segments(split._stages)) == 2
+
+    def test_dataflow_parallel_preserves_order(self, tmp_path):
+        """Test process-pool execution against the in-process result, in and out of order."""
+        data = self._data()
+        flow = Dataflow.from_columns(data, chunk_size=500).clean(outliers="iqr").map(_halve, rowwise=True)
+        serial = flow.collect()
+        ordered = flow.parallel(2).collect()
+        unordered = flow.parallel(2, ordered=False).collect()
+        for name in serial:
+            np.testing.assert_array_equal(ordered[name], serial[name])
+        assert sorted(map(tuple, np.column_stack([unordered["y"], unordered["x"]]).tolist())) == sorted(
+            map(tuple, np.column_stack([serial["y"], serial["x"]]).tolist())
+        )
+
+        path = tmp_path / "out.csv"
+        summary = flow.parallel(2).sink(str(path)).run()
+        assert summary["rows"] == len(serial["x"])
+        assert load_external_dataset(str(path))["y"].tolist() == serial["y"].tolist()
+
+    def test_preprocess_data(self, tmp_path):
+        """Test preprocess_data on files, columns and non-dataset input."""
+        assert preprocess_data({"key": "value"}) == {"key": "value"}
+        assert preprocess_data([1, 2, 3]) == [1, 2, 3]
+        path = tmp_path / "data.csv"
+        path.write_text("id,score,label\n1,0.5,a\n1,0.5,a\n2,,b\n3,1.5,c\n")
+        result = preprocess_data(str(path), clean={}, transform=[{"type": "minmax_scaler", "columns": ["score"]}])
+        assert result["id"].tolist() == [1, 3] and result["score"].tolist() == [0.0, 1.0]
+        sink = tmp_path / "out.jsonl"
+        summary = preprocess_data(str(path), clean={"nulls": "keep"}, sink=str(sink), chunk_size=2)
+        assert summary["rows"] == 3 and len(sink.read_text().splitlines()) == 3
+        chunks = list(preprocess_data(self._data(), clean={}, stream=True, chunk_size=1_000))
+        assert len(chunks) > 1
 
 
 class TestAutomation:
@@ -100,9 +372,50 @@ class TestAutomation:
             run_simulation_batch(batch_config)
         
         assert "Starting batch simulation run" in caplog.text
-        assert "Batch simulation execution in progress (placeholder)" in caplog.text
         assert "Batch simulation completed successfully" in caplog.text
 
+    def test_run_simulation_batch_runs_scenarios(self):
+        """Test every simulation runs and results keep simulation order."""
+        distributions = {"x": {"dist": "normal", "loc": 1.0, "scale": 0.1}}
+        simulations = ["baseline", {"problem": "sweep", "parameters": {"distributions": distributions, "samples": 500}}]
+        summary = run_simulation_batch({"simulations": simulations})
+        assert summary["status"] == "completed"
+        assert summary["completed"] == 2
+        assert summary["results"][0]["scenario"] == "baseline"
+        assert summary["results"][1]["scenario"] == "monte_carlo"
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_run_simulation_batch_retries_and_resumes(self, tmp_path, parallel):
+        """Test flaky runs are retried, hopeless ones reported, and reruns resume from checkpoints."""
+        simulations = [{"value": i, "marker_dir": str(tmp_path)} for i in range(6)]
+        simulations[2]["flaky"] = True
+        simulations[4]["broken"] = True
+        config = {
+            "simulations": simulations,
+            "parallel": parallel,
+            "output_dir": str(tmp_path / "out"),
+            "runner": _flaky_square,
+            "max_retries": 1,
+        }
+        summary = run_simulation_batch(config)
+        assert summary["status"] == "completed_with_failures"
+        assert summary["completed"] == 5
+        assert summary["retries"] == 2
+        assert [failure["index"] for failure in summary["failed"]] == [4]
+        assert summary["results"] == [0, 1, 4, 9, None, 25]
+        assert len(os.listdir(tmp_path / "out" / "runs")) == 5
+        with open(tmp_path / "out" / "batch.json") as handle:
+            assert json.load(handle)["completed"] == 5
+
+        # Only the failed run executes again; the others come from checkpoints.
+        simulations[4]["broken"] = False
+        progress = []
+        resumed = run_simulation_batch({**config, "on_progress": progress.append})
+        assert resumed["status"] == "completed"
+        assert (resumed["completed"], resumed["resumed"]) == (1, 5)
+        assert resumed["results"] == [0, 1, 4, 9, 16, 25]
+        assert progress[-1]["done"] == 6
+
     def test_run_simulation_batch_invalid_type(self):
         """Test run_simulation_batch with invalid input type."""
         with pytest.raises(TypeError):
@@ -113,51 +426,94 @@ class TestAutomation:
         # Should not raise an exception
         run_simulation_batch({})
 
-    def test_schedule_innovation_task_basic(self):
+    def test_run_simulation_batch_streams_aggregates(self, tmp_path):
+        """Test results from a lazy iterable are aggregated and summarized without being kept."""
+        simulations = ({"value": i, "marker_dir": str(tmp_path)} for i in range(100))
+        summary = run_simulation_batch({
+            "simulations": simulations,
+            "runner": _flaky_square,
+            "output_dir": str(tmp_path / "out"),
+            "keep_results": False,
+            "aggregate": {"top_k": 3},
+        })
+        assert summary["total"] == 100
+        assert summary["results"] is None
+        stats = summary["aggregates"]["metrics"]["value"]
+        assert stats["count"] == 100
+        assert stats["mean"] == pytest.approx(sum(i * i for i in range(100)) / 100)
+        assert [value for value, _ in stats["top"]] == [99 ** 2, 98 ** 2, 97 ** 2]
+        with open(tmp_path / "out" / "summary.json") as handle:
+            assert json.load(handle)["metrics"]["value"]["max"] == 99 ** 2
+
+    def test_schedule_innovation_task_basic(self, stub_scheduler):
         """Test basic schedule_innovation_task execution."""
-        task_config = {"task_type": "material_discovery"}
-        # Should not raise an exception
-        schedule_innovation_task(task_config)
+        parameters = {"target_properties": {"strength": "high"}, "constraints": {}}
+        task_config = {"task_type": "material_discovery", "parameters": parameters}
+        job_id = schedule_innovation_task(task_config)
+        assert get_scheduler() is stub_scheduler
+        assert get_scheduler().get_job(job_id)["task_type"] == "material_discovery"
 
-    def test_schedule_innovation_task_logging(self, caplog):
+    def test_schedule_innovation_task_logging(self, caplog, stub_scheduler):
         """Test that schedule_innovation_task logs appropriately."""
-        task_config = {"task_type": "research"}
+        task_config = {"task_type": "cross_pollination", "parameters": {"problem": "storage"}}
         
         with caplog.at_level(logging.INFO):
             schedule_innovation_task(task_config)
         
         assert "Scheduling innovation task" in caplog.text
-        assert "Scheduling task of type: research" in caplog.text
-        assert "Innovation task 'research' scheduled successfully" in caplog.text
+        assert "Scheduling task of type: cross_pollination" in caplog.text
+        assert "Innovation task 'cross_pollination' scheduled successfully" in caplog.text
 
     def test_schedule_innovation_task_invalid_type(self):
         """Test schedule_innovation_task with invalid input type."""
         with pytest.raises(TypeError):
             schedule_innovation_task([1, 2, 3])
 
-    def test_schedule_innovation_task_without_task_type(self):
-        """Test schedule_innovation_task without task_type key."""
-        task_config = {"other_key": "value"}
-        # Should use 'unknown' as default
-        schedule_innovation_task(task_config)
+    def test_schedule_innovation_task_rejects_unrunnable_tasks(self, stub_scheduler):
+        """Test unknown task types and missing handler parameters are rejected up front."""
+        with pytest.raises(ValueError, match="'unknown'"):
+            schedule_innovation_task({"other_key": "value"})
+        with pytest.raises(ValueError, match="'research'"):
+            schedule_innovation_task({"task_type": "research"})
+        with pytest.raises(ValueError, match="target_properties"):
+            schedule_innovation_task({"task_type": "material_discovery"})
+        assert len(stub_scheduler) == 0
 
-    def test_generate_report_basic(self):
+    def test_generate_report_basic(self, tmp_path):
         """Test basic generate_report execution."""
-        output_path = "/tmp/report.txt"
+        output_path = str(tmp_path / "report.txt")
         # Should not raise an exception
         generate_report(output_path)
+        assert open(output_path).read().startswith("# Jarvis Report")
 
-    def test_generate_report_logging(self, caplog):
+    def test_generate_report_default_sections(self, monkeypatch, tmp_path):
+        """Test the default report lists the given scheduler, else the process-wide one."""
+        output_path = str(tmp_path / "report.md")
+        monkeypatch.setattr(automation, "_scheduler", None)
+        generate_report(output_path)
+        assert "No innovation tasks have been scheduled." in open(output_path).read()
+        
+        scheduler = Scheduler(handlers={"cross_pollination": lambda params: params})
+        try:
+            job_id = scheduler.add_job("cross_pollination", "every 1h", {"problem": "storage"})
+            assert generate_report(output_path, scheduler=scheduler)["rows"] == 1
+            assert f"| {job_id} | cross_pollination |" in open(output_path).read()
+            monkeypatch.setattr(automation, "_scheduler", scheduler)
+            assert generate_report(output_path)["rows"] == 1
+        finally:
+            scheduler.shutdown()
+
+    def test_generate_report_logging(self, caplog, tmp_path):
         """Test that generate_report logs appropriately."""
-        output_path = "/output/report.html"
+        output_path = str(tmp_path / "output" / "report.html")
         
         with caplog.at_level(logging.INFO):
             generate_report(output_path)
         
-        assert "Generating report to: /output/report.html" in caplog.text
-        assert "Collecting data for report (placeholder)" in caplog.text
-        assert "Formatting report content (placeholder)" in caplog.text
-        assert "Report generated successfully at: /output/report.html" in caplog.text
+        assert f"Generating report to: {output_path}" in caplog.text
+        assert "Collecting data for report" in caplog.text
+        assert "Formatting report content" in caplog.text
+        assert f"Report generated successfully at: {output_path}" in caplog.text
 
     def test_generate_report_empty_path(self):
         """Test generate_report with empty path."""
@@ -169,18 +525,253 @@ class TestAutomation:
         with pytest.raises(ValueError):
             generate_report(None)
 
-    def test_generate_report_with_different_extensions(self):
+    def test_generate_report_with_different_extensions(self, tmp_path):
         """Test generate_report with various file extensions."""
         file_paths = [
-            "/reports/output.txt",
-            "/reports/output.html",
-            "/reports/output.pdf",
-            "/reports/output.json"
+            tmp_path / "reports" / "output.txt",
+            tmp_path / "reports" / "output.html",
+            tmp_path / "reports" / "output.md",
+            tmp_path / "reports" / "output.json"
         ]
         
         for file_path in file_paths:
             # Should not raise an exception
-            generate_report(file_path)
+            generate_report(str(file_path))
+            assert file_path.exists()
+        with pytest.raises(ValueError):
+            generate_report(str(tmp_path / "reports" / "output.pdf"))
+
+    def test_generate_report_renders_streamed_sections(self, tmp_path):
+        """Test text, metrics and streamed table sections in every format."""
+        sections = [
+            {"title": "Overview", "text": "Daily <summary> | totals"},
+            {"title": "Metrics", "metrics": {"runs": 3, "mean": 1.5}},
+            {"title": "Runs", "rows": lambda: ({"id": i, "score": i / 2} for i in range(1000))},
+        ]
+        generate_report(str(tmp_path / "r.json"), sections)
+        report = json.loads((tmp_path / "r.json").read_text())
+        assert [section["title"] for section in report["sections"]] == ["Overview", "Metrics", "Runs"]
+        assert report["sections"][1]["rows"] == [["runs", 3], ["mean", 1.5]]
+        assert report["sections"][2]["columns"] == ["id", "score"]
+        assert report["sections"][2]["rows"][999] == [999, 499.5]
+
+        summary = generate_report(str(tmp_path / "r.html"), sections)
+        assert summary["rows"] == 1002
+        page = open(tmp_path / "r.html").read()
+        assert "&lt;summary&gt;" in page and page.count("<tr>") == 1004
+        generate_report(str(tmp_path / "r.md"), sections)
+        markdown = (tmp_path / "r.md").read_text()
+        assert "Daily <summary> | totals" in markdown
+        assert "| id | score |" in markdown and "| 999 | 499.5 |" in markdown
+
+    def test_generate_report_reuses_unchanged_sections(self, tmp_path):
+        """Test only sections whose inputs changed are re-rendered."""
+        source = tmp_path / "runs.csv"
+        source.write_text("1,2\n")
+
+        def sections(metrics):
+            return [
+                {"title": "Metrics", "metrics": metrics},
+                {"title": "Runs", "source": str(source), "rows": lambda: (line.split(",") for line in open(source))},
+                {"title": "Live", "rows": (row for row in [[1]])},
+            ]
+
+        cache = str(tmp_path / "cache")
+        output = str(tmp_path / "daily.md")
+        first = generate_report(output, sections({"runs": 1}), cache_dir=cache)
+        assert first["rendered"] == ["Metrics", "Runs", "Live"]
+        content = open(output).read()
+
+        again = generate_report(output, sections({"runs": 1}), cache_dir=cache)
+        assert (again["cached"], again["rendered"]) == (["Metrics", "Runs"], ["Live"])
+        assert open(output).read() == content
+
+        changed = generate_report(output, sections({"runs": 2}), cache_dir=cache)
+        assert (changed["cached"], changed["rendered"]) == (["Runs"], ["Metrics", "Live"])
+        assert "| runs | 2 |" in open(output).read()
+        assert len(os.listdir(cache)) == 2
+
+        repeated = [{"title": "Results", "metrics": {"a": 1}}, {"title": "Results", "metrics": {"b": 2}}]
+        generate_report(output, repeated, cache_dir=cache)
+        assert generate_report(output, repeated, cache_dir=cache)["cached"] == ["Results", "Results"]
+
+    def test_published_files_follow_the_umask(self, tmp_path):
+        """Test atomically written reports and pipelines are not left owner-only."""
+        previous = os.umask(0o022)
+        try:
+            cache = tmp_path / "cache"
+            sections = [{"title": "Metrics", "metrics": {"a": 1}}]
+            generate_report(str(tmp_path / "report.md"), sections, cache_dir=str(cache))
+            Pipeline([MinMaxScaler()]).fit({"v": np.array([1.0, 2.0])}).save(str(tmp_path / "pipeline.json"))
+        finally:
+            os.umask(previous)
+        published = [tmp_path / "report.md", tmp_path / "pipeline.json", *cache.iterdir()]
+        assert [oct(path.stat().st_mode & 0o777) for path in published] == [oct(0o644)] * 3
+
+
+class _FakeClock:
+    """Manually advanced clock for deterministic scheduler tests."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestScheduler:
+    """Test cases for the innovation task scheduler."""
+
+    def test_schedule_parsing(self):
+        """Test cron, alias and interval parsing."""
+        def utc(*args):
+            return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+        weekdays = CronSchedule("*/15 9-17 * * mon-fri")
+        assert weekdays.next_after(utc(2026, 10, 16, 17, 50)) == utc(2026, 10, 19, 9, 0)
+        assert weekdays.next_after(utc(2026, 10, 19, 9, 0)) == utc(2026, 10, 19, 9, 15)
+        assert CronSchedule("0 0 29 2 *").next_after(utc(2026, 3, 1)) == utc(2028, 2, 29)
+        assert CronSchedule("@hourly").next_after(utc(2026, 1, 1, 5, 30)) == utc(2026, 1, 1, 6, 0)
+        assert parse_interval("every 1h30m") == 5400
+        assert parse_schedule("5m", anchor=0.0).next_after(299.0) == 300.0
+        with pytest.raises(ValueError):
+            parse_schedule("61 * * * *", anchor=0.0)
+        with pytest.raises(ValueError):
+            parse_interval("soon")
+
+    def test_intervals_priorities_and_retries(self):
+        """Test drift-free intervals, priority order and retry backoff."""
+        clock = _FakeClock()
+        order = []
+        attempts = {"count": 0}
+
+        def flaky(params):
+            attempts["count"] += 1
+            if attempts["count"] < 3:
+                raise RuntimeError("transient")
+            return "ok"
+
+        handlers = {"record": lambda params: order.append(params["name"]), "flaky": flaky}
+        scheduler = Scheduler(clock=clock, handlers=handlers)
+        low_id = scheduler.add_job("record", schedule=10, parameters={"name": "low"}, priority=0)
+        scheduler.add_job("record", schedule=10, parameters={"name": "high"}, priority=5)
+        flaky_id = scheduler.add_job("flaky", backoff=2.0)
+        assert scheduler.run_pending() == 1
+        clock.now += 10.7  # a late tick does not shift later occurrences
+        scheduler.run_pending()
+        assert order == ["high", "low"]
+        assert scheduler.get_job(low_id)["next_run"] == 1_000_000.0 + 20
+        assert scheduler.next_run_time() == 1_000_000.0 + 10.7 + 4
+
+        job = scheduler.get_job(flaky_id)
+        assert (job["status"], job["attempt"], job["failures"]) == ("retrying", 2, 2)
+        clock.now = job["next_run"]
+        scheduler.run_pending()
+        job = scheduler.get_job(flaky_id)
+        assert (job["status"], job["last_status"], job["last_result"]) == ("done", "succeeded", "ok")
+
+    def test_dependencies_wait_and_skip(self):
+        """Test dependent jobs wait for, and are skipped after, their dependencies."""
+        clock = _FakeClock()
+        ran = []
+
+        def step(params):
+            if params.get("fail"):
+                raise RuntimeError("failed step")
+            ran.append(params["name"])
+
+        scheduler = Scheduler(clock=clock, handlers={"step": step})
+        scheduler.add_job("step", schedule=60, parameters={"name": "report"}, depends_on=["load"], job_id="report")
+        scheduler.add_job("step", schedule=60, parameters={"name": "load"}, priority=-1, job_id="load")
+        clock.now += 60
+        scheduler.run_pending()
+        assert ran == ["load", "report"]
+
+        scheduler.add_job("step", schedule=60, parameters={"fail": True}, max_retries=0, job_id="load")
+        clock.now += 60
+        scheduler.run_pending()
+        assert ran == ["load", "report"]
+        assert scheduler.get_job("report")["last_status"] == "skipped"
+        assert scheduler.get_job("report")["next_run"] == clock.now + 60
+
+    def test_job_store_survives_restart(self, tmp_path):
+        """Test jobs and their state are restored from the job store."""
+        clock = _FakeClock()
+        path = str(tmp_path / "jobs.db")
+        with Scheduler(store_path=path, clock=clock, handlers={"noop": lambda params: None}) as scheduler:
+            for i in range(2_000):
+                scheduler.add_job("noop", schedule="every 1h", parameters={"i": i}, job_id=f"job-{i}")
+            scheduler.add_job("noop", schedule="@daily", job_id="daily")
+            clock.now += 3600
+            assert scheduler.run_pending() == 2_000
+        with Scheduler(store_path=path, clock=clock, handlers={"noop": lambda params: None}) as restored:
+            assert len(restored) == 2_001
+            job = restored.get_job("job-7")
+            assert (job["runs"], job["parameters"], job["next_run"]) == (1, {"i": 7}, clock.now + 3600)
+            clock.now += 3600
+            assert restored.run_pending() == 2_000
+
+    def test_threaded_dispatch_respects_type_limits(self):
+        """Test the dispatcher runs due jobs on the pool within per-type limits."""
+        active = {"slow": 0, "peak": 0}
+        lock = threading.Lock()
+        done = threading.Event()
+        finished = []
+
+        def slow(params):
+            with lock:
+                active["slow"] += 1
+                active["peak"] = max(active["peak"], active["slow"])
+            time.sleep(0.02)
+            with lock:
+                active["slow"] -= 1
+                finished.append(params["i"])
+                if len(finished) == 6:
+                    done.set()
+
+        scheduler = Scheduler(workers=4, limits={"slow": 2}, handlers={"slow": slow})
+        scheduler.start()
+        try:
+            for i in range(6):
+                scheduler.add_job("slow", parameters={"i": i})
+            assert done.wait(5)
+        finally:
+            scheduler.shutdown()
+        assert active["peak"] == 2
+        assert sorted(finished) == list(range(6))
+
+
+class TestBenchmark:
+    """Test cases for the benchmark suite."""
+
+    def test_run_benchmarks_records_all_cases(self):
+        """Test every case is recorded with time, throughput and memory."""
+        record = run_benchmarks(sizes=[50], repeat=1)
+        assert set(record["results"]) == {f"{name}@50" for name in BENCHMARKS}
+        for result in record["results"].values():
+            assert result["seconds"] > 0
+            assert result["throughput"] > 0
+            assert result["peak_memory_bytes"] >= 0
+
+    def test_compare_runs_flags_regressions(self):
+        """Test compare_runs flags slowdowns beyond the threshold only."""
+        def record(seconds):
+            return {"results": {"case@10": {"seconds": seconds, "peak_memory_bytes": 100}}}
+
+        assert compare_runs(record(1.0), record(1.05), threshold=0.1)[0]["regression"] is False
+        assert compare_runs(record(1.0), record(1.5), threshold=0.1)[0]["regression"] is True
+
+    def test_cli_run_baseline_compare(self, tmp_path, caplog):
+        """Test the run, save-baseline and compare commands."""
+        paths = ["--history", str(tmp_path / "history.json"), "--baseline", str(tmp_path / "baseline.json")]
+        run_args = paths + ["run", "--sizes", "20", "--repeat", "1", "--cases", "environment.update_state"]
+        assert benchmark_main(run_args) == 0
+        assert benchmark_main(paths + ["save-baseline"]) == 0
+        assert benchmark_main(run_args) == 0
+        assert len(load_history(str(tmp_path / "history.json"))) == 2
+        with caplog.at_level(logging.INFO):
+            assert benchmark_main(paths + ["compare", "--threshold", "1000"]) == 0
+        assert "environment.update_state@20" in caplog.text and "memory) ok" in caplog.text
 
 
 def test_scripts_placeholder():
@@ -4,8 +4,21 @@ Test cases for the simulation module.
 This file contains placeholder tests for the simulation module to ensure functionality and framework readiness.
 """
 
+import asyncio
+
+import numpy as np
+import pytest
+
+from simulation.company_simulator import ConglomerateSimulator
+from simulation.consensus import ConsensusMatrix
 from simulation.environment import Environment
+from simulation.events import EventScheduler
+from simulation.keyword_automaton import KeywordAutomaton
 from simulation.physics import PhysicsEngine
+from simulation.physics_simulator import PhysicsSimulator
+from simulation.result_cache import ScenarioCache
+from simulation.scenario_engine import ScenarioEngine
+from simulation.statistics import MetricAggregator, QuantileSketch, RunningStats, TopK
 
 
 def test_environment_initialization():
@@ -77,3 +90,262 @@ def test_physics_engine_compute_force():
 def test_simulation_placeholder():
     """Basic placeholder test for simulation functionality."""
     assert True
+
+
+def test_keyword_automaton_overlapping_patterns():
+    """Test KeywordAutomaton reports overlapping and nested patterns once."""
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "solar energy"])
+    assert automaton.find("Ushers") == {0, 1, 3}
+    assert automaton.find("SOLAR ENERGY and she") == {0, 1, 4}
+    assert automaton.find("nothing here") == {0}
+    assert automaton.find("") == set()
+
+
+def test_physics_simulator_feasibility_score():
+    """Test PhysicsSimulator default single-problem scoring."""
+    simulator = PhysicsSimulator()
+    assert simulator.feasibility_score("Carbon-neutral ENERGY at scale") == 0.7
+    assert simulator.feasibility_score("Reusable rockets") == 0.5
+
+
+def test_physics_simulator_batch_scores():
+    """Test PhysicsSimulator batch scoring with a custom rule table."""
+    simulator = PhysicsSimulator(rules={"fusion": 0.3, "energy": 0.2, "perpetual motion": -0.6})
+    scores, matched = simulator.feasibility_scores([
+        "Fusion energy grid",
+        "Perpetual motion energy machine",
+        "Better batteries",
+    ])
+    assert isinstance(scores, np.ndarray)
+    np.testing.assert_allclose(scores, [1.0, 0.1, 0.5])
+    assert matched == [["fusion", "energy"], ["energy", "perpetual motion"], []]
+
+
+def test_running_stats_and_sketch_merge():
+    """Test streaming statistics match NumPy and merge across partials."""
+    values = np.random.default_rng(7).normal(10.0, 2.0, 50_000)
+    left, right = RunningStats(), RunningStats()
+    left.update(values[:12_345])
+    right.update(values[12_345:])
+    left.merge(right)
+    assert left.count == values.size
+    assert np.isclose(left.mean, values.mean())
+    assert np.isclose(left.variance, values.var(ddof=1))
+
+    sketch, other = QuantileSketch(k=128), QuantileSketch(k=128)
+    sketch.update(values[:25_000])
+    other.update(values[25_000:])
+    sketch.merge(other)
+    assert len(sketch) < 2_000
+    np.testing.assert_allclose(
+        sketch.quantiles([0.1, 0.5, 0.9]), np.quantile(values, [0.1, 0.5, 0.9]), atol=0.2
+    )
+
+
+
+def test_top_k_merge_matches_global_top_k():
+    """Test TopK keeps the extreme values with their keys across merges."""
+    values = np.random.default_rng(3).normal(size=10_000)
+    keys = [f"run-{i}" for i in range(values.size)]
+    left, right = TopK(5), TopK(5)
+    left.update(values[:4_000], keys[:4_000])
+    right.update(values[4_000:], keys[4_000:])
+    left.merge(right)
+    expected = np.argsort(-values)[:5]
+    assert left.items() == [(values[i], keys[i]) for i in expected]
+
+    bottom = TopK(3, largest=False)
+    bottom.update([2.0, np.nan, 1.0, 1.0, 5.0], ["a", "b", "c", "d", "e"])
+    assert bottom.items() == [(1.0, "c"), (1.0, "d"), (2.0, "a")]
+    with pytest.raises(ValueError):
+        left.merge(bottom)
+
+
+def test_metric_aggregator_streams_and_merges_records():
+    """Test per-metric aggregates of nested records, fed in parts and merged."""
+    rng = np.random.default_rng(11)
+    records = [
+        {"statistics": {"mean": float(x), "count": 10}, "scenario": "mc", "ok": True} for x in rng.normal(size=3_000)
+    ]
+    whole, left, right = (MetricAggregator(buffer_size=64) for _ in range(3))
+    for i, record in enumerate(records):
+        whole.add(record, key=i)
+        (left if i % 2 else right).add(record, key=i)
+    left.merge(right)
+    summary, merged = whole.summary(), left.summary()
+    assert summary["records"] == merged["records"] == 3_000
+    assert set(summary["metrics"]) == {"statistics.mean", "statistics.count"}
+    means = np.array([record["statistics"]["mean"] for record in records])
+    stats = merged["metrics"]["statistics.mean"]
+    assert np.isclose(stats["mean"], means.mean())
+    assert np.isclose(stats["variance"], means.var(ddof=1))
+    assert stats["top"][0] == [means.max(), int(means.argmax())]
+    assert stats["bottom"][0] == [means.min(), int(means.argmin())]
+    assert abs(stats["quantiles"]["0.5"] - np.median(means)) < 0.1
+
+    only = MetricAggregator(metrics=["statistics.count"])
+    only.add(records[0])
+    assert list(only.summary()["metrics"]) == ["statistics.count"]
+
+def test_scenario_engine_baseline():
+    """Test ScenarioEngine baseline run."""
+    result = ScenarioEngine().run("Grid storage")
+    assert result["scenario"] == "baseline"
+
+
+def test_scenario_engine_monte_carlo():
+    """Test Monte Carlo sweep statistics and worker-count independence."""
+    parameters = {
+        "distributions": {
+            "demand": {"dist": "normal", "loc": 5.0, "scale": 1.0},
+            "cost": {"dist": "uniform", "low": -2.0, "high": 0.0},
+        },
+        "samples": 20_000,
+        "batch_size": 3_000,
+        "seed": 11,
+    }
+    serial = ScenarioEngine().run("Grid storage", parameters)
+    stats = serial["statistics"]
+    assert serial["scenario"] == "monte_carlo"
+    assert stats["count"] == 20_000
+    assert abs(stats["mean"] - 4.0) < 0.05
+    assert abs(stats["variance"] - (1.0 + 4.0 / 12.0)) < 0.05
+
+    parallel = ScenarioEngine(workers=2).run("Grid storage", parameters)
+    assert parallel == serial
+
+
+def test_scenario_engine_rejects_unknown_distribution():
+    """Test Monte Carlo validation of distribution specs."""
+    with pytest.raises(ValueError):
+        ScenarioEngine().run("x", {"distributions": {"a": {"dist": "cauchy"}}})
+
+
+def test_scenario_cache_tiers_and_eviction(tmp_path):
+    """Test ScenarioCache memory/disk tiers, stable keys and size cap."""
+    key = ScenarioCache.make_key("p", {"b": 1, "a": [1, 2]}, "v1")
+    assert key == ScenarioCache.make_key("p", {"a": [1, 2], "b": 1}, "v1")
+    assert key != ScenarioCache.make_key("p", {"a": [1, 2], "b": 1}, "v2")
+
+    cache = ScenarioCache(str(tmp_path), max_memory_entries=1)
+    cache.put(key, {"value": np.float64(1.5)})
+    assert cache.get(key) == {"value": 1.5}
+    assert cache.get("missing") is None
+
+    reopened = ScenarioCache(str(tmp_path))
+    assert reopened.get(key) == {"value": 1.5}
+    assert reopened.stats()["disk_hits"] == 1
+
+    small = ScenarioCache(str(tmp_path / "small"), max_disk_bytes=200)
+    for index in range(10):
+        small.put(f"{index:02d}" * 32, {"payload": "x" * 50, "index": index})
+    stats = small.stats()
+    assert stats["disk_bytes"] <= 200
+    assert stats["disk_evictions"] > 0
+
+
+def test_scenario_engine_uses_cache():
+    """Test ScenarioEngine serves repeated runs from its cache."""
+    engine = ScenarioEngine(cache=ScenarioCache())
+    parameters = {"distributions": {"a": {"dist": "uniform", "low": 0, "high": 1}}, "samples": 1_000}
+    first = engine.run("Grid storage", parameters)
+    first["statistics"]["mean"] = -1.0
+    second = engine.run("Grid storage", parameters)
+    assert second["statistics"]["mean"] != -1.0
+    assert engine.cache.stats()["memory_hits"] == 1
+
+
+def test_scenario_engine_bypasses_cache_for_unidentified_evaluators():
+    """Test lambdas and closures are never served another evaluator's result."""
+    cache = ScenarioCache()
+    parameters = {"distributions": {"a": {"dist": "constant", "value": 1.0}}, "samples": 10}
+
+    def scaled(factor):
+        return lambda samples: samples["a"] * factor
+
+    engines = [ScenarioEngine(scaled(1), cache=cache), ScenarioEngine(scaled(2), cache=cache)]
+    engines.append(ScenarioEngine(lambda samples: samples["a"] * 3, cache=cache))
+    assert [engine.run("x", parameters)["statistics"]["mean"] for engine in engines] == [1.0, 2.0, 3.0]
+    assert ScenarioEngine(cache=cache).version is not None and cache.stats()["memory_entries"] == 0
+
+
+def test_event_scheduler_ordering_timers_and_cancel():
+    """Test EventScheduler time ordering, drift-free timers and cancellation."""
+    scheduler = EventScheduler()
+    fired = []
+    scheduler.schedule(5.0, fired.append, "late")
+    scheduler.schedule(1.0, fired.append, "early")
+    dropped = scheduler.schedule(2.0, fired.append, "dropped")
+    scheduler.cancel(dropped)
+    ticks = []
+    timer = scheduler.every(1.5, lambda: ticks.append(scheduler.now))
+    scheduler.run(until=4.6)
+    assert fired == ["early"]
+    assert ticks == [1.5, 3.0, 4.5]
+    assert scheduler.now == 4.6
+    scheduler.cancel(timer)
+    scheduler.run()
+    assert fired == ["early", "late"]
+    assert len(ticks) == 3
+
+
+def test_conglomerate_simulator_deterministic_run():
+    """Test ConglomerateSimulator runs in simulated time and is reproducible."""
+    first = ConglomerateSimulator.generate(200, seed=5, review_interval=30.0)
+    summary = first.run(365.0)
+    assert summary["simulated_days"] == 365.0
+    assert summary["decisions"] == sum(summary["by_option"].values()) > 0
+    assert first.decision_counts().shape == (200, 4)
+    assert len(first.reviews) == 12
+
+    second = ConglomerateSimulator.generate(200, seed=5, review_interval=30.0)
+    assert second.run(365.0)["by_option"] == summary["by_option"]
+
+
+def test_conglomerate_simulator_async_entrypoint():
+    """Test the async simulate_conglomerate_decision entrypoint."""
+    simulator = ConglomerateSimulator.generate(10, seed=1)
+    result = asyncio.run(simulator.simulate_conglomerate_decision("Carbon-neutral energy", horizon=90.0))
+    assert result["problem"] == "Carbon-neutral energy"
+    assert result["companies"] == 10
+
+
+def test_consensus_matrix_rules():
+    """Test weighted majority, Borda and approval tallies."""
+    votes = [
+        [3.0, 2.0, 1.0],
+        [1.0, 3.0, 2.0],
+        [1.0, 3.0, 2.8],
+        [0.0, 0.0, 0.0],
+    ]
+    matrix = ConsensusMatrix.from_votes(["A", "B", "C", "D"], ["x", "y", "z"], votes, company_weights=[3, 1, 1, 5])
+    majority = matrix.weighted_majority()
+    assert majority["winner"] == "x"
+    assert majority["totals"] == {"x": 3.0, "y": 2.0, "z": 0.0}
+    assert matrix.borda()["totals"] == {"x": 6.0, "y": 7.0, "z": 2.0}
+    assert matrix.approval()["totals"] == {"x": 3.0, "y": 5.0, "z": 2.0}
+    assert matrix.results()["consensus"] is False
+
+
+def test_consensus_matrix_incremental_updates_match_recompute():
+    """Test incremental vote and weight updates equal a full recompute."""
+    rng = np.random.default_rng(0)
+    companies = [f"c{i}" for i in range(50)]
+    matrix = ConsensusMatrix.from_votes(companies, ["a", "b", "c", "d"], rng.random((50, 4)))
+    for _ in range(20):
+        matrix.update_vote(companies[rng.integers(50)], rng.random(4))
+    matrix.set_company_weight("c3", 4.0)
+    incremental = matrix.results()
+    matrix.recompute()
+    full = matrix.results()
+    for rule in ("weighted_majority", "borda", "approval"):
+        np.testing.assert_allclose(list(incremental[rule]["totals"].values()), list(full[rule]["totals"].values()))
+
+
+def test_conglomerate_simulator_consensus():
+    """Test consensus over simulated company decisions."""
+    simulator = ConglomerateSimulator.generate(50, seed=2)
+    simulator.run(365.0)
+    results = simulator.consensus().results()
+    assert results["recommendation"] in simulator.options
+    assert sum(results["weighted_majority"]["totals"].values()) == 50